@@ -0,0 +1,92 @@
+import hashlib
+
+from wificracker_core import BenchmarkSuite, CaptureAnalyzer, ScanFileReader, SyntheticCapture, SyntheticScan
+
+
+def digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def test_scan_is_deterministic():
+    assert SyntheticScan(aps=50, stations=40, seed=1).csv(3) == SyntheticScan(aps=50, stations=40, seed=1).csv(3)
+    assert SyntheticScan(aps=50, stations=40, seed=1).csv() != SyntheticScan(aps=50, stations=40, seed=2).csv()
+
+
+def test_scan_ticks_change_about_the_requested_share(tmp_path):
+    scan = SyntheticScan(aps=1000, seed=3, changes=0.1)
+    before, after = scan.csv(10).splitlines(), scan.csv(11).splitlines()
+
+    changed = sum(old != new for old, new in zip(before, after))
+
+    assert len(before) == len(after)
+    assert 50 <= changed <= 150
+
+
+def test_reader_sees_what_the_scan_wrote(tmp_path):
+    scan = SyntheticScan(aps=120, stations=80, seed=4)
+    path = str(tmp_path / 'scan-01.csv')
+    scan.write(path)
+    reader = ScanFileReader(path)
+
+    reader.refresh()
+
+    assert sorted(reader.access_points) == sorted(ap["bssid"] for ap in scan.aps)
+    assert sorted(reader.stations) == sorted(station["mac"] for station in scan.stations)
+    for ap in scan.aps:
+        assert reader.access_points[ap["bssid"]]["essid"] == ap["essid"]
+        assert reader.access_points[ap["bssid"]]["channel"] == str(ap["channel"])
+    for station in scan.stations:
+        if station["bssid"]:
+            assert station["mac"] in reader.clients[station["bssid"]]
+
+
+def test_capture_is_deterministic(tmp_path):
+    for format in ('pcap', 'pcapng'):
+        SyntheticCapture(networks=10, handshakes=3, pmkids=2, noise=300, seed=5).write(tmp_path / 'a', format)
+        SyntheticCapture(networks=10, handshakes=3, pmkids=2, noise=300, seed=5).write(tmp_path / 'b', format)
+        SyntheticCapture(networks=10, handshakes=3, pmkids=2, noise=300, seed=6).write(tmp_path / 'c', format)
+
+        assert digest(tmp_path / 'a') == digest(tmp_path / 'b')
+        assert digest(tmp_path / 'a') != digest(tmp_path / 'c')
+
+
+def test_analyzer_finds_what_the_capture_holds(tmp_path):
+    synthetic = SyntheticCapture(networks=12, handshakes=4, pmkids=3, noise=1000, seed=7)
+    path = str(tmp_path / 'synthetic.cap')
+    synthetic.write(path)
+
+    analyzer = CaptureAnalyzer.analyze(path)
+    networks = analyzer.report()["networks"]
+
+    assert analyzer.frames == synthetic.noise + synthetic.networks + synthetic.handshakes * 4 + synthetic.pmkids
+    assert sorted(networks) == sorted(analyzer.mac(synthetic.bssid(i)) for i in range(synthetic.networks))
+    for i in range(synthetic.networks):
+        network = networks[analyzer.mac(synthetic.bssid(i))]
+        assert network["essid"] == f"Net-{i}"
+        assert network["handshake"] == (i < synthetic.handshakes)
+        assert len(network["pmkids"]) == (synthetic.handshakes <= i < synthetic.handshakes + synthetic.pmkids)
+    lines = list(analyzer.hc22000_lines())
+    assert sum(line.startswith('WPA*02*') for line in lines) == synthetic.handshakes
+    assert sum(line.startswith('WPA*01*') for line in lines) == synthetic.pmkids
+
+
+def result(stage, seconds, items=100, peak_kb=1000):
+    return {"stage": stage, "seconds": seconds, "items": items, "unit": "rows", "peak_kb": peak_kb}
+
+
+def test_compare_reports_regressions_and_skipped_stages():
+    baseline = {"results": [result("fast", 1.0), result("steady", 1.0), result("sized", 1.0, items=1000)]}
+    results = [result("fast", 2.0), result("steady", 1.1), result("sized", 0.1), result("new", 1.0)]
+
+    regressions, skipped = BenchmarkSuite.compare(results, baseline, tolerance=0.25)
+
+    assert regressions == [("fast", "seconds", 1.0, 2.0)]
+    assert [stage for stage, _ in skipped] == ["sized", "new"]
+
+
+def test_compare_with_nothing_in_common():
+    regressions, skipped = BenchmarkSuite.compare([result("csv", 1.0, items=10)], {"results": [result("csv", 1.0)]})
+
+    assert regressions == []
+    assert skipped == [("csv", "10 rows, baseline has 100")]
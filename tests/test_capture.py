@@ -0,0 +1,289 @@
+import random
+import re
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from wificracker_core import CaptureAnalyzer, CaptureCompactor, CaptureFile, HandshakeWatcher, Hc22000Exporter, SyntheticCapture
+
+
+def write_capture(path, frames):
+    with open(path, 'wb') as f:
+        f.write(SyntheticCapture.pcap_header())
+        for index, frame in enumerate(frames):
+            f.write(SyntheticCapture.pcap_record(1700000000.0 + index, frame))
+    return str(path)
+
+
+def probe_response(synthetic, bssid, essid):
+    frame = bytearray(synthetic.beacon(bssid, essid))
+    frame[len(SyntheticCapture.RADIOTAP)] = 0x50
+    return bytes(frame)
+
+
+def hidden_network(tmp_path):
+    """Three blank-SSID beacons, then the probe response naming the network, then M1 and M2."""
+    synthetic = SyntheticCapture()
+    rng = random.Random(1)
+    bssid, station = SyntheticCapture.bssid(7), bytes.fromhex('060000000007')
+    anonce, snonce = bytes(range(32)), bytes(range(32, 64))
+    frames = [synthetic.beacon(bssid, b'') for _ in range(3)]
+    frames.append(probe_response(synthetic, bssid, b'Hidden'))
+    frames.append(synthetic.eapol(bssid, station, 1, 1, anonce, rng=rng))
+    frames.append(synthetic.eapol(bssid, station, 2, 1, snonce, rng=rng))
+    return write_capture(tmp_path / 'hidden.cap', frames)
+
+
+def test_pcap_and_pcapng_give_the_same_report(tmp_path):
+    synthetic = SyntheticCapture(networks=12, handshakes=4, pmkids=3, noise=500, seed=2)
+    synthetic.write(tmp_path / 'a.cap', 'pcap')
+    synthetic.write(tmp_path / 'a.pcapng', 'pcapng')
+
+    pcap = CaptureAnalyzer.analyze(str(tmp_path / 'a.cap'))
+    pcapng = CaptureAnalyzer.analyze(str(tmp_path / 'a.pcapng'))
+
+    assert (pcap.format, pcapng.format) == ('pcap', 'pcapng')
+    assert pcap.linktype == pcapng.linktype == 127
+    assert pcap.report()["networks"] == pcapng.report()["networks"]
+    assert sorted(pcap.hc22000_lines()) == sorted(pcapng.hc22000_lines())
+
+
+def test_big_endian_and_nanosecond_pcap(tmp_path):
+    synthetic = SyntheticCapture()
+    frame = synthetic.beacon(SyntheticCapture.bssid(1), b'Net-1')
+    path = tmp_path / 'be.cap'
+    with open(path, 'wb') as f:
+        f.write(struct.pack('>IHHiIII', 0xa1b23c4d, 2, 4, 0, 0, 65535, 127))
+        f.write(struct.pack('>IIII', 1700000000, 500000000, len(frame), len(frame)) + frame)
+
+    frames = list(CaptureFile(str(path)).read_frames())
+
+    assert [(linktype, ts, bytes(data)) for _, linktype, ts, data in frames] == [(127, 1700000000.5, frame)]
+
+
+def test_radiotap_fcs_is_stripped():
+    frame = SyntheticCapture().beacon(SyntheticCapture.bssid(3), b'Net-3')[len(SyntheticCapture.RADIOTAP):]
+    # TSFT and Flags present, behind an extended present word; Flags says an FCS follows the frame
+    radiotap = struct.pack('<BBHII', 0, 0, 28, 0x80000003, 0) + bytes(4 + 8) + bytes([0x10]) + bytes(3)
+    analyzer = CaptureAnalyzer()
+
+    assert analyzer.strip_link_header(127, radiotap + frame + b'\xde\xad\xbe\xef') == frame
+    analyzer.feed(127, radiotap + frame + b'\xde\xad\xbe\xef')
+    assert analyzer.report()["networks"]["02:00:00:00:00:03"]["essid"] == 'Net-3'
+
+
+def test_pmkid_only_network_is_reported_as_pmkid(tmp_path):
+    synthetic = SyntheticCapture()
+    bssid, station = SyntheticCapture.bssid(4), bytes.fromhex('060000000004')
+    pmkid = bytes(range(1, 17))
+    path = write_capture(tmp_path / 'pmkid.cap', [
+        synthetic.beacon(bssid, b'Net-4'),
+        synthetic.eapol(bssid, station, 1, 1, bytes(32), pmkid=pmkid, rng=random.Random(0)),
+    ])
+
+    analyzer = CaptureAnalyzer.analyze(path)
+    network = analyzer.report()["networks"]["02:00:00:00:00:04"]
+
+    assert network["handshake"] is False
+    assert network["pmkids"] == [pmkid.hex()]
+    assert network["crackable"] is True
+    assert CaptureAnalyzer.material(network) == 'PMKID'
+    assert list(analyzer.hc22000_lines()) == [f"WPA*01*{pmkid.hex()}*020000000004*060000000004*{b'Net-4'.hex()}***01"]
+
+
+def test_partial_record_is_left_for_the_next_read(tmp_path):
+    synthetic = SyntheticCapture()
+    frames = [synthetic.beacon(SyntheticCapture.bssid(index), f"Net-{index}".encode()) for index in range(2)]
+    path = write_capture(tmp_path / 'growing.cap', frames)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-10])
+    capture = CaptureFile(path)
+
+    assert len(list(capture.read_frames())) == 1
+    with open(path, 'wb') as f:
+        f.write(data)
+    assert len(list(capture.read_frames())) == 1
+
+
+@pytest.mark.skipif(not shutil.which('aircrack-ng'), reason="aircrack-ng is not installed")
+def test_handshakes_match_aircrack_ng(tmp_path):
+    path = str(tmp_path / 'synthetic.cap')
+    SyntheticCapture(networks=8, handshakes=3, pmkids=2, noise=300, seed=4).write(path)
+    try:
+        output = subprocess.run(['aircrack-ng', path], input=b'', capture_output=True, timeout=30).stdout
+    except subprocess.TimeoutExpired as e: # Still waiting for a network to be chosen
+        output = e.stdout or b''
+    listed = re.findall(rb'([0-9A-F:]{17})\s+\S+\s+WPA \((\d+) handshake', output)
+    assert listed, output
+
+    analyzer = CaptureAnalyzer.analyze(path)
+
+    assert {bssid.decode() for bssid, count in listed if int(count)} == {analyzer.mac(b) for b in analyzer.handshakes}
+
+
+def test_compact_keeps_the_essid_of_a_hidden_network(tmp_path):
+    source = hidden_network(tmp_path)
+    lines = sorted(CaptureAnalyzer.analyze(source).hc22000_lines())
+    assert len(lines) == 1
+
+    result = CaptureCompactor().compact(source, dest=source)
+
+    assert result["path"] == source
+    analyzer = CaptureAnalyzer.analyze(source)
+    assert analyzer.report()["networks"]["02:00:00:00:00:07"]["essid"] == 'Hidden'
+    assert sorted(analyzer.hc22000_lines()) == lines
+
+
+def test_compact_keeps_the_hash_lines_of_synthetic_captures(tmp_path):
+    source = str(tmp_path / 'synthetic.cap')
+    SyntheticCapture(networks=20, handshakes=6, pmkids=4, noise=2000, seed=3).write(source)
+    dest = str(tmp_path / 'compact.cap')
+
+    result = CaptureCompactor().compact(source, dest)
+
+    assert result["frames_out"] < result["frames_in"]
+    assert sorted(CaptureAnalyzer.analyze(dest).hc22000_lines()) == sorted(CaptureAnalyzer.analyze(source).hc22000_lines())
+
+
+def test_compact_never_replaces_a_capture_it_would_break(tmp_path, monkeypatch):
+    source = hidden_network(tmp_path)
+    with open(source, 'rb') as f:
+        original = f.read()
+    # The output is checked with analyze(); make it find nothing
+    monkeypatch.setattr(CaptureAnalyzer, 'analyze', classmethod(lambda cls, path: cls()))
+
+    with pytest.raises(ValueError):
+        CaptureCompactor().compact(source, dest=source)
+
+    with open(source, 'rb') as f:
+        assert f.read() == original
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['hidden.cap']
+
+
+def test_export_reads_a_new_capture_once_and_finds_copies_in_the_cache(tmp_path, monkeypatch):
+    synthetic = SyntheticCapture(networks=6, handshakes=3, pmkids=2, noise=3000, seed=4)
+    synthetic.write(tmp_path / 'a.pcapng', 'pcapng')
+    exporter = Hc22000Exporter(cache_dir=str(tmp_path / 'cache'))
+    expected_digest = Hc22000Exporter.capture_digest(str(tmp_path / 'a.pcapng'))
+    monkeypatch.setattr(Hc22000Exporter, 'capture_digest', None) # Any separate digest pass would fail
+
+    first = exporter.export(str(tmp_path / 'a.pcapng'))
+    shutil.copy(tmp_path / 'a.pcapng', tmp_path / 'b.pcapng')
+    copy = exporter.export(str(tmp_path / 'b.pcapng'))
+
+    assert not first["cached"] and first["lines"] == 5
+    assert first["hash_file"].endswith(f"{expected_digest}.hc22000")
+    assert copy["cached"] and copy["hash_file"] == first["hash_file"]
+
+
+def test_export_removes_its_temp_file_when_writing_fails(tmp_path, monkeypatch):
+    exporter = Hc22000Exporter(cache_dir=str(tmp_path / 'cache'))
+    def broken(self):
+        yield 'WPA*02*'
+        raise OSError("No space left on device")
+    monkeypatch.setattr(CaptureAnalyzer, 'hc22000_lines', broken)
+
+    with pytest.raises(OSError):
+        exporter.export(hidden_network(tmp_path))
+
+    assert list((tmp_path / 'cache').iterdir()) == []
+
+
+class GrowingCapture:
+    """A capture that is appended to while a HandshakeWatcher follows it, as airodump-ng does."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.synthetic = SyntheticCapture()
+        self.rng = random.Random(5)
+        self.bssid, self.station = SyntheticCapture.bssid(9), bytes.fromhex('060000000009')
+        self.ts = 1700000000.0
+        with open(self.path, 'wb') as f:
+            f.write(SyntheticCapture.pcap_header())
+
+    def append(self, *frames, partial=0):
+        with open(self.path, 'ab') as f:
+            for frame in frames:
+                self.ts += 0.01
+                f.write(SyntheticCapture.pcap_record(self.ts, frame)[:partial or None])
+
+    def beacon(self):
+        return self.synthetic.beacon(self.bssid, b'Net-9')
+
+    def eapol(self, message, replay, nonce=bytes(range(32)), pmkid=None):
+        return self.synthetic.eapol(self.bssid, self.station, message, replay, nonce, pmkid=pmkid, rng=self.rng)
+
+
+@pytest.fixture
+def growing(tmp_path):
+    return GrowingCapture(tmp_path / 'capture-01.cap')
+
+
+def watch(growing):
+    return HandshakeWatcher(growing.path, '02:00:00:00:00:09')
+
+
+def test_watcher_stops_on_a_matching_m1_m2_pair(growing):
+    watcher = watch(growing)
+    growing.append(growing.beacon(), growing.eapol(1, 4))
+    assert not watcher.check()
+
+    growing.append(growing.eapol(2, 4))
+
+    assert watcher.check()
+    assert watcher.found() == 'handshake'
+    assert watcher.time_to_capture is not None
+    watcher.close()
+
+
+def test_watcher_ignores_messages_of_different_attempts(growing):
+    watcher = watch(growing)
+    # The M1 and M3 of one exchange, the M2 of another: hashcat could only use them unverified
+    growing.append(growing.beacon(), growing.eapol(1, 1), growing.eapol(3, 2), growing.eapol(2, 7))
+    assert not watcher.check()
+    assert watcher.found() == ''
+
+    growing.append(growing.eapol(3, 8))
+
+    assert watcher.check()
+    assert watcher.found() == 'handshake'
+    watcher.close()
+
+
+def test_watcher_stops_on_a_pmkid(growing):
+    watcher = watch(growing)
+    growing.append(growing.beacon(), growing.eapol(1, 1, pmkid=bytes(range(1, 17))))
+
+    assert watcher.check()
+    assert watcher.found() == 'PMKID'
+    watcher.close()
+
+
+def test_watcher_waits_for_the_essid(growing):
+    watcher = watch(growing)
+    growing.append(growing.eapol(1, 1), growing.eapol(2, 1))
+    assert not watcher.check()
+
+    growing.append(growing.beacon())
+
+    assert watcher.check()
+    watcher.close()
+
+
+def test_watcher_reads_records_once_they_are_complete(growing):
+    watcher = watch(growing)
+    growing.append(growing.beacon(), growing.eapol(1, 3))
+    m2 = growing.eapol(2, 3)
+    growing.append(m2, partial=40)
+    assert not watcher.check()
+
+    with open(growing.path, 'ab') as f:
+        f.write(SyntheticCapture.pcap_record(growing.ts, m2)[40:])
+
+    assert watcher.check()
+    assert watcher.analyzer.frames == 3
+    watcher.close()
@@ -0,0 +1,114 @@
+import os
+
+import pytest
+
+from wificracker_core import BANDS, InterfaceDiscovery, SyntheticSysfs, partition_channels
+
+
+@pytest.fixture
+def sysfs(tmp_path):
+    return SyntheticSysfs(str(tmp_path / 'sys'))
+
+
+def test_records_from_sysfs(sysfs):
+    sysfs.add_interface('wlan0', 3, '0a:00:00:00:00:00', phy='phy0', driver='iwlwifi')
+    sysfs.add_interface('wlan0mon', 5, '0a:00:00:00:00:01', arphrd=803, flags=0x1002)
+    os.makedirs(os.path.join(sysfs.root, 'class', 'net', 'eth0')) # Not wireless
+
+    records = InterfaceDiscovery(sysfs.root, netlink=None).interfaces()
+
+    assert records == [
+        {"name": "wlan0", "ifindex": 3, "mode": "Managed", "phy": "phy0", "driver": "iwlwifi",
+         "mac": "0A:00:00:00:00:00", "up": True, "type": 1},
+        {"name": "wlan0mon", "ifindex": 5, "mode": "Monitor", "phy": None, "driver": None,
+         "mac": "0A:00:00:00:00:01", "up": False, "type": 803},
+    ]
+
+
+def test_prefix_names_are_told_apart(sysfs):
+    sysfs.add_interface('wlan0', 3, '0a:00:00:00:00:00')
+    sysfs.add_interface('wlan0mon', 4, '0a:00:00:00:00:01', arphrd=803)
+    discovery = InterfaceDiscovery(sysfs.root, netlink=None)
+
+    assert discovery.get('wlan0')["mode"] == 'Managed'
+    assert discovery.get('wlan0mon')["mode"] == 'Monitor'
+    assert discovery.get('wlan') is None
+
+
+def test_unknown_or_unreadable_values(sysfs):
+    base = sysfs.add_interface('wlan1', 7, '0a:00:00:00:00:07', arphrd=65534)
+    os.remove(os.path.join(base, 'flags'))
+    with open(os.path.join(base, 'ifindex'), 'w') as f:
+        f.write('?\n')
+
+    record, = InterfaceDiscovery(sysfs.root, netlink=None).interfaces()
+
+    assert (record["mode"], record["type"], record["up"], record["ifindex"]) == (None, 65534, None, None)
+
+
+def test_802154_type_is_not_a_monitor_mode(sysfs):
+    sysfs.add_interface('wlan1', 7, '0a:00:00:00:00:07', arphrd=804) # ARPHRD_IEEE802154
+
+    assert InterfaceDiscovery(sysfs.root, netlink=None).get('wlan1')["mode"] is None
+
+
+def test_missing_sysfs(tmp_path):
+    assert InterfaceDiscovery(str(tmp_path / 'nothing'), netlink=None).interfaces() == []
+
+
+class FakeNl80211:
+    entries = []
+
+    def interfaces(self):
+        return self.entries
+
+    def close(self):
+        pass
+
+
+def test_nl80211_refines_the_mode(sysfs, monkeypatch):
+    sysfs.add_interface('wlan0', 3, '0a:00:00:00:00:00')
+    sysfs.add_interface('wlan1', 4, '0a:00:00:00:00:01')
+    monkeypatch.setattr(FakeNl80211, 'entries', [
+        {"name": "wlan0", "mode": "AP", "phy": "phy2"},
+        {"name": "wlan1", "mode": None, "phy": None},
+    ])
+
+    wlan0, wlan1 = InterfaceDiscovery(sysfs.root, netlink=FakeNl80211).interfaces()
+
+    assert (wlan0["mode"], wlan0["phy"]) == ('AP', 'phy2')
+    assert (wlan1["mode"], wlan1["phy"]) == ('Managed', None)
+
+
+def test_sysfs_values_stay_without_nl80211(sysfs):
+    sysfs.add_interface('wlan0', 3, '0a:00:00:00:00:00', arphrd=803)
+
+    def unavailable():
+        raise OSError("Address family not supported by protocol")
+
+    assert InterfaceDiscovery(sysfs.root, netlink=unavailable).get('wlan0')["mode"] == 'Monitor'
+
+
+def test_channels_are_split_evenly_without_frequency_lists():
+    plan = partition_channels(['wlan0', 'wlan1'])
+
+    assert sorted(plan['wlan0'] + plan['wlan1']) == sorted(BANDS['2.4'] + BANDS['5'])
+    assert abs(len(plan['wlan0']) - len(plan['wlan1'])) <= 1
+
+
+def test_5ghz_channels_only_go_to_adapters_that_report_them():
+    supported = {'wlan0': set(BANDS['2.4']), 'wlan1': set(BANDS['2.4']) | set(BANDS['5']), 'wlan2': None}
+
+    plan = partition_channels(['wlan0', 'wlan1', 'wlan2'], supported=supported)
+
+    assert all(f in BANDS['2.4'] for f in plan['wlan0'])
+    assert sorted(sum(plan.values(), [])) == sorted(BANDS['2.4'] + BANDS['5'])
+    assert max(map(len, plan.values())) - min(map(len, plan.values())) <= 1
+
+
+def test_channels_no_adapter_supports_are_left_out():
+    supported = {'wlan0': set(BANDS['2.4']), 'wlan1': {2412, 2437}}
+
+    assert partition_channels(['wlan0', 'wlan1'], ('5',), supported) == {}
+    assert partition_channels(['wlan0', 'wlan1'], ('2.4', '5'), supported) == {
+        'wlan0': [f for f in BANDS['2.4'] if f not in (2412, 2437)], 'wlan1': [2412, 2437]}
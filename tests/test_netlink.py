@@ -0,0 +1,252 @@
+import errno
+import socket
+import struct
+
+import pytest
+
+from wificracker_core import (InterfaceDiscovery, ModeSwitchError, ModeSwitcher, Netlink, NetlinkError,
+                              NetlinkModeBackend, Nl80211, RtNetlink, SyntheticSysfs)
+
+FAMILY = 0x1c
+ARPHRD = {2: 1, 6: 803} # nl80211 iftype -> sysfs type
+
+
+def message(kind, seq, body, flags=0):
+    body += b'\0' * (-len(body) % 4)
+    return struct.pack('=IHHII', 16 + len(body), kind, flags, seq, 0) + body
+
+
+def genl(kind, seq, cmd, attrs):
+    return message(kind, seq, struct.pack('=BBH', cmd, 1, 0) + Netlink.pack_attrs(attrs))
+
+
+def ack(seq, code=0):
+    return message(Netlink.NLMSG_ERROR, seq, struct.pack('=i', -code) + bytes(16))
+
+
+class FakeKernel:
+    """Answers the requests Nl80211 and RtNetlink make from a table of links, mirrored into a fake sysfs."""
+
+    def __init__(self, sysfs=None):
+        self.sysfs = sysfs
+        self.links = {} # ifindex -> {name, phy, iftype, up}
+        self.wiphys = {} # phy index -> {band index: [(frequency, disabled)]}
+        self.failures = {} # (ifindex, 'up' or the iftype being set) -> errno
+        self.requests = []
+        self.has_nl80211 = True
+
+    def add(self, ifindex, name, phy, iftype=2, up=True):
+        self.links[ifindex] = {"name": name, "phy": phy, "iftype": iftype, "up": up}
+        if self.sysfs:
+            self.sysfs.add_interface(name, ifindex, f"0a:00:00:00:00:{ifindex:02x}",
+                                     arphrd=ARPHRD[iftype], flags=0x1003 if up else 0x1002, phy=f"phy{phy}")
+
+    def _mirror(self, link):
+        if self.sysfs:
+            base = f"{self.sysfs.root}/class/net/{link['name']}"
+            with open(f"{base}/type", 'w') as f:
+                f.write(f"{ARPHRD[link['iftype']]}\n")
+            with open(f"{base}/flags", 'w') as f:
+                f.write(f"{0x1003 if link['up'] else 0x1002:#x}\n")
+
+    def answer(self, protocol, data):
+        length, kind, flags, seq, _ = struct.unpack_from('=IHHII', data)
+        payload = data[16:length]
+        self.requests.append((protocol, kind, payload))
+        if protocol == RtNetlink.NETLINK_ROUTE:
+            _, _, ifindex, up, change = struct.unpack('=BxHiII', payload)
+            link = self.links[ifindex]
+            if (ifindex, 'up') in self.failures:
+                return [ack(seq, self.failures[(ifindex, 'up')])]
+            link["up"] = bool(up & change)
+            self._mirror(link)
+            return [ack(seq)]
+        cmd = payload[0]
+        attrs = Netlink.parse_attrs(payload[4:])
+        if kind == Nl80211.GENL_ID_CTRL:
+            if not self.has_nl80211:
+                return [ack(seq, errno.ENOENT)]
+            return [genl(kind, seq, cmd, {Nl80211.CTRL_ATTR_FAMILY_ID: struct.pack('=H', FAMILY)}), ack(seq)]
+        if cmd == Nl80211.CMD_GET_INTERFACE:
+            replies = [genl(kind, seq - 1, cmd, {Nl80211.ATTR_IFINDEX: struct.pack('=I', 99)})] # Stale, ignored
+            for ifindex, link in sorted(self.links.items()):
+                replies.append(genl(kind, seq, cmd, {
+                    Nl80211.ATTR_IFINDEX: struct.pack('=I', ifindex),
+                    Nl80211.ATTR_IFNAME: link["name"].encode() + b'\0',
+                    Nl80211.ATTR_WIPHY: struct.pack('=I', link["phy"]),
+                    Nl80211.ATTR_IFTYPE: struct.pack('=I', link["iftype"]),
+                    Nl80211.ATTR_MAC: bytes([10, 0, 0, 0, 0, ifindex]),
+                }))
+            # Several messages per datagram, then DONE on its own
+            return [b''.join(replies), message(Netlink.NLMSG_DONE, seq, struct.pack('=i', 0))]
+        if cmd == Nl80211.CMD_GET_WIPHY:
+            assert Nl80211.ATTR_SPLIT_WIPHY_DUMP in attrs
+            replies = []
+            for phy, bands in sorted(self.wiphys.items()):
+                # A split dump: one message per band, each naming the radio
+                for band, channels in bands.items():
+                    freqs = {i: Netlink.pack_attrs({Nl80211.FREQUENCY_ATTR_FREQ: struct.pack('=I', frequency),
+                                                    **({Nl80211.FREQUENCY_ATTR_DISABLED: b''} if disabled else {})})
+                             for i, (frequency, disabled) in enumerate(channels)}
+                    bands_attr = {band: Netlink.pack_attrs({Nl80211.BAND_ATTR_FREQS: Netlink.pack_attrs(freqs)})}
+                    replies.append(genl(kind, seq, cmd, {
+                        Nl80211.ATTR_WIPHY: struct.pack('=I', phy),
+                        Nl80211.ATTR_WIPHY_NAME: f"phy{phy}".encode() + b'\0',
+                        Nl80211.ATTR_WIPHY_BANDS: Netlink.pack_attrs(bands_attr),
+                    }))
+            return replies + [message(Netlink.NLMSG_DONE, seq, struct.pack('=i', 0))]
+        if cmd == Nl80211.CMD_SET_INTERFACE:
+            ifindex = struct.unpack('=I', attrs[Nl80211.ATTR_IFINDEX])[0]
+            iftype = struct.unpack('=I', attrs[Nl80211.ATTR_IFTYPE])[0]
+            link = self.links[ifindex]
+            if (ifindex, iftype) in self.failures:
+                return [ack(seq, self.failures[(ifindex, iftype)])]
+            if link["up"]:
+                return [ack(seq, errno.EBUSY)]
+            link["iftype"] = iftype
+            self._mirror(link)
+            return [ack(seq)]
+        return [ack(seq, errno.EOPNOTSUPP)]
+
+
+class FakeSocket:
+    def __init__(self, kernel, protocol):
+        self.kernel = kernel
+        self.protocol = protocol
+        self.pending = []
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def bind(self, address):
+        pass
+
+    def send(self, data):
+        self.pending += self.kernel.answer(self.protocol, data)
+        return len(data)
+
+    def recv(self, size):
+        return self.pending.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def kernel(tmp_path, monkeypatch):
+    kernel = FakeKernel(SyntheticSysfs(str(tmp_path / 'sys')))
+    kernel.sockets = []
+
+    def open_socket(family, kind, protocol):
+        assert (family, kind) == (socket.AF_NETLINK, socket.SOCK_RAW)
+        kernel.sockets.append(FakeSocket(kernel, protocol))
+        return kernel.sockets[-1]
+    monkeypatch.setattr(socket, 'socket', open_socket)
+    return kernel
+
+
+def test_attributes_round_trip():
+    attrs = {1: b'\x01\x00\x00\x00', 4: b'wlan0\0', 6: bytes(6)}
+    assert Netlink.parse_attrs(Netlink.pack_attrs(attrs)) == attrs
+
+
+def test_family_and_interface_dump(kernel):
+    kernel.add(3, 'wlan0', 0)
+    kernel.add(4, 'wlan0mon', 1, iftype=6)
+
+    client = Nl80211()
+
+    assert client.family == FAMILY
+    assert client.interfaces() == [
+        {"ifindex": 3, "name": "wlan0", "phy": "phy0", "mode": "Managed", "mac": "0a:00:00:00:00:03"},
+        {"ifindex": 4, "name": "wlan0mon", "phy": "phy1", "mode": "Monitor", "mac": "0a:00:00:00:00:04"},
+    ]
+
+
+def test_missing_nl80211_family_closes_the_socket(kernel):
+    kernel.has_nl80211 = False
+
+    with pytest.raises(NetlinkError) as raised:
+        Nl80211()
+
+    assert raised.value.errno == errno.ENOENT
+    assert kernel.sockets[-1].closed
+
+
+def test_set_mode_request_and_error(kernel):
+    kernel.add(3, 'wlan0', 0)
+    client = Nl80211()
+
+    with pytest.raises(OSError) as raised: # Still up
+        client.set_mode(3, 'monitor')
+    assert raised.value.errno == errno.EBUSY
+
+    RtNetlink().set_up(3, False)
+    client.set_mode(3, 'Monitor')
+
+    protocol, kind, payload = kernel.requests[-1]
+    assert (protocol, kind, payload[0]) == (Nl80211.NETLINK_GENERIC, FAMILY, Nl80211.CMD_SET_INTERFACE)
+    assert Netlink.parse_attrs(payload[4:]) == {Nl80211.ATTR_IFINDEX: struct.pack('=I', 3),
+                                               Nl80211.ATTR_IFTYPE: struct.pack('=I', 6)}
+    assert kernel.links[3] == {"name": "wlan0", "phy": 0, "iftype": 6, "up": False}
+
+
+def test_link_up_request(kernel):
+    kernel.add(5, 'wlan1', 0, up=False)
+
+    RtNetlink().set_up(5, True)
+
+    protocol, kind, payload = kernel.requests[-1]
+    assert (protocol, kind) == (RtNetlink.NETLINK_ROUTE, RtNetlink.RTM_NEWLINK)
+    assert struct.unpack('=BxHiII', payload) == (socket.AF_UNSPEC, 0, 5, RtNetlink.IFF_UP, RtNetlink.IFF_UP)
+    assert kernel.links[5]["up"]
+
+
+def switcher(kernel):
+    return ModeSwitcher(InterfaceDiscovery(kernel.sysfs.root, netlink=Nl80211), backend=NetlinkModeBackend)
+
+
+def test_switch_several_interfaces(kernel):
+    kernel.add(3, 'wlan0', 0)
+    kernel.add(4, 'wlan1', 1)
+
+    results = switcher(kernel).switch({"wlan0": "monitor", "wlan1": "monitor"})
+
+    assert {name: (r["mode"], r["up"], r["backend"]) for name, r in results.items()} == {
+        "wlan0": ("Monitor", True, "netlink"), "wlan1": ("Monitor", True, "netlink")}
+    assert all(link["iftype"] == 6 and link["up"] for link in kernel.links.values())
+
+
+def test_failed_switch_rolls_back_the_batch(kernel):
+    kernel.add(3, 'wlan0', 0)
+    kernel.add(4, 'wlan1', 1)
+    kernel.failures[(4, 6)] = errno.EOPNOTSUPP # wlan1 cannot do monitor mode
+
+    with pytest.raises(ModeSwitchError) as raised:
+        switcher(kernel).switch({"wlan0": "monitor", "wlan1": "monitor"})
+
+    assert raised.value.interface == 'wlan1'
+    assert raised.value.step == 'set monitor mode'
+    assert kernel.links[3] == {"name": "wlan0", "phy": 0, "iftype": 2, "up": True}
+    assert kernel.links[4] == {"name": "wlan1", "phy": 1, "iftype": 2, "up": True}
+    assert all(s.closed for s in kernel.sockets)
+
+
+def test_wiphy_frequencies_from_a_split_dump(kernel):
+    kernel.wiphys[0] = {0: [(2412, False), (2437, False)], 1: [(5180, False), (5260, True)]}
+    kernel.wiphys[1] = {0: [(2412, False), (2484, True)]}
+
+    assert Nl80211().wiphy_frequencies() == {"phy0": {2412, 2437, 5180}, "phy1": {2412}}
+
+
+def test_interface_frequencies_follow_the_radio(kernel):
+    kernel.add(3, 'wlan0', 0)
+    kernel.add(4, 'wlan1', 1)
+    kernel.add(5, 'wlan2', 2) # Radio without a channel list
+    kernel.wiphys[0] = {0: [(2412, False)], 1: [(5180, False)]}
+    kernel.wiphys[1] = {0: [(2412, False)]}
+
+    frequencies = InterfaceDiscovery(kernel.sysfs.root, netlink=Nl80211).frequencies(['wlan0', 'wlan1', 'wlan2', 'eth0'])
+
+    assert frequencies == {"wlan0": {2412, 5180}, "wlan1": {2412}, "wlan2": None, "eth0": None}
@@ -0,0 +1,37 @@
+import io
+
+from wificracker_core import Colors, LiveTableRenderer
+
+
+def make_renderer(stream):
+    return LiveTableRenderer("Survey", [("BSSID", 17), ("CH", 3), ("ESSID", 0)], max_fps=1000, stream=stream)
+
+
+def test_footer_line_is_cleared_when_the_table_grows_over_it():
+    stream = io.StringIO()
+    view = make_renderer(stream)
+    view.render([[(Colors.ENDC, "aa:bb:cc:dd:ee:01"), (Colors.ENDC, "1"), (Colors.ENDC, "one")]], footer="Waiting for data...")
+    stream.seek(0)
+    stream.truncate()
+    rows = [[(Colors.ENDC, f"aa:bb:cc:dd:ee:0{i}"), (Colors.ENDC, str(i)), (Colors.ENDC, "net")] for i in range(1, 4)]
+    view._last_frame = 0.0
+    view.render(rows, footer="3 networks")
+    frame = stream.getvalue()
+    # The old footer sat on row 6; it has to be erased before the new row 6 is drawn
+    assert frame.index("\033[6;1H\033[K") < frame.index("\033[6;1H" + Colors.ENDC)
+    assert frame.endswith(f"\033[8;1H\033[K{Colors.OKCYAN}3 networks{Colors.ENDC}")
+
+
+def test_rows_left_over_from_a_longer_frame_are_blanked():
+    stream = io.StringIO()
+    view = make_renderer(stream)
+    rows = [[(Colors.ENDC, f"aa:bb:cc:dd:ee:0{i}"), (Colors.ENDC, str(i)), (Colors.ENDC, "net")] for i in range(1, 4)]
+    view.render(rows)
+    stream.seek(0)
+    stream.truncate()
+    view._last_frame = 0.0
+    view.render(rows[:1], footer="1 network")
+    frame = stream.getvalue()
+    for row in (6, 7, 8):
+        assert f"\033[{row};1H\033[K" in frame
+    assert "aa:bb:cc:dd:ee:01" not in frame # Unchanged cells are not rewritten
@@ -0,0 +1,223 @@
+import os
+import signal
+import time
+
+import pytest
+
+from wificracker_core import ProcessSupervisor, ToolRegistry
+
+
+def fake_tool(directory, name, script):
+    path = directory / name
+    path.write_text('#!/bin/sh\n' + script)
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'bin'
+    directory.mkdir()
+    monkeypatch.setenv('PATH', str(directory))
+    return directory
+
+
+@pytest.fixture
+def registry(tmp_path, bin_dir):
+    return ToolRegistry(path=str(tmp_path / 'tools.json'))
+
+
+@pytest.fixture
+def supervisor(bin_dir, monkeypatch):
+    # The fake tools need the usual commands as well
+    monkeypatch.setenv('PATH', os.environ['PATH'] + ':/usr/bin:/bin')
+    supervisor = ProcessSupervisor(sample_interval=0.05)
+    yield supervisor
+    supervisor.shutdown()
+
+
+def test_which_resolves_tools_on_path(registry, bin_dir):
+    aircrack = fake_tool(bin_dir, 'aircrack-ng', 'exit 0\n')
+
+    assert registry.which('aircrack-ng') is None # Resolved when the registry was made
+    registry.refresh()
+    assert registry.which('aircrack-ng') == aircrack
+    assert registry.available('aircrack-ng')
+    assert not registry.available('hashcat')
+
+
+def test_path_change_is_noticed(registry, tmp_path, monkeypatch):
+    other = tmp_path / 'other'
+    other.mkdir()
+    hashcat = fake_tool(other, 'hashcat', 'exit 0\n')
+
+    monkeypatch.setenv('PATH', str(other))
+
+    assert registry.which('hashcat') == hashcat
+
+
+def test_removed_tool_is_no_longer_available(registry, bin_dir):
+    fake_tool(bin_dir, 'iw', 'exit 0\n')
+    registry.refresh()
+    assert registry.available('iw')
+
+    os.remove(bin_dir / 'iw')
+
+    assert not registry.available('iw')
+
+
+def test_terminal_emulator(registry, bin_dir):
+    assert registry.terminal() is None
+    konsole = fake_tool(bin_dir, 'konsole', 'exit 0\n')
+    registry.refresh()
+    assert registry.terminal() == [konsole, '-e']
+
+
+def test_version_is_probed_once_per_binary(tmp_path, bin_dir):
+    runs = tmp_path / 'runs'
+    script = f'echo run >> {runs}\necho "Aircrack-ng 1.7  - (C) 2006-2022 Thomas d\'Otreppe"\n'
+    path = fake_tool(bin_dir, 'aircrack-ng', script)
+
+    assert ToolRegistry(path=str(tmp_path / 'tools.json')).version('aircrack-ng') == '1.7'
+    assert ToolRegistry(path=str(tmp_path / 'tools.json')).version('aircrack-ng') == '1.7'
+    assert runs.read_text().count('run') == 1
+
+    # An upgraded binary is probed again
+    fake_tool(bin_dir, 'aircrack-ng', script.replace('1.7', '1.7.1') + '\n')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert ToolRegistry(path=str(tmp_path / 'tools.json')).version('aircrack-ng') == '1.7.1'
+    assert runs.read_text().count('run') == 2
+
+
+HASHCAT_INFO = """\
+CUDA Info:
+==========
+
+CUDA.Version.: 12.2
+
+Backend Device ID #1
+  Name...........: NVIDIA GeForce RTX 3080
+  Processor(s)...: 68
+
+OpenCL Info:
+============
+
+OpenCL Platform ID #1
+  Vendor..: The pocl project
+
+  Backend Device ID #2
+    Type...........: CPU
+    Name...........: cpu-haswell-AMD Ryzen 7
+"""
+
+
+def test_hashcat_devices(registry, bin_dir):
+    fake_tool(bin_dir, 'hashcat', f"/bin/cat <<'EOF'\n{HASHCAT_INFO}EOF\n")
+    registry.refresh()
+
+    devices = registry.hashcat_devices()
+
+    assert devices == [
+        {'backend': 'CUDA', 'id': 1, 'type': None, 'name': 'NVIDIA GeForce RTX 3080'},
+        {'backend': 'OpenCL', 'id': 2, 'type': 'CPU', 'name': 'cpu-haswell-AMD Ryzen 7'},
+    ]
+    assert registry.has_gpu_backend()
+
+
+def test_cpu_only_hashcat_has_no_gpu_backend(registry, bin_dir):
+    cpu_only = HASHCAT_INFO[HASHCAT_INFO.index('OpenCL Info:'):]
+    fake_tool(bin_dir, 'hashcat', f"/bin/cat <<'EOF'\n{cpu_only}EOF\n")
+    registry.refresh()
+
+    assert not registry.has_gpu_backend()
+
+
+def test_no_gpu_backend_without_hashcat(registry):
+    assert registry.hashcat_devices() == []
+    assert not registry.has_gpu_backend()
+
+
+def test_output_lines_are_split_and_cleaned(supervisor, bin_dir):
+    tool = fake_tool(bin_dir, 'airodump-ng', "printf ' CH  6 ]\\r\\033[2J\\033[1;1H BSSID  PWR\\n\\n02:00:00:00:00:01  -40\\n'\nexit 3\n")
+    lines = []
+
+    child = supervisor.start([tool], on_line=lambda child, line: lines.append(line))
+
+    assert child.wait(5) == 3
+    assert lines == ['CH  6 ]', 'BSSID  PWR', '02:00:00:00:00:01  -40']
+    assert child.lines == 3
+    assert child.name == 'airodump-ng'
+
+
+def test_timeout_escalates_past_an_ignored_sigint(supervisor, bin_dir, monkeypatch):
+    monkeypatch.setattr(ProcessSupervisor, 'SHUTDOWN', ((signal.SIGINT, 0.3), (signal.SIGTERM, 1.0), (signal.SIGKILL, 1.0)))
+    tool = fake_tool(bin_dir, 'aireplay-ng', "trap '' INT\nexec sleep 30\n")
+
+    child = supervisor.start([tool], timeout=0.2)
+
+    assert child.wait(5) == -signal.SIGTERM
+    assert child.timed_out
+    assert 'timed out' in child.summary()
+
+
+def test_stop_reaches_forked_helpers(supervisor, bin_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(ProcessSupervisor, 'SHUTDOWN', ((signal.SIGINT, 0.3), (signal.SIGTERM, 1.0), (signal.SIGKILL, 1.0)))
+    helper_pid = tmp_path / 'helper.pid'
+    # Background jobs of a script ignore SIGINT, so the helper outlives the script
+    tool = fake_tool(bin_dir, 'airmon-ng', f"sleep 30 &\necho $! > {helper_pid}\nwait\n")
+
+    child = supervisor.start([tool])
+    deadline = time.monotonic() + 5
+    while not (helper_pid.exists() and helper_pid.read_text().strip()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pid = int(helper_pid.read_text())
+    supervisor.stop(child)
+
+    assert not child.running
+    deadline = time.monotonic() + 5
+    while os.path.exists(f"/proc/{pid}") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(f"/proc/{pid}")
+
+
+def test_stop_reaches_helpers_of_a_tool_that_already_exited(supervisor, bin_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(ProcessSupervisor, 'SHUTDOWN', ((signal.SIGINT, 0.3), (signal.SIGTERM, 1.0), (signal.SIGKILL, 1.0)))
+    helper_pid = tmp_path / 'helper.pid'
+    # Detached from our pipe, the helper does not hold the tool's output open
+    tool = fake_tool(bin_dir, 'airmon-ng', f"sleep 30 > /dev/null 2>&1 &\necho $! > {helper_pid}\n")
+
+    child = supervisor.start([tool])
+    assert child.wait(5) == 0
+    pid = int(helper_pid.read_text())
+    assert os.path.exists(f"/proc/{pid}")
+
+    supervisor.stop()
+
+    deadline = time.monotonic() + 5
+    while os.path.exists(f"/proc/{pid}") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(f"/proc/{pid}")
+
+
+def test_usage_is_sampled(supervisor, bin_dir):
+    tool = fake_tool(bin_dir, 'hashcat', "i=0\nwhile [ $i -lt 20000 ]; do i=$((i+1)); done\n")
+
+    child = supervisor.start([tool])
+
+    assert child.wait(10) == 0
+    assert child.peak_rss > 0
+    assert child.stats()["returncode"] == 0
+
+
+def test_missing_executable_raises(supervisor, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        supervisor.start([str(tmp_path / 'missing')])
+
+
+def test_shutdown_twice(bin_dir):
+    supervisor = ProcessSupervisor()
+    supervisor.start([fake_tool(bin_dir, 'iw', 'exit 0\n')]).wait(5)
+
+    supervisor.shutdown()
+    supervisor.shutdown() # Again from atexit
@@ -0,0 +1,61 @@
+import io
+import os
+
+from wificracker_core import WordlistCatalog, WordlistNormalizer
+
+
+def test_refresh_ends_on_a_symlink_loop(tmp_path):
+    root = tmp_path / "lists"
+    (root / "a").mkdir(parents=True)
+    (root / "a" / "words.txt").write_text("password\n")
+    os.symlink(root, root / "a" / "loop")
+
+    catalog = WordlistCatalog(roots=[str(root)], path=str(tmp_path / "catalog.json"))
+    entries = catalog.refresh()
+
+    assert [name for name, _, _ in entries] == [os.path.join("a", "words.txt")]
+
+
+def test_fingerprint_changes_on_an_edit_in_the_middle(tmp_path):
+    path = tmp_path / "big.txt"
+    line = b"x" * 63 + b"\n"
+    path.write_bytes(line * 64 * 1024) # 4 MB, the middle is not sampled
+    before = WordlistCatalog.fingerprint(str(path))
+
+    with open(path, 'r+b') as f:
+        f.seek(2 * 1024 * 1024)
+        f.write(b"y" * 63)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1)) # Coarse timestamps could hide the write
+
+    assert WordlistCatalog.fingerprint(str(path)) != before
+
+
+def normalize_partitioned(tmp_path, lines, memory_limit, buckets=2):
+    source = tmp_path / "source.txt"
+    source.write_bytes(b"".join(line + b"\n" for line in lines))
+    normalizer = WordlistNormalizer(memory_limit=memory_limit, cache_dir=str(tmp_path / "cache"))
+    os.makedirs(normalizer.cache_dir)
+    stats = {"total": 0, "too_short": 0, "too_long": 0, "duplicates": 0, "kept": 0}
+    out = io.BytesIO()
+    normalizer._dedupe_partitioned([str(source)], stats, out, buckets)
+    return out.getvalue().splitlines(), stats
+
+
+def test_oversized_buckets_are_split_again_and_keep_the_first_order(tmp_path):
+    words = [f"password{i:05d}".encode() for i in range(3000)]
+    lines = words + words[::-1] + [b"short"]
+
+    # Two buckets of ~1500 candidates each, against a budget of ~100
+    kept, stats = normalize_partitioned(tmp_path, lines, memory_limit=100 * 134)
+
+    assert kept == words
+    assert stats["duplicates"] == 3000 and stats["too_short"] == 1
+    assert os.listdir(tmp_path / "cache") == [] # Work files are cleaned up
+
+
+def test_a_repeated_candidate_is_not_split_forever(tmp_path):
+    kept, stats = normalize_partitioned(tmp_path, [b"password"] * 2000, memory_limit=1000)
+
+    assert kept == [b"password"]
+    assert stats["duplicates"] == 1999
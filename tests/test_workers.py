@@ -0,0 +1,177 @@
+import base64
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+import pytest
+
+import wificracker_core
+from wificracker_core import RemoteShardWorker, ShardWorkerServer
+
+
+@pytest.fixture
+def server():
+    server = ShardWorkerServer(port=0, slots=1, token='lab')
+    host, port = server.start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield host, port
+    server.close()
+
+
+def connect(address):
+    sock = socket.create_connection(address, timeout=5)
+    return sock, sock.makefile('rwb')
+
+
+def send(stream, data):
+    stream.write(data if isinstance(data, bytes) else json.dumps(data).encode() + b'\n')
+    stream.flush()
+
+
+def test_token_required_off_loopback():
+    with pytest.raises(ValueError):
+        ShardWorkerServer(host='0.0.0.0', port=0).start()
+    server = ShardWorkerServer(host='0.0.0.0', port=0, token='lab')
+    try:
+        assert server.start()[1]
+    finally:
+        server.close()
+
+
+def test_default_listens_on_loopback_only():
+    server = ShardWorkerServer(port=0)
+    try:
+        assert server.start()[0] == '127.0.0.1'
+    finally:
+        server.close()
+
+
+@pytest.mark.parametrize('hello', [b'1\n', b'[]\n', b'"hello"\n', b'{"type": "job"}\n'])
+def test_bad_hello_is_refused(server, hello):
+    sock, stream = connect(server)
+    with sock, stream:
+        send(stream, hello)
+        assert json.loads(stream.readline())["type"] == "error"
+        assert stream.readline() == b''
+
+
+def test_long_hello_drops_the_connection(server):
+    sock, stream = connect(server)
+    with sock, stream:
+        send(stream, {"type": "hello", "token": "x" * (ShardWorkerServer.MAX_HELLO + 1)})
+        try:
+            replies = stream.read()
+        except ConnectionResetError:
+            replies = b''
+        assert b'"ready"' not in replies
+
+
+def test_wrong_token_is_refused(server):
+    sock, stream = connect(server)
+    with sock, stream:
+        send(stream, {"type": "hello", "token": "other"})
+        assert json.loads(stream.readline())["type"] == "error"
+
+
+def test_new_job_replaces_the_previous_capture(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    def captures():
+        contents = []
+        for name in os.listdir(tmp_path):
+            try:
+                with open(tmp_path / name, 'rb') as f:
+                    contents.append(f.read())
+            except FileNotFoundError: # Removed by the worker in the meantime
+                pass
+        return contents
+
+    def wait_for(expected):
+        deadline = time.monotonic() + 5
+        while captures() != expected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return captures()
+
+    sock, stream = connect(server)
+    with sock, stream:
+        send(stream, {"type": "hello", "token": "lab"})
+        assert json.loads(stream.readline())["type"] == "ready"
+        for data in (b'first', b'second'):
+            send(stream, {"type": "job", "capture": base64.b64encode(data).decode(), "bssid": "02:00:00:00:00:00"})
+        assert wait_for([b'second']) == [b'second']
+    assert wait_for([]) == []
+
+
+def hello(stream):
+    send(stream, {"type": "hello", "token": "lab"})
+    assert json.loads(stream.readline())["type"] == "ready"
+
+
+def test_shard_before_a_job_is_refused(server):
+    sock, stream = connect(server)
+    with sock, stream:
+        hello(stream)
+        send(stream, {"type": "shard", "index": 3, "data": base64.b64encode(b'password\n').decode()})
+        assert json.loads(stream.readline()) == {"type": "result", "index": 3, "error": "shard before any job"}
+
+
+def test_result_for_a_vanished_coordinator_is_dropped_quietly(server, monkeypatch):
+    started, release, finished = threading.Event(), threading.Event(), threading.Event()
+    errors = []
+    monkeypatch.setattr(threading, 'excepthook', errors.append)
+
+    def slow_aircrack(cap_file, bssid, feed, cancel):
+        started.set()
+        release.wait(5)
+        finished.set()
+        return 'secret-key'
+    monkeypatch.setattr(wificracker_core, 'run_aircrack', slow_aircrack)
+
+    sock, stream = connect(server)
+    with sock, stream:
+        hello(stream)
+        send(stream, {"type": "job", "capture": base64.b64encode(b'cap').decode(), "bssid": "02:00:00:00:00:00"})
+        send(stream, {"type": "shard", "index": 0, "data": base64.b64encode(b'password\n').decode()})
+        assert started.wait(5)
+        # Reset the connection, so the worker's next write fails at once
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    release.set()
+
+    assert finished.wait(5)
+    time.sleep(0.2) # Let the shard thread try to send its result
+    assert errors == []
+
+
+def test_connect_closes_the_slots_it_opened_when_a_later_one_fails(tmp_path, monkeypatch):
+    listener = socket.create_server(('127.0.0.1', 0))
+    opened = []
+    closed = []
+    close = RemoteShardWorker.close
+    monkeypatch.setattr(RemoteShardWorker, 'close', lambda self: (closed.append(self.name), close(self)))
+
+    def fake_server():
+        with listener:
+            for reply in ({"type": "ready", "slots": 2, "host": "lab"}, {"type": "error", "error": "busy"}):
+                connection, _ = listener.accept()
+                stream = connection.makefile('rwb')
+                stream.readline()
+                send(stream, reply)
+                opened.append((connection, stream))
+    thread = threading.Thread(target=fake_server, daemon=True)
+    thread.start()
+    cap_file = tmp_path / 'a.cap'
+    cap_file.write_bytes(b'cap')
+
+    with pytest.raises(OSError, match='busy'):
+        RemoteShardWorker.connect(f"127.0.0.1:{listener.getsockname()[1]}", str(cap_file), '02:00:00:00:00:00',
+                                  str(tmp_path / 'words.txt'), token='lab')
+
+    thread.join(5)
+    assert closed == ['lab#1']
+    for connection, stream in opened:
+        stream.close()
+        connection.close()
